@@ -0,0 +1,137 @@
+"""Таблицы пересчета кодов АЦП в температуру.
+
+Датчик с АЦП выдает целый код, а температура в его единице --
+code * scale + offset. Кодов немного (4096 для 12 бит, 65536 для 16),
+поэтому для пары (профиль датчика, целевая единица) один раз строится
+таблица всех возможных кодов, и конвертация пачки сводится к выборке по
+индексам (gather) без арифметики и проверок на каждое значение.
+
+Проверка абсолютного нуля заложена в таблицу: недопустимым кодам
+соответствует SENTINEL (NaN). Таблицы строятся лениво при первом
+обращении и хранятся в LRU-кэше: редко используемые вытесняются, когда
+таблиц становится больше max_tables.
+"""
+from array import array
+from collections import OrderedDict, namedtuple
+
+from calibration import calibrated_transform
+from units import UNITS, load_numpy
+
+# Значение в таблице для кодов ниже абсолютного нуля
+SENTINEL = float("nan")
+
+# Наибольшая разрядность: таблица на 2**MAX_BITS значений float64
+MAX_BITS = 20
+
+# Профиль датчика: разрядность, шаг и смещение в единице unit; signed --
+# коды в дополнительном коде (от -2**(bits-1) до 2**(bits-1) - 1)
+SensorProfile = namedtuple("SensorProfile", "name bits scale offset unit signed", defaults=(False,))
+
+
+class LookupStats:
+    """Счетчики кэша таблиц"""
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def as_dict(self):
+        return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions}
+
+
+def build_table(profile, target):
+    """Таблица array("d") значений всех кодов профиля в единице target.
+
+    Для signed-профилей таблица лежит в порядке дополнительного кода:
+    отрицательный код c -- элемент len + c, поэтому индексирование
+    отрицательным кодом попадает в нужный элемент.
+    """
+    if not 1 <= profile.bits <= MAX_BITS:
+        raise ValueError(f"Разрядность АЦП должна быть от 1 до {MAX_BITS}: {profile.bits}")
+    source, target = UNITS.resolve(profile.unit), UNITS.resolve(target)
+    # Код -> единица датчика -> target одним аффинным преобразованием
+    transform = calibrated_transform(source, target, profile.scale, profile.offset)
+    size = 1 << profile.bits
+    codes = range(size)
+    if profile.signed:
+        half = size >> 1
+        codes = [*range(half), *range(-half, 0)]
+
+    np = load_numpy()
+    if np is not None:
+        codes = np.array(codes, dtype=np.float64)
+        values = codes * transform.a + transform.b
+        values[(codes < transform.lower) | (codes > transform.upper)] = SENTINEL
+        return array("d", values.tobytes())
+    a, b, lower, upper = transform.a, transform.b, transform.lower, transform.upper
+    return array("d", [code * a + b if lower <= code <= upper else SENTINEL for code in codes])
+
+
+class LookupCache:
+    """Ленивые таблицы по (профиль, единица) с вытеснением по LRU"""
+
+    def __init__(self, max_tables=16):
+        if max_tables < 1:
+            raise ValueError("Кэш должен вмещать хотя бы одну таблицу")
+        self.max_tables = max_tables
+        self.tables = OrderedDict()
+        self.stats = LookupStats()
+
+    def __len__(self):
+        return len(self.tables)
+
+    def table(self, profile, target):
+        """Таблица для пары, построенная при первом обращении"""
+        key = (profile, UNITS.resolve(target))
+        table = self.tables.get(key)
+        if table is not None:
+            self.stats.hits += 1
+            self.tables.move_to_end(key)
+            return table
+        self.stats.misses += 1
+        table = build_table(profile, key[1])
+        self.tables[key] = table
+        if len(self.tables) > self.max_tables:
+            self.tables.popitem(last=False)
+            self.stats.evictions += 1
+        return table
+
+    def convert(self, codes, profile, target, out=None):
+        """Значения кодов в единице target; SENTINEL для недопустимых.
+
+        codes -- целые коды (array, список, ndarray). С NumPy возвращает
+        ndarray (или пишет в out), без него -- array("d").
+        """
+        if out is not None and len(out) != len(codes):
+            raise ValueError(f"Длина out ({len(out)}) не равна числу кодов ({len(codes)})")
+        table = self.table(profile, target)
+        low = -(1 << (profile.bits - 1)) if profile.signed else 0
+        high = low + len(table) - 1
+        np = load_numpy()
+        if np is not None:
+            codes = np.asarray(codes)
+            if codes.size and (codes.min() < low or codes.max() > high):
+                raise ValueError(f"Код вне диапазона {profile.bits}-битного АЦП")
+            table = np.frombuffer(table, dtype=np.float64)
+            if out is None or isinstance(out, np.ndarray):
+                return np.take(table, codes, out=out, mode="wrap")
+            # Буфер вызывающего (array("d") и т.п.): запись без копии
+            np.take(table, codes, out=np.frombuffer(out, dtype=np.float64), mode="wrap")
+            return out
+        if len(codes) and (min(codes) < low or max(codes) > high):
+            raise ValueError(f"Код вне диапазона {profile.bits}-битного АЦП")
+        # Выборка идет на уровне C: map по методу таблицы
+        result = array("d", map(table.__getitem__, codes))
+        if out is None:
+            return result
+        out[:] = result
+        return out
+
+
+TABLES = LookupCache()
+
+
+def convert_codes(codes, profile, target, out=None):
+    """Конвертация кодов АЦП через общий кэш таблиц"""
+    return TABLES.convert(codes, profile, target, out)
@@ -1,31 +1,26 @@
-import tkinter as tk
-from tkinter import ttk, messagebox
-import json
-import os
 import hashlib
+import sqlite3
 from datetime import datetime
 
+from user_store import UserStore
+
 
 class AuthSystem:
-    def __init__(self):
-        self.users_file = "users.json"
+    def __init__(self, users_file="users.json", db_file="users.db"):
+        self.users_file = users_file
         self.current_user = None
-        self.users = self.load_users()
+        self.users = UserStore(db_file)
+        self.load_users()
 
     def load_users(self):
-        """Загрузка пользователей из файла"""
-        if os.path.exists(self.users_file):
-            try:
-                with open(self.users_file, "r", encoding='utf-8') as f:
-                    return json.load(f)
-            except:
-                return {}
-        return {}
+        """Перенос пользователей из старого users.json при первом запуске"""
+        if len(self.users) == 0:
+            self.users.migrate_json(self.users_file)
+        return self.users
 
     def save_users(self):
-        """Сохранение пользователей в файл"""
-        with open(self.users_file, "w", encoding='utf-8') as f:
-            json.dump(self.users, f, ensure_ascii=False, indent=2)
+        """Записи сохраняются сразу при изменении; оставлено для совместимости"""
+        self.users.commit()
 
     def hash_password(self, password):
         """Хеширование пароля"""
@@ -39,25 +34,75 @@ class AuthSystem:
         if len(password) < 4:
             return False, "Пароль должен содержать минимум 4 символа"
 
-        self.users[username] = {
-            'password_hash': self.hash_password(password),
-            'email': email,
-            'created_at': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-            'last_login': None
-        }
-        self.save_users()
+        try:
+            self.users.add(username, {
+                'password_hash': self.hash_password(password),
+                'email': email,
+                'created_at': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                'last_login': None
+            })
+        except sqlite3.IntegrityError:
+            return False, "Пользователь уже существует"
         return True, "Регистрация успешна"
 
+    def register_many(self, users):
+        """Массовая регистрация пользователей.
+
+        users -- последовательность кортежей (логин, пароль[, email]).
+        Вся пачка проверяется заранее, а новые пользователи записываются
+        одной транзакцией. Возвращает список кортежей (успех, сообщение) в
+        порядке входных данных, как register.
+        """
+        users = [tuple(user) + (None,) * (3 - len(user)) for user in users]
+        existing = self.users.existing(user[0] for user in users)
+
+        results = []
+        accepted = []
+        seen = set()
+        for username, password, email in users:
+            if username in existing or username in seen:
+                results.append((False, "Пользователь уже существует"))
+            elif len(password) < 4:
+                results.append((False, "Пароль должен содержать минимум 4 символа"))
+            else:
+                seen.add(username)
+                accepted.append((len(results), username, password, email))
+                results.append((True, "Регистрация успешна"))
+
+        # SHA-256 от короткого пароля быстрее передачи в другой процесс:
+        # пул процессов на 20 тыс. паролей медленнее простого цикла
+        hashes = [self.hash_password(password) for _, _, password, _ in accepted]
+
+        created_at = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        added = self.users.add_many(
+            (username, {'password_hash': password_hash, 'email': email,
+                        'created_at': created_at, 'last_login': None})
+            for (_, username, _, email), password_hash in zip(accepted, hashes)
+        )
+        # Логин мог появиться между проверкой и записью (параллельный register)
+        for (index, *_), ok in zip(accepted, added):
+            if not ok:
+                results[index] = (False, "Пользователь уже существует")
+        return results
+
+    def import_users(self, csv_file):
+        """Импорт пользователей из CSV со столбцами username, password, email"""
+        import csv
+        with open(csv_file, "r", encoding="utf-8", newline="") as f:
+            users = [(row["username"].strip(), row.get("password") or "", (row.get("email") or "").strip() or None)
+                     for row in csv.DictReader(f)]
+        return self.register_many(users)
+
     def login(self, username, password):
         """Авторизация пользователя"""
-        if username not in self.users:
+        user = self.users.get(username)
+        if user is None:
             return False, "Пользователь не найден"
 
-        if self.users[username]['password_hash'] != self.hash_password(password):
+        if user['password_hash'] != self.hash_password(password):
             return False, "Неверный пароль"
 
-        self.users[username]['last_login'] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        self.save_users()
+        self.users.update(username, last_login=datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
         self.current_user = username
         return True, "Вход выполнен успешно"
 
@@ -74,121 +119,13 @@ class AuthSystem:
         if not self.login(username, old_password)[0]:
             return False, "Неверный старый пароль"
 
-        self.users[username]['password_hash'] = self.hash_password(new_password)
-        self.save_users()
+        self.users.update(username, password_hash=self.hash_password(new_password))
         return True, "Пароль изменен успешно"
 
 
-class AuthWindow:
-    def __init__(self, auth_system, on_success_callback):
-        self.auth_system = auth_system
-        self.on_success_callback = on_success_callback
-
-        self.auth_window = tk.Toplevel()
-        self.auth_window.title("Авторизация")
-        self.auth_window.geometry("400x500")
-        self.auth_window.resizable(False, False)
-
-        # Обработка закрытия окна
-        self.auth_window.protocol("WM_DELETE_WINDOW", self.on_window_close)
-
-        self.setup_ui()
-
-    def on_window_close(self):
-        """Обработчик закрытия окна авторизации"""
-        self.auth_window.destroy()
-
-    def setup_ui(self):
-        """Настройка интерфейса авторизации"""
-        # Создаем Notebook для вкладок
-        notebook = ttk.Notebook(self.auth_window)
-        notebook.pack(fill=tk.BOTH, expand=True, padx=20, pady=20)
-
-        # Вкладка входа
-        login_frame = ttk.Frame(notebook, padding=20)
-        notebook.add(login_frame, text="Вход")
-
-        # Вкладка регистрации
-        register_frame = ttk.Frame(notebook, padding=20)
-        notebook.add(register_frame, text="Регистрация")
-
-        # Настройка вкладки входа
-        self.setup_login_tab(login_frame)
-
-        # Настройка вкладки регистрации
-        self.setup_register_tab(register_frame)
-
-    def setup_login_tab(self, frame):
-        """Настройка вкладки входа"""
-        ttk.Label(frame, text="Логин:", font=("Arial", 11)).pack(anchor=tk.W, pady=(0, 5))
-        self.login_username = ttk.Entry(frame, font=("Arial", 11))
-        self.login_username.pack(fill=tk.X, pady=(0, 15))
-
-        ttk.Label(frame, text="Пароль:", font=("Arial", 11)).pack(anchor=tk.W, pady=(0, 5))
-        self.login_password = ttk.Entry(frame, show="*", font=("Arial", 11))
-        self.login_password.pack(fill=tk.X, pady=(0, 20))
-
-        login_btn = ttk.Button(frame, text="Войти", command=self.handle_login)
-        login_btn.pack(fill=tk.X, pady=10)
-
-        # Биндинг Enter для входа
-        self.login_password.bind("<Return>", lambda e: self.handle_login())
-        self.login_username.bind("<Return>", lambda e: self.login_password.focus())
-
-    def setup_register_tab(self, frame):
-        """Настройка вкладки регистрации"""
-        ttk.Label(frame, text="Логин:", font=("Arial", 11)).pack(anchor=tk.W, pady=(0, 5))
-        self.register_username = ttk.Entry(frame, font=("Arial", 11))
-        self.register_username.pack(fill=tk.X, pady=(0, 15))
-
-        ttk.Label(frame, text="Пароль:", font=("Arial", 11)).pack(anchor=tk.W, pady=(0, 5))
-        self.register_password = ttk.Entry(frame, show="*", font=("Arial", 11))
-        self.register_password.pack(fill=tk.X, pady=(0, 15))
-
-        ttk.Label(frame, text="Email (необязательно):", font=("Arial", 11)).pack(anchor=tk.W, pady=(0, 5))
-        self.register_email = ttk.Entry(frame, font=("Arial", 11))
-        self.register_email.pack(fill=tk.X, pady=(0, 20))
-
-        register_btn = ttk.Button(frame, text="Зарегистрироваться", command=self.handle_register)
-        register_btn.pack(fill=tk.X, pady=10)
-
-        # Биндинг Enter для регистрации
-        self.register_password.bind("<Return>", lambda e: self.handle_register())
-        self.register_email.bind("<Return>", lambda e: self.handle_register())
-
-    def handle_login(self):
-        """Обработчик входа"""
-        username = self.login_username.get().strip()
-        password = self.login_password.get()
-
-        if not username or not password:
-            messagebox.showerror("Ошибка", "Заполните все поля")
-            return
-
-        success, message = self.auth_system.login(username, password)
-        if success:
-            messagebox.showinfo("Успех", message)
-            self.auth_window.destroy()
-            self.on_success_callback()
-        else:
-            messagebox.showerror("Ошибка", message)
-
-    def handle_register(self):
-        """Обработчик регистрации"""
-        username = self.register_username.get().strip()
-        password = self.register_password.get()
-        email = self.register_email.get().strip() or None
-
-        if not username or not password:
-            messagebox.showerror("Ошибка", "Заполните обязательные поля")
-            return
-
-        success, message = self.auth_system.register(username, password, email)
-        if success:
-            messagebox.showinfo("Успех", message)
-            # Автоматически заполняем форму входа
-            self.login_username.delete(0, tk.END)
-            self.login_username.insert(0, username)
-            self.login_password.focus()
-        else:
-            messagebox.showerror("Ошибка", message)
+def __getattr__(name):
+    # Окно авторизации импортируется лениво, чтобы не тянуть tkinter
+    if name == "AuthWindow":
+        from auth_window import AuthWindow
+        return AuthWindow
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
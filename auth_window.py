@@ -0,0 +1,151 @@
+import tkinter as tk
+from tkinter import ttk, messagebox
+
+
+class AuthWindow:
+    def __init__(self, auth_system, on_success_callback, executor=None, on_cancel_callback=None):
+        self.auth_system = auth_system
+        self.on_success_callback = on_success_callback
+        self.on_cancel_callback = on_cancel_callback
+        # Вход и регистрация (хеширование пароля, запросы к базе) идут в фоне
+        self.executor = executor
+        self.busy = False
+
+        self.auth_window = tk.Toplevel()
+        self.auth_window.title("Авторизация")
+        self.auth_window.geometry("400x500")
+        self.auth_window.resizable(False, False)
+
+        # Обработка закрытия окна
+        self.auth_window.protocol("WM_DELETE_WINDOW", self.on_window_close)
+
+        self.setup_ui()
+
+    def on_window_close(self):
+        """Обработчик закрытия окна авторизации"""
+        self.auth_window.destroy()
+        if self.on_cancel_callback:
+            self.on_cancel_callback()
+
+    def run(self, fn, *args, on_done):
+        """Запуск fn в фоне; on_done получает результат в потоке интерфейса"""
+        if self.busy:
+            return
+        if self.executor is None:
+            on_done(fn(*args))
+            return
+        self.busy = True
+        self.auth_window.config(cursor="watch")
+
+        def finish(result):
+            self.busy = False
+            if self.auth_window.winfo_exists():
+                self.auth_window.config(cursor="")
+                on_done(result)
+
+        def fail(error):
+            finish((False, f"Ошибка: {error}"))
+
+        self.executor.submit(fn, *args, on_success=finish, on_error=fail)
+
+    def setup_ui(self):
+        """Настройка интерфейса авторизации"""
+        # Создаем Notebook для вкладок
+        notebook = ttk.Notebook(self.auth_window)
+        notebook.pack(fill=tk.BOTH, expand=True, padx=20, pady=20)
+
+        # Вкладка входа
+        login_frame = ttk.Frame(notebook, padding=20)
+        notebook.add(login_frame, text="Вход")
+
+        # Вкладка регистрации
+        register_frame = ttk.Frame(notebook, padding=20)
+        notebook.add(register_frame, text="Регистрация")
+
+        # Настройка вкладки входа
+        self.setup_login_tab(login_frame)
+
+        # Настройка вкладки регистрации
+        self.setup_register_tab(register_frame)
+
+    def setup_login_tab(self, frame):
+        """Настройка вкладки входа"""
+        ttk.Label(frame, text="Логин:", font=("Arial", 11)).pack(anchor=tk.W, pady=(0, 5))
+        self.login_username = ttk.Entry(frame, font=("Arial", 11))
+        self.login_username.pack(fill=tk.X, pady=(0, 15))
+
+        ttk.Label(frame, text="Пароль:", font=("Arial", 11)).pack(anchor=tk.W, pady=(0, 5))
+        self.login_password = ttk.Entry(frame, show="*", font=("Arial", 11))
+        self.login_password.pack(fill=tk.X, pady=(0, 20))
+
+        login_btn = ttk.Button(frame, text="Войти", command=self.handle_login)
+        login_btn.pack(fill=tk.X, pady=10)
+
+        # Биндинг Enter для входа
+        self.login_password.bind("<Return>", lambda e: self.handle_login())
+        self.login_username.bind("<Return>", lambda e: self.login_password.focus())
+
+    def setup_register_tab(self, frame):
+        """Настройка вкладки регистрации"""
+        ttk.Label(frame, text="Логин:", font=("Arial", 11)).pack(anchor=tk.W, pady=(0, 5))
+        self.register_username = ttk.Entry(frame, font=("Arial", 11))
+        self.register_username.pack(fill=tk.X, pady=(0, 15))
+
+        ttk.Label(frame, text="Пароль:", font=("Arial", 11)).pack(anchor=tk.W, pady=(0, 5))
+        self.register_password = ttk.Entry(frame, show="*", font=("Arial", 11))
+        self.register_password.pack(fill=tk.X, pady=(0, 15))
+
+        ttk.Label(frame, text="Email (необязательно):", font=("Arial", 11)).pack(anchor=tk.W, pady=(0, 5))
+        self.register_email = ttk.Entry(frame, font=("Arial", 11))
+        self.register_email.pack(fill=tk.X, pady=(0, 20))
+
+        register_btn = ttk.Button(frame, text="Зарегистрироваться", command=self.handle_register)
+        register_btn.pack(fill=tk.X, pady=10)
+
+        # Биндинг Enter для регистрации
+        self.register_password.bind("<Return>", lambda e: self.handle_register())
+        self.register_email.bind("<Return>", lambda e: self.handle_register())
+
+    def handle_login(self):
+        """Обработчик входа"""
+        username = self.login_username.get().strip()
+        password = self.login_password.get()
+
+        if not username or not password:
+            messagebox.showerror("Ошибка", "Заполните все поля")
+            return
+
+        self.run(self.auth_system.login, username, password, on_done=self.on_login_done)
+
+    def on_login_done(self, result):
+        success, message = result
+        if success:
+            messagebox.showinfo("Успех", message)
+            self.auth_window.destroy()
+            self.on_success_callback()
+        else:
+            messagebox.showerror("Ошибка", message)
+
+    def handle_register(self):
+        """Обработчик регистрации"""
+        username = self.register_username.get().strip()
+        password = self.register_password.get()
+        email = self.register_email.get().strip() or None
+
+        if not username or not password:
+            messagebox.showerror("Ошибка", "Заполните обязательные поля")
+            return
+
+        self.run(self.auth_system.register, username, password, email,
+                 on_done=lambda result: self.on_register_done(username, result))
+
+    def on_register_done(self, username, result):
+        success, message = result
+        if success:
+            messagebox.showinfo("Успех", message)
+            # Автоматически заполняем форму входа
+            self.login_username.delete(0, tk.END)
+            self.login_username.insert(0, username)
+            self.login_password.focus()
+        else:
+            messagebox.showerror("Ошибка", message)
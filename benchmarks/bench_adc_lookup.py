@@ -0,0 +1,50 @@
+"""Коды АЦП: выборка из таблицы против арифметики по каждому значению.
+
+Сравниваются convert_codes (gather по кэшированной таблице) и пакетная
+конвертация AffineTransform.convert_batch после пересчета кода в
+единицу датчика; отдельно -- время построения таблицы.
+
+Запуск: python benchmarks/bench_adc_lookup.py [значений]
+"""
+import os
+import random
+import sys
+import time
+from array import array
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from adc_lookup import SensorProfile, TABLES, build_table, convert_codes  # noqa: E402
+from units import UNITS, load_numpy  # noqa: E402
+
+PROFILES = (SensorProfile("probe12", 12, 0.0625, -55.0, "c"), SensorProfile("probe16", 16, 0.01, -50.0, "c"))
+
+
+def main():
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    transform = UNITS.transform("c", "f")
+    load_numpy()  # Импорт NumPy не входит во время построения таблицы
+    print(f"Значений: {size}")
+    for profile in PROFILES:
+        codes = array("H", (random.randrange(1 << profile.bits) for _ in range(size)))
+
+        start = time.perf_counter()
+        build_table(profile, "f")
+        built = time.perf_counter() - start
+
+        convert_codes(codes[:1], profile, "f")  # Таблица попадает в кэш
+        start = time.perf_counter()
+        convert_codes(codes, profile, "f")
+        lookup = time.perf_counter() - start
+
+        start = time.perf_counter()
+        transform.convert_batch([code * profile.scale + profile.offset for code in codes], on_invalid="nan")
+        arithmetic = time.perf_counter() - start
+
+        print(f"{profile.name}: таблица {built * 1000:.1f} мс, выборка {size / lookup:>12,.0f} зн/с, "
+              f"арифметика {size / arithmetic:>12,.0f} зн/с")
+    print(TABLES.stats.as_dict())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""Скорость оконной агрегации на синтетическом потоке.
+
+Поток генерируется на лету и не хранится в памяти, поэтому длину можно
+поднимать до сотен миллионов строк (например, 100000000).
+
+Запуск: python benchmarks/bench_aggregate.py [строк] [длина окна, с] [шаг, с]
+"""
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bulk_convert import BulkStats  # noqa: E402
+from stream_aggregate import sliding, tumbling  # noqa: E402
+
+
+def synthetic(count, rate=100.0):
+    """count показаний в °F с частотой rate в секунду"""
+    rnd = random.random
+    for i in range(count):
+        yield i / rate, 50.0 + 40.0 * rnd(), "f"
+
+
+def run(name, make_windows, count, memory_rows):
+    stats = BulkStats()
+    windows = sum(1 for _ in make_windows(synthetic(count), stats))
+    elapsed = stats.elapsed
+
+    # Пик памяти на короткой прогонке: tracemalloc сильно замедляет код
+    tracemalloc.start()
+    for _ in make_windows(synthetic(memory_rows), BulkStats()):
+        pass
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    print(f"{name:<10} окон: {windows:>10}  {stats.rows / elapsed:>12,.0f} строк/с  "
+          f"пик памяти на {memory_rows} строк: {peak / 1024:,.0f} КиБ")
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    size = float(sys.argv[2]) if len(sys.argv) > 2 else 60.0
+    step = float(sys.argv[3]) if len(sys.argv) > 3 else 10.0
+
+    print(f"Строк: {count}, окно: {size} с, шаг скользящего окна: {step} с")
+    memory_rows = min(count, 100_000)
+    started = time.perf_counter()
+    run("tumbling", lambda readings, stats: tumbling(readings, size, stats=stats), count, memory_rows)
+    run("sliding", lambda readings, stats: sliding(readings, size, step, stats=stats), count, memory_rows)
+    print(f"Всего: {time.perf_counter() - started:.1f} с")
+
+
+if __name__ == "__main__":
+    main()
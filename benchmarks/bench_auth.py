@@ -0,0 +1,67 @@
+"""Скорость входа в зависимости от числа пользователей.
+
+Сравнивает прежнюю схему (весь users.json переписывается при каждом входе)
+с хранилищем SQLite.
+Запуск: python benchmarks/bench_auth.py [число входов]
+"""
+import hashlib
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from auth import AuthSystem  # noqa: E402
+
+USER_COUNTS = (100, 1_000, 10_000, 50_000)
+PASSWORD_HASH = hashlib.sha256(b"secret").hexdigest()
+
+
+def make_users(count):
+    return {
+        f"user{i}": {"password_hash": PASSWORD_HASH, "email": None,
+                     "created_at": "2024-01-01 00:00:00", "last_login": None}
+        for i in range(count)
+    }
+
+
+def json_logins(path, users, logins):
+    """Прежняя схема: обновление last_login и перезапись всего файла"""
+    start = time.perf_counter()
+    for i in range(logins):
+        user = users[f"user{i % len(users)}"]
+        if user["password_hash"] == PASSWORD_HASH:
+            user["last_login"] = time.strftime("%Y-%m-%d %H:%M:%S")
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(users, f, ensure_ascii=False, indent=2)
+    return logins / (time.perf_counter() - start)
+
+
+def store_logins(auth, count, logins):
+    start = time.perf_counter()
+    for i in range(logins):
+        auth.login(f"user{i % count}", "secret")
+    return logins / (time.perf_counter() - start)
+
+
+def main():
+    logins = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    print(f"{'Пользователей':>13} {'users.json, вход/с':>19} {'SQLite, вход/с':>15}")
+    for count in USER_COUNTS:
+        with tempfile.TemporaryDirectory() as tmp:
+            users_file = os.path.join(tmp, "users.json")
+            users = make_users(count)
+            with open(users_file, "w", encoding="utf-8") as f:
+                json.dump(users, f)
+
+            json_rate = json_logins(users_file, users, logins)
+            auth = AuthSystem(users_file, os.path.join(tmp, "users.db"))
+            store_rate = store_logins(auth, count, logins)
+            auth.users.close()
+        print(f"{count:>13} {json_rate:>19,.0f} {store_rate:>15,.0f}")
+
+
+if __name__ == "__main__":
+    main()
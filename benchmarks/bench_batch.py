@@ -0,0 +1,43 @@
+"""Сравнение пакетной конвертации с циклом по скалярным методам.
+
+Запуск: python benchmarks/bench_batch.py [количество значений]
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from temperature_converter import TemperatureConverter  # noqa: E402
+
+CONVERSIONS = ("c_to_f", "f_to_c", "c_to_k", "k_to_c", "f_to_k", "k_to_f")
+
+
+def measure(func, repeat=3):
+    """Лучшее время из нескольких запусков"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    values = [random.uniform(300, 1000) for _ in range(size)]
+
+    print(f"Значений: {size}")
+    print(f"{'Конвертация':<10} {'цикл, с':>10} {'пакетно, с':>12} {'ускорение':>10}")
+    for conversion in CONVERSIONS:
+        scalar = getattr(TemperatureConverter, conversion)
+        batch = getattr(TemperatureConverter, conversion + "_batch")
+
+        loop_time = measure(lambda: [scalar(v) for v in values])
+        batch_time = measure(lambda: batch(values))
+        print(f"{conversion:<10} {loop_time:>10.4f} {batch_time:>12.4f} {loop_time / batch_time:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
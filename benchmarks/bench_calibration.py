@@ -0,0 +1,58 @@
+"""Стоимость калиброванной конвертации по сравнению с обычной.
+
+Сравниваются пакетная конвертация без калибровки, калибровка отдельным
+проходом перед конвертацией и слитое преобразование CalibrationTable:
+с поиском датчиков по идентификаторам и с номерами, разрешенными заранее
+(CalibrationTable.resolve).
+
+Запуск: python benchmarks/bench_calibration.py [значений] [датчиков]
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from calibration import CalibrationTable  # noqa: E402
+from units import UNITS  # noqa: E402
+
+
+def measure(func, repeat=3):
+    """Лучшее время из нескольких запусков"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    sensor_count = int(sys.argv[2]) if len(sys.argv) > 2 else 1000
+    calibrations = {f"s{i}": (random.uniform(0.95, 1.05), random.uniform(-1, 1)) for i in range(sensor_count)}
+    table = CalibrationTable(calibrations=calibrations)
+    sensors = [f"s{random.randrange(sensor_count)}" for _ in range(size)]
+    values = [random.uniform(-30, 60) for _ in range(size)]
+    transform = UNITS.transform("c", "f")
+
+    def two_passes():
+        calibrated = [calibrations[sensor][0] * value + calibrations[sensor][1]
+                      for sensor, value in zip(sensors, values)]
+        transform.convert_batch(calibrated)
+
+    plain = measure(lambda: transform.convert_batch(values))
+    separate = measure(two_passes)
+    fused = measure(lambda: table.convert_batch(sensors, values, "c", "f"))
+    resolved = table.resolve(sensors)
+    gather = measure(lambda: table.convert_batch(resolved, values, "c", "f"))
+    print(f"Значений: {size}, датчиков: {sensor_count}")
+    print(f"без калибровки:        {plain:.4f} с")
+    print(f"калибровка отдельно:   {separate:.4f} с")
+    print(f"слитое преобразование: {fused:.4f} с")
+    print(f"  с номерами датчиков: {gather:.4f} с")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""Целочисленная конвертация с фиксированной точкой против пути через float.
+
+Целые доли градуса переводятся между шкалами: FixedPointTransform.
+convert_array в заранее выделенный array("q") против
+AffineTransform.convert_batch по float с последующим округлением до
+нужного числа знаков. Для пути через float считается число
+результатов, разошедшихся с точным округлением.
+
+Запуск: python benchmarks/bench_fixed_point.py [значений]
+"""
+import os
+import random
+import sys
+import time
+from array import array
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fixed_point import FixedPointTransform  # noqa: E402
+from units import UNITS  # noqa: E402
+
+
+def main():
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    out = array("q", bytes(8 * size))
+    print(f"Значений: {size}")
+    # (из, в, знаков на входе, знаков на выходе)
+    for source, target, source_digits, target_digits in (
+            ("c", "k", 3, 3), ("c", "f", 3, 3), ("f", "c", 3, 3), ("c", "k", 3, 2)):
+        fixed = FixedPointTransform(source, target, source_digits, target_digits)
+        lower = fixed.lower
+        values = array("q", (random.randint(lower, lower + 1_300_000) for _ in range(size)))
+        start = time.perf_counter()
+        fixed.convert_array(values, out)
+        fixed_elapsed = time.perf_counter() - start
+
+        transform = UNITS.transform(source, target)
+        start = time.perf_counter()
+        floats = transform.convert_batch(array("d", (value / 10 ** source_digits for value in values)))
+        rounded = [round(value * 10 ** target_digits) for value in floats]
+        float_elapsed = time.perf_counter() - start
+
+        drift = sum(1 for exact, approx in zip(out, rounded) if exact != approx)
+        print(f"{source}/1e{source_digits} -> {target}/1e{target_digits}: целые {size / fixed_elapsed:>12,.0f} зн/с, "
+              f"float {size / float_elapsed:>12,.0f} зн/с, расхождений у float: {drift}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""Время загрузки и размер истории: JSON-формат против бинарного.
+
+Запуск: python benchmarks/bench_history.py [число записей]
+"""
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from history_store import HEADER, HistoryRecord, HistoryStore, RECORD, pack_record  # noqa: E402
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    records = [HistoryRecord(1.7e9 + i, value, value * 1.8 + 32, "c", "f")
+               for i, value in enumerate(random.uniform(-50, 50) for _ in range(count))]
+    legacy = [[time.strftime("%H:%M:%S", time.localtime(r.timestamp)),
+               f"{r.value:.2f}°C", f"{r.result:.2f}°F"] for r in reversed(records)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        json_file = os.path.join(tmp, "history_bench.json")
+        with open(json_file, "w", encoding="utf-8") as f:
+            json.dump(legacy, f, ensure_ascii=False, indent=2)
+        bin_file = os.path.join(tmp, "history_bench.bin")
+        with open(bin_file, "wb") as f:
+            f.write(HEADER)
+            f.write(b"".join(map(pack_record, records)))
+
+        start = time.perf_counter()
+        with open(json_file, "r", encoding="utf-8") as f:
+            json.load(f)
+        json_load = time.perf_counter() - start
+
+        start = time.perf_counter()
+        store = HistoryStore("bench", directory=tmp)
+        store.page(0, 200)
+        bin_open = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for _ in RECORD.iter_unpack(memoryview(store._mapping())[len(HEADER):]):
+            pass
+        bin_scan = time.perf_counter() - start
+        store.close()
+
+        print(f"Записей: {count}")
+        print(f"JSON:     {os.path.getsize(json_file) / 2**20:8.1f} МБ, загрузка {json_load:.3f} с")
+        print(f"Бинарный: {os.path.getsize(bin_file) / 2**20:8.1f} МБ, открытие и первая страница "
+              f"{bin_open * 1000:.2f} мс, полный проход {bin_scan:.3f} с")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""Время холодного импорта по данным python -X importtime.
+
+Запуск: python benchmarks/bench_import.py [--budget-ms N]
+При превышении бюджета или загрузке запрещенных модулей (tkinter, окно
+авторизации, NumPy) скрипт завершается с кодом 1.
+"""
+import argparse
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Модули, которые импортируют CLI и рабочие процессы
+MODULES = ("temperature_converter", "converter_core", "units", "auth")
+
+# Тяжелые модули, которые не должны загружаться при импорте
+FORBIDDEN = ("tkinter", "auth_window", "converter_app", "numpy")
+
+
+def import_profile(module):
+    """Разбор вывода -X importtime: {модуль: накопленное время, мкс}"""
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT, capture_output=True, text=True, check=True
+    )
+    profile = {}
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        profile[name.strip()] = int(cumulative)
+    return profile
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--budget-ms", type=float, default=None,
+                        help="допустимое время импорта каждого модуля")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    failed = False
+    print(f"{'Модуль':<24} {'импорт, мс':>10}  запрещенные модули")
+    for module in MODULES:
+        best = None
+        for _ in range(args.repeat):
+            profile = import_profile(module)
+            if best is None or profile[module] < best[module]:
+                best = profile
+        elapsed = best[module] / 1000
+        loaded = [name for name in FORBIDDEN if name in best]
+        print(f"{module:<24} {elapsed:>10.2f}  {', '.join(loaded) or '—'}")
+        if loaded or (args.budget_ms is not None and elapsed > args.budget_ms):
+            failed = True
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
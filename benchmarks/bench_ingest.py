@@ -0,0 +1,92 @@
+"""Симулятор датчиков для приема показаний sensor_ingest.
+
+Прием запускается в этом процессе с записью во временный CSV-файл, а
+датчики -- в отдельных процессах: часть шлет датаграммы UDP по
+readings_per_datagram показаний, часть пишет в TCP-соединения без пауз.
+Выводится устойчивая скорость записи и счетчики потерь.
+
+Запуск: python benchmarks/bench_ingest.py [секунд] [процессов UDP] [процессов TCP]
+"""
+import asyncio
+import multiprocessing
+import os
+import random
+import socket
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sensor_ingest import CsvSink, SensorIngest  # noqa: E402
+
+SENSORS = 1000
+READINGS_PER_DATAGRAM = 20
+# Диапазоны правдоподобных показаний по единицам
+RANGES = {"c": (-30, 60), "f": (-20, 140), "k": (240, 330)}
+
+
+def readings(count):
+    lines = []
+    for _ in range(count):
+        unit = random.choice(tuple(RANGES))
+        lines.append(f"sensor{random.randrange(SENSORS)},{random.uniform(*RANGES[unit]):.2f},{unit}\n")
+    return "".join(lines).encode()
+
+
+def udp_sensor(address, duration):
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    payloads = [readings(READINGS_PER_DATAGRAM) for _ in range(100)]
+    deadline = time.monotonic() + duration
+    while time.monotonic() < deadline:
+        for payload in payloads:
+            sock.sendto(payload, address)
+
+
+def tcp_sensor(address, duration):
+    sock = socket.create_connection(address)
+    payload = readings(1000)
+    deadline = time.monotonic() + duration
+    while time.monotonic() < deadline:
+        sock.sendall(payload)
+    sock.close()
+
+
+async def run(duration, udp_senders, tcp_senders):
+    with tempfile.TemporaryDirectory() as tmp:
+        sink = CsvSink(os.path.join(tmp, "readings.csv"))
+        ingest = SensorIngest(sink, queue_size=50000, batch_size=5000)
+        await ingest.start(udp_port=0, tcp_port=0)
+        addresses = ingest.addresses()
+
+        senders = [multiprocessing.Process(target=udp_sensor, args=(addresses["udp"], duration))
+                   for _ in range(udp_senders)]
+        senders += [multiprocessing.Process(target=tcp_sensor, args=(addresses["tcp"], duration))
+                    for _ in range(tcp_senders)]
+        start = time.perf_counter()
+        for sender in senders:
+            sender.start()
+        while any(sender.is_alive() for sender in senders):
+            await asyncio.sleep(0.1)
+        await ingest.stop()
+        elapsed = time.perf_counter() - start
+        sink.close()
+
+    stats = ingest.stats
+    print(f"Время: {elapsed:.1f} с, процессов UDP: {udp_senders}, TCP: {tcp_senders}")
+    print(f"Принято строк: {stats.received} ({stats.received / elapsed:,.0f}/с)")
+    print(f"Записано: {stats.written} ({stats.written / elapsed:,.0f}/с) пачками по "
+          f"{stats.written / max(stats.batches, 1):.0f}")
+    print(f"Отброшено UDP: {stats.dropped}, ожиданий TCP: {stats.backpressure}, "
+          f"некорректных: {stats.malformed}, ниже абсолютного нуля: {stats.invalid}")
+
+
+def main():
+    duration = float(sys.argv[1]) if len(sys.argv) > 1 else 5.0
+    udp_senders = int(sys.argv[2]) if len(sys.argv) > 2 else 2
+    tcp_senders = int(sys.argv[3]) if len(sys.argv) > 3 else 2
+    asyncio.run(run(duration, udp_senders, tcp_senders))
+
+
+if __name__ == "__main__":
+    main()
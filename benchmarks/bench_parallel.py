@@ -0,0 +1,43 @@
+"""Масштабирование параллельной конвертации по числу ядер.
+
+Запуск: python benchmarks/bench_parallel.py [количество значений]
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from parallel_convert import parallel_convert  # noqa: E402
+from units import UNITS, load_numpy  # noqa: E402
+
+
+def main():
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000_000
+    np = load_numpy()
+    if np is not None:
+        values = np.random.default_rng(0).uniform(-200, 1000, size)
+    else:
+        values = [random.uniform(-200, 1000) for _ in range(size)]
+
+    start = time.perf_counter()
+    UNITS.transform("c", "f").convert_batch(values)
+    single = time.perf_counter() - start
+
+    cores = os.cpu_count() or 1
+    counts = sorted({1, 2, 4, cores})
+    print(f"Значений: {size}, ядер: {cores}, NumPy: {'да' if np is not None else 'нет'}")
+    print(f"Без пула процессов: {size / single / 1e6:.1f} млн/с")
+    print(f"{'Процессов':>9} {'время, с':>9} {'млн/с':>8} {'ускорение':>10}")
+    baseline = None
+    for workers in counts:
+        start = time.perf_counter()
+        parallel_convert(values, "c", "f", workers=workers)
+        elapsed = time.perf_counter() - start
+        baseline = baseline or elapsed
+        print(f"{workers:>9} {elapsed:>9.3f} {size / elapsed / 1e6:>8.1f} {baseline / elapsed:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
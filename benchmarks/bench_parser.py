@@ -0,0 +1,40 @@
+"""Скорость разбора текстовых температур.
+
+Сравниваются столбец в духе истории и экспортов (значения с двумя знаками
+повторяются), столбец из уникальных строк и смесь написаний с десятичной
+запятой и русскими единицами.
+
+Запуск: python benchmarks/bench_parser.py [строк]
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from temperature_parser import _cache, parse_column  # noqa: E402
+
+
+def columns(size):
+    symbols = ("°C", "°F", "K")
+    history = [f"{random.uniform(-50, 50):.2f}{random.choice(symbols)}" for _ in range(size)]
+    unique = [f"{random.uniform(-500, 500):.6f}{random.choice(symbols)}" for _ in range(size)]
+    mixed = [f"{random.uniform(-50, 50):.1f}".replace(".", ",") + random.choice((" °С", " градусов Цельсия", " F"))
+             for _ in range(size)]
+    return {"история": history, "уникальные": unique, "смешанные": mixed}
+
+
+def main():
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    print(f"Строк: {size}")
+    for name, texts in columns(size).items():
+        _cache.clear()
+        start = time.perf_counter()
+        parsed = parse_column(texts)
+        elapsed = time.perf_counter() - start
+        print(f"{name:<12} {size / elapsed:>12,.0f} строк/с  ошибок: {len(parsed.errors)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""Точность и стоимость скетча квантилей на пакетной конвертации.
+
+Значения конвертируются порциями в рабочих процессах, каждый процесс
+строит свой скетч и возвращает его в сериализованном виде, а главный
+процесс их объединяет. Результат сравнивается с точными перцентилями.
+
+Запуск: python benchmarks/bench_quantiles.py [значений] [процессов]
+"""
+import bisect
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from quantile_sketch import QuantileSketch, convert_into  # noqa: E402
+
+PERCENTILES = (0.5, 0.95, 0.99)
+CHUNK = 100_000
+
+
+def sketch_chunk(task):
+    seed, count = task
+    rnd = random.Random(seed)
+    values = [rnd.gauss(70, 20) for _ in range(count)]
+    sketch = QuantileSketch(seed=seed)
+    convert_into(sketch, values, "f", "c", on_invalid="mask")
+    return sketch.to_bytes(), sorted(values)
+
+
+def main():
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else os.cpu_count()
+    tasks = [(seed, min(CHUNK, size - start)) for seed, start in enumerate(range(0, size, CHUNK))]
+
+    start = time.perf_counter()
+    merged = QuantileSketch()
+    exact = []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for data, values in pool.map(sketch_chunk, tasks):
+            merged.merge(QuantileSketch.from_bytes(data))
+            exact.extend(values)
+    elapsed = time.perf_counter() - start
+    exact = sorted((value - 32) * 5 / 9 for value in exact)
+
+    print(f"Значений: {size}, процессов: {workers}, время: {elapsed:.2f} с")
+    print(f"Скетч: {merged.retained} значений, {len(merged.to_bytes())} байт")
+    for q, value in zip(PERCENTILES, merged.quantiles(PERCENTILES)):
+        true_value = exact[min(int(q * len(exact)), len(exact) - 1)]
+        rank = bisect.bisect_left(exact, value) / len(exact)
+        print(f"p{round(q * 100):<3} скетч {value:8.3f}°C  точно {true_value:8.3f}°C  "
+              f"ошибка ранга {abs(rank - q) * 100:.2f}%")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""Нагрузочный тест HTTP-сервиса конвертации.
+
+Сервис запускается в том же процессе на свободном порту, клиенты держат
+keep-alive соединения и шлют одиночные запросы /convert без пауз.
+Выводятся p50/p99 задержки и запросов в секунду для нескольких окон
+сбора пакетов.
+
+Запуск: python benchmarks/bench_service.py [клиентов] [запросов на клиента]
+"""
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from conversion_service import ConversionService  # noqa: E402
+
+WINDOWS_MS = (0.0, 1.0, 5.0)
+
+
+def percentile(sorted_values, fraction):
+    return sorted_values[min(int(len(sorted_values) * fraction), len(sorted_values) - 1)]
+
+
+async def client(port, count, latencies, rejected):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    try:
+        for _ in range(count):
+            body = json.dumps({"value": random.uniform(-50, 50), "from": "c", "to": "f"}).encode()
+            start = time.perf_counter()
+            writer.write(f"POST /convert HTTP/1.1\r\nContent-Length: {len(body)}\r\n\r\n".encode() + body)
+            head = await reader.readuntil(b"\r\n\r\n")
+            length = int(head.split(b"Content-Length: ")[1].split(b"\r\n")[0])
+            await reader.readexactly(length)
+            latencies.append(time.perf_counter() - start)
+            if head.startswith(b"HTTP/1.1 503"):
+                rejected.append(1)
+    finally:
+        writer.close()
+
+
+async def run(window_ms, clients, requests):
+    service = ConversionService(batch_window=window_ms / 1000, max_pending=clients)
+    server = await service.start("127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    latencies, rejected = [], []
+    start = time.perf_counter()
+    await asyncio.gather(*(client(port, requests, latencies, rejected) for _ in range(clients)))
+    elapsed = time.perf_counter() - start
+    server.close()
+    await server.wait_closed()
+
+    latencies.sort()
+    stats = service.stats
+    print(f"{window_ms:>8.1f} {len(latencies) / elapsed:>10.0f} {percentile(latencies, 0.5) * 1000:>9.2f} "
+          f"{percentile(latencies, 0.99) * 1000:>9.2f} {stats.batched_values / max(stats.batches, 1):>8.1f} "
+          f"{len(rejected):>6}")
+
+
+def main():
+    clients = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    requests = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+
+    print(f"Клиентов: {clients}, запросов на клиента: {requests}")
+    print(f"{'окно, мс':>8} {'запр./с':>10} {'p50, мс':>9} {'p99, мс':>9} {'пакет':>8} {'503':>6}")
+    for window_ms in WINDOWS_MS:
+        asyncio.run(run(window_ms, clients, requests))
+
+
+if __name__ == "__main__":
+    main()
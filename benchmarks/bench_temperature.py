@@ -0,0 +1,51 @@
+"""Память и скорость: список Temperature против TemperatureArray.
+
+Запуск: python benchmarks/bench_temperature.py [значений]
+"""
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from temperature import Temperature, TemperatureArray  # noqa: E402
+
+
+def measure(build):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = build()
+    elapsed = time.perf_counter() - start
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, size, elapsed
+
+
+def timed(fn):
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def main():
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    values = [random.uniform(-50, 50) for _ in range(size)]
+    print(f"Значений: {size}")
+
+    objects, objects_size, _ = measure(lambda: [Temperature(value, "c") for value in values])
+    column, column_size, _ = measure(lambda: TemperatureArray(values, "c"))
+    print(f"Память: список {objects_size / size:.1f} байт/значение, столбец {column_size / size:.1f}")
+
+    print(f"to('f'):  список {timed(lambda: [t.to('f') for t in objects]):.3f} с, "
+          f"столбец {timed(lambda: column.to('f')):.3f} с")
+    print(f"sort:     список {timed(lambda: sorted(objects)):.3f} с, "
+          f"столбец {timed(lambda: column.sorted()):.3f} с")
+    threshold = Temperature(295, "k")
+    print(f"> порога: список {timed(lambda: [t > threshold for t in objects]):.3f} с, "
+          f"столбец {timed(lambda: column.where('>', threshold)):.3f} с")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+"""Конвертация сырых бинарных файлов с температурами через mmap.
+
+Файл -- плотный массив little-endian float32 или float64. Входной и
+выходной файлы отображаются в память и обрабатываются порциями
+фиксированного размера, поэтому файл целиком в память не загружается.
+Значения ниже абсолютного нуля не прерывают обработку: их смещения
+собираются в отчет.
+
+Пример:
+    python binary_convert.py logger.bin -o logger_k.bin --from c --to k --dtype f4
+    python binary_convert.py logger.bin --in-place --from c --to f
+"""
+import argparse
+import mmap
+import os
+import sys
+from array import array
+
+from units import UNITS, load_numpy
+
+# Формат на диске: код array.array и размер элемента
+DTYPES = {"f4": ("f", 4), "f8": ("d", 8)}
+
+INVALID_POLICIES = ("nan", "clip", "keep")
+
+
+class BinaryReport:
+    """Итог конвертации бинарного файла"""
+
+    def __init__(self, itemsize, max_offsets):
+        self.itemsize = itemsize
+        self.max_offsets = max_offsets
+        self.count = 0
+        self.invalid = 0
+        self.offsets = []
+
+    def add_invalid(self, indexes):
+        """Учет индексов элементов ниже абсолютного нуля"""
+        indexes = list(indexes)
+        self.invalid += len(indexes)
+        room = self.max_offsets - len(self.offsets)
+        if room > 0:
+            self.offsets.extend(index * self.itemsize for index in indexes[:room])
+
+    def __str__(self):
+        text = f"Значений: {self.count}, ниже абсолютного нуля: {self.invalid}"
+        if self.offsets:
+            shown = ", ".join(str(offset) for offset in self.offsets[:10])
+            text += f"\nСмещения (байт): {shown}" + (" ..." if self.invalid > 10 else "")
+        return text
+
+
+def convert_file(input_path, output_path=None, from_unit="c", to_unit="k", dtype="f4",
+                 chunk_size=1 << 20, in_place=False, on_invalid="nan", max_offsets=1000):
+    """Конвертация бинарного файла порциями по chunk_size элементов.
+
+    При in_place=True результат записывается во входной файл. Значения ниже
+    абсолютного нуля заменяются на NaN ("nan"), прижимаются к абсолютному
+    нулю ("clip") или конвертируются как есть ("keep"); их байтовые смещения
+    возвращаются в BinaryReport.offsets (не более max_offsets).
+    """
+    if dtype not in DTYPES:
+        raise ValueError(f"Неизвестный тип данных: {dtype}")
+    if on_invalid not in INVALID_POLICIES:
+        raise ValueError(f"Неизвестная политика: {on_invalid}")
+    if not in_place and output_path is None:
+        raise ValueError("Укажите выходной файл или in_place=True")
+    # Открытие выхода на запись обнулило бы входной файл до чтения
+    if not in_place and os.path.exists(output_path) and os.path.samefile(input_path, output_path):
+        raise ValueError("Выходной файл совпадает с входным: используйте in_place=True")
+
+    transform = UNITS.transform(UNITS.resolve(from_unit), UNITS.resolve(to_unit))
+    itemsize = DTYPES[dtype][1]
+    size = os.path.getsize(input_path)
+    if size % itemsize:
+        raise ValueError(f"Размер файла {size} не кратен размеру элемента {itemsize}")
+
+    report = BinaryReport(itemsize, max_offsets)
+    report.count = size // itemsize
+    if not in_place:
+        with open(output_path, "wb") as f:
+            f.truncate(size)
+    if size == 0:
+        return report
+
+    with open(input_path, "r+b" if in_place else "rb") as src_file:
+        src = mmap.mmap(src_file.fileno(), 0, access=mmap.ACCESS_WRITE if in_place else mmap.ACCESS_READ)
+        try:
+            if in_place:
+                _convert_mapped(src, src, transform, dtype, chunk_size, on_invalid, report)
+                src.flush()
+            else:
+                with open(output_path, "r+b") as dst_file, \
+                        mmap.mmap(dst_file.fileno(), 0, access=mmap.ACCESS_WRITE) as dst:
+                    _convert_mapped(src, dst, transform, dtype, chunk_size, on_invalid, report)
+                    dst.flush()
+        finally:
+            src.close()
+    return report
+
+
+def _convert_mapped(src, dst, transform, dtype, chunk_size, on_invalid, report, first=0):
+    """Выбор реализации: NumPy, если установлен, иначе array.array.
+
+    src и dst -- буферы (mmap или их срезы), first -- индекс первого
+    элемента буфера в файле для отчета о смещениях.
+    """
+    np = load_numpy()
+    if np is not None:
+        _convert_numpy(np, src, dst, transform, dtype, chunk_size, on_invalid, report, first)
+    else:
+        _convert_python(src, dst, transform, DTYPES[dtype][0], chunk_size, on_invalid, report, first)
+
+
+def _convert_numpy(np, src, dst, transform, dtype, chunk_size, on_invalid, report, first):
+    """Порционная конвертация представлений NumPy поверх mmap"""
+    disk_dtype = np.dtype("<" + dtype)
+    source = np.frombuffer(src, dtype=disk_dtype)
+    target = source if dst is src else np.frombuffer(dst, dtype=disk_dtype)
+    for start in range(0, len(source), chunk_size):
+        chunk = source[start:start + chunk_size]
+        result, valid = transform.convert_batch(chunk, on_invalid="mask")
+        if not valid.all():
+            report.add_invalid((np.flatnonzero(~valid) + first + start).tolist())
+            if on_invalid == "clip":
+                result = transform.convert_batch(chunk, on_invalid="clip")
+            elif on_invalid == "nan":
+                result[~valid] = np.nan
+        target[start:start + chunk_size] = result
+
+
+def _convert_python(src, dst, transform, code, chunk_size, on_invalid, report, first):
+    """Порционная конвертация без NumPy через array.array"""
+    itemsize = array(code).itemsize
+    swap = sys.byteorder != "little"
+    step = chunk_size * itemsize
+    for start in range(0, len(src), step):
+        chunk = array(code)
+        chunk.frombytes(src[start:start + step])
+        if swap:
+            chunk.byteswap()
+
+        result, valid = transform.convert_batch(chunk, on_invalid="mask")
+        if not all(valid):
+            base = first + start // itemsize
+            report.add_invalid(base + index for index, ok in enumerate(valid) if not ok)
+            if on_invalid == "clip":
+                result = transform.convert_batch(chunk, on_invalid="clip")
+            elif on_invalid == "nan":
+                result = [value if ok else float("nan") for value, ok in zip(result, valid)]
+
+        out = array(code, result)
+        if swap:
+            out.byteswap()
+        dst[start:start + step] = out.tobytes()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Конвертация бинарных файлов температур")
+    parser.add_argument("input", help="входной файл")
+    parser.add_argument("-o", "--output", help="выходной файл")
+    parser.add_argument("--in-place", action="store_true", help="записать результат во входной файл")
+    parser.add_argument("--from", dest="from_unit", required=True, help="исходная единица")
+    parser.add_argument("--to", dest="to_unit", required=True, help="целевая единица")
+    parser.add_argument("--dtype", choices=tuple(DTYPES), default="f4")
+    parser.add_argument("--chunk-size", type=int, default=1 << 20, help="элементов в порции")
+    parser.add_argument("--on-invalid", choices=INVALID_POLICIES, default="nan")
+    args = parser.parse_args(argv)
+
+    try:
+        report = convert_file(args.input, args.output, args.from_unit, args.to_unit, args.dtype,
+                              args.chunk_size, args.in_place, args.on_invalid)
+    except (OSError, ValueError) as e:
+        print(f"Ошибка: {e}", file=sys.stderr)
+        return 1
+    print(report, file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,141 @@
+"""Конвертация буферов без промежуточных копий.
+
+Вход -- любой объект с buffer protocol: bytes, bytearray, array.array,
+mmap, memoryview, в том числе срезы и представления с шагом
+(memoryview(a)[::2]). Результат пишется в переданный буфер того же
+размера или прямо во входной (in_place=True), поэтому весь массив не
+копируется ни в список, ни во временный массив: без NumPy значения
+проходят порциями по chunk_size элементов, с NumPy -- через представления
+над теми же байтами.
+
+Байты без типа (bytes, bytearray, mmap) интерпретируются в формате
+format ("d" -- float64, "f" -- float32, коды struct) в порядке байтов
+машины. Результат -- всегда числа с плавающей точкой ("f" или "d").
+"""
+from array import array
+
+from units import ABSOLUTE_ZERO_ERROR, UNITS, load_numpy
+
+# Политики для значений ниже абсолютного нуля: как у convert_batch, без "mask"
+BUFFER_POLICIES = ("raise", "nan", "clip")
+
+# Форматы выходного буфера
+FLOAT_FORMATS = ("f", "d")
+
+CHUNK_SIZE = 4096
+
+
+def as_view(buffer, format=None):
+    """Одномерный memoryview над буфером без копирования данных"""
+    view = buffer if isinstance(buffer, memoryview) else memoryview(buffer)
+    if format is not None and view.format != format:
+        # Приведение типа возможно только для непрерывных буферов
+        if not view.c_contiguous:
+            raise ValueError("Буфер с шагом нельзя привести к другому формату")
+        if view.nbytes % memoryview(array(format)).itemsize:
+            raise ValueError(f"Размер буфера {view.nbytes} не кратен размеру элемента {format!r}")
+        view = view.cast("B").cast(format)
+    elif view.ndim != 1:
+        if not view.c_contiguous:
+            raise ValueError("Многомерный буфер с шагом не поддерживается")
+        view = view.cast("B").cast(view.format)
+    return view
+
+
+def convert_buffer(values, from_unit, to_unit, out=None, in_place=False, on_invalid="raise",
+                   format=None, out_format=None, chunk_size=CHUNK_SIZE):
+    """Конвертация буфера values в out (или в values при in_place=True).
+
+    Без out и in_place результат пишется в новый array("d"); байты без
+    типа в out интерпретируются в out_format (по умолчанию -- format,
+    если это float32/float64, иначе "d"). Политики on_invalid: "raise" --
+    ValueError до записи первого значения, "nan" -- NaN на месте
+    недопустимых значений, "clip" -- прижатие к абсолютному нулю.
+    Возвращает буфер с результатом.
+    """
+    if on_invalid not in BUFFER_POLICIES:
+        raise ValueError(f"Неизвестная политика: {on_invalid}")
+    transform = UNITS.transform(UNITS.resolve(from_unit), UNITS.resolve(to_unit))
+    source = as_view(values, format)
+    if in_place:
+        if out is not None:
+            raise ValueError("Укажите либо out, либо in_place=True")
+        out = values
+        target = source
+    else:
+        if out is None:
+            out = array("d", bytes(8 * len(source)))
+        target = as_view(out)
+        if target.format == "B":
+            if out_format is None:
+                out_format = format if format in FLOAT_FORMATS else "d"
+            target = as_view(target, out_format)
+    if target.readonly:
+        raise ValueError("Буфер для результата доступен только для чтения")
+    if target.format not in FLOAT_FORMATS:
+        raise ValueError(f"Результат пишется только в float32/float64, а не {target.format!r}")
+    if len(target) != len(source):
+        raise ValueError("Размер выходного буфера не совпадает с входным")
+
+    np = load_numpy()
+    if np is not None:
+        _convert_numpy(np, source, target, transform, on_invalid, chunk_size)
+    else:
+        _convert_python(source, target, transform, on_invalid, chunk_size)
+    return out
+
+
+def _first_invalid(values, transform):
+    for index, value in enumerate(values):
+        if value < transform.lower or value > transform.upper:
+            return index
+    return None
+
+
+def _convert_numpy(np, source, target, transform, on_invalid, chunk_size):
+    """Представления NumPy над теми же байтами (в том числе с шагом)"""
+    src = np.asarray(source)
+    dst = np.asarray(target)
+    if on_invalid == "raise":
+        # Проверка порциями, чтобы маска не занимала память размером с буфер
+        for start in range(0, len(src), chunk_size):
+            chunk = src[start:start + chunk_size]
+            invalid = (chunk < transform.lower) | (chunk > transform.upper)
+            if invalid.any():
+                index = start + int(np.flatnonzero(invalid)[0])
+                raise ValueError(f"{ABSOLUTE_ZERO_ERROR} (элемент {index})")
+    for start in range(0, len(src), chunk_size):
+        chunk = src[start:start + chunk_size]
+        result = dst[start:start + chunk_size]
+        if on_invalid == "nan":
+            # Маска считается до записи: при in_place chunk и result -- одна память
+            invalid = (chunk < transform.lower) | (chunk > transform.upper)
+        if on_invalid == "clip":
+            np.clip(chunk, transform.lower, transform.upper, out=result, casting="same_kind")
+            np.multiply(result, transform.a, out=result)
+        else:
+            np.multiply(chunk, transform.a, out=result, casting="same_kind")
+        np.add(result, transform.b, out=result)
+        if on_invalid == "nan":
+            result[invalid] = np.nan
+
+
+def _convert_python(source, target, transform, on_invalid, chunk_size):
+    """Порции по chunk_size элементов: память не растет с размером буфера"""
+    lower, upper, a, b = transform.lower, transform.upper, transform.a, transform.b
+    if on_invalid == "raise" and len(source):
+        # min и max проходят по memoryview на уровне C без копии
+        if min(source) < lower or max(source) > upper:
+            index = _first_invalid(source, transform)
+            raise ValueError(f"{ABSOLUTE_ZERO_ERROR} (элемент {index})")
+    nan = float("nan")
+    code = target.format
+    for start in range(0, len(source), chunk_size):
+        chunk = source[start:start + chunk_size]
+        if on_invalid == "clip":
+            result = array(code, [min(max(value, lower), upper) * a + b for value in chunk])
+        elif on_invalid == "nan":
+            result = array(code, [value * a + b if lower <= value <= upper else nan for value in chunk])
+        else:
+            result = array(code, [value * a + b for value in chunk])
+        target[start:start + chunk_size] = result
@@ -0,0 +1,166 @@
+"""Потоковая конвертация CSV/JSONL файлов из командной строки.
+
+Пример:
+    python bulk_convert.py --from c --to f --column temp data.csv -o out.csv
+    cat data.jsonl | python bulk_convert.py --from k --to c --column value --format jsonl
+
+Файл читается и записывается порциями через цепочку генераторов, поэтому
+потребление памяти не зависит от размера файла. Конвертация использует то
+же преобразование и ту же проверку абсолютного нуля, что и
+TemperatureConverter. Ячейки могут содержать единицу ("23.50°C",
+"-40 °F"): такие значения конвертируются из указанной в них единицы.
+"""
+import argparse
+import csv
+import io
+import json
+import sys
+import time
+from itertools import islice
+
+from temperature_parser import convert_parsed, parse_column
+from units import UNITS
+
+REJECT_POLICIES = ("skip", "keep", "raise")
+
+
+class BulkStats:
+    """Счетчики потоковой конвертации"""
+
+    def __init__(self):
+        self.rows = 0
+        self.rejected = 0
+        self.started = time.perf_counter()
+
+    @property
+    def elapsed(self):
+        return time.perf_counter() - self.started
+
+    def report(self):
+        """Итоговая строка отчета"""
+        elapsed = self.elapsed
+        rate = self.rows / elapsed if elapsed > 0 else 0.0
+        return (f"Строк: {self.rows}, отклонено: {self.rejected}, "
+                f"время: {elapsed:.2f} с, скорость: {rate:,.0f} строк/с")
+
+
+def read_rows(stream, fmt):
+    """Чтение строк-словарей из CSV или JSONL"""
+    if fmt == "csv":
+        yield from csv.DictReader(stream)
+    else:
+        for line in stream:
+            if line.strip():
+                yield json.loads(line)
+
+
+def chunked(rows, size):
+    """Разбиение потока строк на порции"""
+    rows = iter(rows)
+    while True:
+        chunk = list(islice(rows, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def convert_rows(chunks, transform, column, output_column=None, on_reject="skip", stats=None):
+    """Конвертация столбца в каждой порции одним пакетным вызовом.
+
+    Отклоненные строки (нечисловые значения и значения ниже абсолютного
+    нуля) пропускаются ("skip"), остаются с пустым значением ("keep") или
+    прерывают обработку ("raise").
+    """
+    if on_reject not in REJECT_POLICIES:
+        raise ValueError(f"Неизвестная политика: {on_reject}")
+    output_column = output_column or column
+    stats = stats or BulkStats()
+
+    for chunk in chunks:
+        # Ячейки могут быть числами или строками вида "23.50°C"; без
+        # единицы значение считается заданным в исходной единице
+        parsed = parse_column([row.get(column) for row in chunk], default_unit=transform.source.code)
+        results, valid = convert_parsed(parsed, transform)
+
+        for number, (row, unit, result, ok) in enumerate(zip(chunk, parsed.units, results, valid), stats.rows + 1):
+            if unit is not None and ok:
+                row[output_column] = float(result)
+            elif on_reject == "raise":
+                raise ValueError(f"Строка {number}: некорректное значение {row.get(column)!r}")
+            else:
+                stats.rejected += 1
+                if on_reject == "skip":
+                    continue
+                row[output_column] = ""
+            yield row
+        stats.rows += len(chunk)
+
+
+def write_rows(rows, stream, fmt):
+    """Построчная запись результата в CSV или JSONL"""
+    if fmt == "csv":
+        writer = None
+        for row in rows:
+            if writer is None:
+                writer = csv.DictWriter(stream, fieldnames=list(row))
+                writer.writeheader()
+            writer.writerow(row)
+    else:
+        for row in rows:
+            stream.write(json.dumps(row, ensure_ascii=False))
+            stream.write("\n")
+
+
+def bulk_convert(source, target, from_unit, to_unit, column, fmt="csv",
+                 output_column=None, chunk_size=10000, on_reject="skip"):
+    """Потоковая конвертация из source в target; возвращает BulkStats"""
+    transform = UNITS.transform(UNITS.resolve(from_unit), UNITS.resolve(to_unit))
+    stats = BulkStats()
+    rows = read_rows(source, fmt)
+    converted = convert_rows(chunked(rows, chunk_size), transform, column,
+                             output_column, on_reject, stats)
+    write_rows(converted, target, fmt)
+    return stats
+
+
+def _open_text(path, mode, stream):
+    if path in (None, "-"):
+        return io.TextIOWrapper(stream.buffer, encoding="utf-8", newline="")
+    return open(path, mode, encoding="utf-8", newline="")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Потоковая конвертация температур в CSV/JSONL")
+    parser.add_argument("input", nargs="?", help="входной файл (по умолчанию stdin)")
+    parser.add_argument("-o", "--output", help="выходной файл (по умолчанию stdout)")
+    parser.add_argument("--from", dest="from_unit", required=True, help="исходная единица")
+    parser.add_argument("--to", dest="to_unit", required=True, help="целевая единица")
+    parser.add_argument("--column", required=True, help="столбец с температурой")
+    parser.add_argument("--output-column", help="столбец для результата (по умолчанию тот же)")
+    parser.add_argument("--format", choices=("csv", "jsonl"), help="формат (по умолчанию по расширению)")
+    parser.add_argument("--chunk-size", type=int, default=10000)
+    parser.add_argument("--on-reject", choices=REJECT_POLICIES, default="skip")
+    args = parser.parse_args(argv)
+
+    fmt = args.format or ("jsonl" if (args.input or "").endswith((".jsonl", ".json")) else "csv")
+    source = _open_text(args.input, "r", sys.stdin)
+    target = _open_text(args.output, "w", sys.stdout)
+    try:
+        stats = bulk_convert(source, target, args.from_unit, args.to_unit, args.column, fmt,
+                             args.output_column, args.chunk_size, args.on_reject)
+    except ValueError as e:
+        print(f"Ошибка: {e}", file=sys.stderr)
+        return 1
+    finally:
+        target.flush()
+        if args.input not in (None, "-"):
+            source.close()
+        if args.output not in (None, "-"):
+            target.close()
+
+    print(stats.report(), file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,256 @@
+"""Локальный HTTP/JSON-сервис конвертации температур (только stdlib).
+
+Эндпоинты:
+    GET  /units                -- зарегистрированные единицы
+    POST /convert              -- {"value": 23.5, "from": "c", "to": "f"}
+    POST /convert/batch        -- {"values": [...], "from": "c", "to": "f",
+                                   "on_invalid": "raise" | "null"}
+
+Одиночные запросы не конвертируются по одному: запросы на одну пару
+единиц, пришедшие в пределах batch_window секунд, собираются в пакет и
+конвертируются одним вызовом AffineTransform.convert_batch. Если
+одновременно обрабатывается больше max_pending запросов, новые получают
+503 с заголовком Retry-After, а не копятся в памяти.
+
+Запуск: python conversion_service.py --port 8080
+"""
+import argparse
+import asyncio
+import json
+from urllib.parse import urlsplit
+
+from units import ABSOLUTE_ZERO_ERROR, UNITS
+
+REASONS = {
+    200: "OK",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    413: "Payload Too Large",
+    503: "Service Unavailable",
+}
+
+
+class HTTPError(Exception):
+    """Ошибка запроса с HTTP-статусом"""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+class ServiceStats:
+    """Счетчики сервиса"""
+
+    def __init__(self):
+        self.requests = 0
+        self.rejected = 0
+        self.batches = 0
+        self.batched_values = 0
+
+    def as_dict(self):
+        return dict(vars(self))
+
+
+class MicroBatcher:
+    """Сбор одиночных значений одной пары единиц в пакеты"""
+
+    def __init__(self, transform, window, max_batch, stats):
+        self.transform = transform
+        self.window = window
+        self.max_batch = max_batch
+        self.stats = stats
+        self.values = []
+        self.futures = []
+        self.timer = None
+
+    def submit(self, value):
+        """Future с результатом конвертации value"""
+        future = asyncio.get_running_loop().create_future()
+        self.values.append(value)
+        self.futures.append(future)
+        if len(self.values) >= self.max_batch:
+            self.flush()
+        elif self.timer is None:
+            loop = asyncio.get_running_loop()
+            self.timer = loop.call_later(self.window, self.flush) if self.window > 0 else loop.call_soon(self.flush)
+        return future
+
+    def flush(self):
+        if self.timer is not None:
+            self.timer.cancel()
+            self.timer = None
+        values, futures = self.values, self.futures
+        self.values, self.futures = [], []
+        if not values:
+            return
+        self.stats.batches += 1
+        self.stats.batched_values += len(values)
+        results, valid = self.transform.convert_batch(values, on_invalid="mask")
+        for future, result, ok in zip(futures, results, valid):
+            if future.done():  # Клиент отключился
+                continue
+            if ok:
+                future.set_result(float(result))
+            else:
+                future.set_exception(HTTPError(400, ABSOLUTE_ZERO_ERROR))
+
+
+class ConversionService:
+    """HTTP/1.1-сервер конвертации с keep-alive"""
+
+    def __init__(self, batch_window=0.002, max_batch=1024, max_pending=1000, max_body=1 << 20):
+        self.batch_window = batch_window
+        self.max_batch = max_batch
+        self.max_pending = max_pending
+        self.max_body = max_body
+        self.pending = 0
+        self.batchers = {}
+        self.stats = ServiceStats()
+
+    async def start(self, host="127.0.0.1", port=8080):
+        return await asyncio.start_server(self.handle_connection, host, port)
+
+    async def handle_connection(self, reader, writer):
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b"\r\n\r\n")
+                except asyncio.IncompleteReadError:
+                    return
+                except asyncio.LimitOverrunError:
+                    await self.respond(writer, 413, {"error": "Слишком длинные заголовки"}, False)
+                    return
+                method, target, headers = self.parse_head(head)
+                keep_alive = headers.get("connection", "").lower() != "close"
+
+                length = int(headers.get("content-length", 0) or 0)
+                if length > self.max_body:
+                    await self.respond(writer, 413, {"error": "Слишком большое тело запроса"}, False)
+                    return
+                body = await reader.readexactly(length) if length else b""
+
+                status, payload = await self.admit(method, target, body)
+                await self.respond(writer, status, payload, keep_alive)
+                if not keep_alive:
+                    return
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    @staticmethod
+    def parse_head(head):
+        lines = head.decode("latin-1").split("\r\n")
+        method, target, _ = lines[0].split(" ", 2)
+        headers = {}
+        for line in lines[1:]:
+            if ":" in line:
+                name, value = line.split(":", 1)
+                headers[name.strip().lower()] = value.strip()
+        return method, target, headers
+
+    async def admit(self, method, target, body):
+        """Обработка запроса с ограничением числа одновременных запросов"""
+        self.stats.requests += 1
+        if self.pending >= self.max_pending:
+            self.stats.rejected += 1
+            return 503, {"error": "Сервис перегружен, повторите запрос позже"}
+        self.pending += 1
+        try:
+            return 200, await self.dispatch(method, urlsplit(target).path, body)
+        except HTTPError as e:
+            return e.status, {"error": str(e)}
+        finally:
+            self.pending -= 1
+
+    async def respond(self, writer, status, payload, keep_alive):
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        headers = [
+            f"HTTP/1.1 {status} {REASONS[status]}",
+            "Content-Type: application/json; charset=utf-8",
+            f"Content-Length: {len(body)}",
+            f"Connection: {'keep-alive' if keep_alive else 'close'}",
+        ]
+        if status == 503:
+            headers.append("Retry-After: 1")
+        writer.write(("\r\n".join(headers) + "\r\n\r\n").encode("latin-1") + body)
+        # Медленный клиент притормаживает только свое соединение
+        await writer.drain()
+
+    async def dispatch(self, method, path, body):
+        if path == "/units":
+            if method != "GET":
+                raise HTTPError(405, "Ожидается GET")
+            return {"units": [{"code": unit.code, "name": unit.name, "symbol": unit.symbol}
+                              for unit in UNITS.units.values()]}
+        if path not in ("/convert", "/convert/batch"):
+            raise HTTPError(404, f"Неизвестный путь: {path}")
+        if method != "POST":
+            raise HTTPError(405, "Ожидается POST")
+
+        try:
+            request = json.loads(body)
+            transform = UNITS.transform(UNITS.resolve(request["from"]), UNITS.resolve(request["to"]))
+        except (ValueError, KeyError, TypeError, AttributeError) as e:
+            raise HTTPError(400, f"Некорректный запрос: {e}") from None
+
+        if path == "/convert":
+            value = request.get("value")
+            if isinstance(value, bool) or not isinstance(value, (int, float)):
+                raise HTTPError(400, "Поле value должно быть числом")
+            return {"result": await self.convert_one(transform, float(value))}
+        return {"results": self.convert_many(transform, request.get("values"), request.get("on_invalid", "raise"))}
+
+    def convert_one(self, transform, value):
+        """Конвертация одного значения через общий пакет пары единиц"""
+        key = (transform.source.code, transform.target.code)
+        batcher = self.batchers.get(key)
+        if batcher is None:
+            batcher = self.batchers[key] = MicroBatcher(transform, self.batch_window, self.max_batch, self.stats)
+        return batcher.submit(value)
+
+    @staticmethod
+    def convert_many(transform, values, on_invalid):
+        if not isinstance(values, list):
+            raise HTTPError(400, "Поле values должно быть списком чисел")
+        if on_invalid not in ("raise", "null"):
+            raise HTTPError(400, f"Неизвестная политика: {on_invalid}")
+        try:
+            results, valid = transform.convert_batch([float(value) for value in values], on_invalid="mask")
+        except (TypeError, ValueError):
+            raise HTTPError(400, "Поле values должно быть списком чисел") from None
+        results = results.tolist() if hasattr(results, "tolist") else results
+        valid = valid.tolist() if hasattr(valid, "tolist") else valid
+        if on_invalid == "raise" and not all(valid):
+            raise HTTPError(400, f"{ABSOLUTE_ZERO_ERROR} (элемент {valid.index(False)})")
+        return [result if ok else None for result, ok in zip(results, valid)]
+
+
+async def serve(host, port, **options):
+    service = ConversionService(**options)
+    server = await service.start(host, port)
+    print(f"Сервис конвертации: http://{host}:{server.sockets[0].getsockname()[1]}")
+    async with server:
+        await server.serve_forever()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="HTTP/JSON-сервис конвертации температур")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--batch-window-ms", type=float, default=2.0,
+                        help="окно сбора одиночных запросов в пакет, мс")
+    parser.add_argument("--max-batch", type=int, default=1024, help="наибольший размер пакета")
+    parser.add_argument("--max-pending", type=int, default=1000,
+                        help="одновременных запросов до ответа 503")
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(serve(args.host, args.port, batch_window=args.batch_window_ms / 1000,
+                          max_batch=args.max_batch, max_pending=args.max_pending))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
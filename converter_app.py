@@ -0,0 +1,494 @@
+import sys
+import time
+import tkinter as tk
+from tkinter import ttk, messagebox
+from auth import AuthSystem
+from auth_window import AuthWindow
+from converter_core import TemperatureConverter
+from history_index import HistoryIndex
+from history_store import HistoryStore
+from quantile_sketch import HistoryStats
+from task_executor import TaskExecutor
+from temperature import Temperature
+from units import UNITS
+
+
+class ConverterApp(TemperatureConverter):
+    """Графическое приложение конвертера"""
+
+    def __init__(self, root, stall_report=False, profiler=None):
+        self.root = root
+        self.root.title("Умный конвертер температур")
+        self.root.geometry("500x500")
+
+        # Дисковые и тяжелые операции выполняются в фоне, главный поток
+        # только применяет их результаты
+        self.executor = TaskExecutor(root)
+        self.stall_report = stall_report
+        # StartupProfiler режима --startup-profile; сбрасывается после отчета
+        self.profiler = profiler
+        # Стили ttk общие для всего окна: настраиваются при первой сборке
+        self.styles_ready = False
+
+        # Инициализация системы авторизации
+        self.auth_system = AuthSystem()
+        self.history = None
+        self.history_index = None
+        self.history_stats = None
+        # Закрытие истории предыдущего пользователя, которое еще выполняется
+        self.history_closing = None
+        # Конвертации, сделанные до окончания загрузки истории
+        self.history_backlog = []
+        # Номер последней загрузки: результаты прежних загрузок отбрасываются
+        self.history_loads = 0
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+
+        # Показываем окно авторизации; интерфейс создается после входа
+        self.show_auth_window()
+        if self.profiler is not None:
+            self.profiler.mark("инициализация приложения")
+            self.root.after_idle(self.profiler.mark, "отрисовка окна авторизации")
+
+    def show_auth_window(self):
+        """Показать окно авторизации"""
+        # Скрываем главное окно пока не авторизуемся
+        self.root.withdraw()
+
+        # Окно не блокирует цикл событий: о результате сообщают обработчики
+        AuthWindow(
+            self.auth_system,
+            on_success_callback=self.on_auth_success,
+            executor=self.executor,
+            on_cancel_callback=self.on_auth_cancel
+        )
+
+    def on_auth_cancel(self):
+        """Окно авторизации закрыто без входа"""
+        if not self.auth_system.get_current_user():
+            # Если пользователь не авторизовался, закрываем приложение
+            self.on_close()
+
+    def on_auth_success(self):
+        """Вызывается после успешной авторизации"""
+        if self.profiler is not None:
+            self.profiler.mark("ввод логина и пароля", waiting=True)
+        try:
+            # Показываем главное окно
+            self.root.deiconify()
+
+            # Загружаем историю для текущего пользователя
+            self.load_history()
+
+            # Переменные (списки единиц создает create_widgets)
+            self.input_var = tk.StringVar()
+            self.valid_input = tk.BooleanVar(value=True)
+
+            # Регистрируем функцию валидации
+            self.validate_cmd = self.root.register(self.validate_input)
+
+            # Создание интерфейса
+            self.create_widgets()
+
+            # Добавляем меню пользователя
+            self.create_user_menu()
+        except Exception as e:
+            messagebox.showerror("Ошибка", f"Ошибка при создании интерфейса: {str(e)}")
+        if self.profiler is not None:
+            self.profiler.mark("создание интерфейса")
+            # Окно готово к вводу, когда Tk отрисовал его и освободился
+            self.root.after_idle(self.on_startup_idle)
+
+    def on_startup_idle(self):
+        self.profiler.finish("первая отрисовка главного окна")
+        self.print_startup_report()
+
+    def print_startup_report(self):
+        """Отчет профиля запуска, когда окно готово и история загружена"""
+        profiler = self.profiler
+        if profiler is None or profiler.finished is None or not profiler.events:
+            return
+        print(profiler.report(), file=sys.stderr)
+        # Повторные входы после выхода не профилируются
+        self.profiler = None
+
+    def create_user_menu(self):
+        """Создание меню пользователя"""
+        menubar = tk.Menu(self.root)
+        self.root.config(menu=menubar)
+
+        user_menu = tk.Menu(menubar, tearoff=0)
+        menubar.add_cascade(label=f"👤 {self.auth_system.get_current_user()}", menu=user_menu)
+        user_menu.add_command(label="Сменить пароль", command=self.change_password)
+        user_menu.add_separator()
+        user_menu.add_command(label="Выйти", command=self.logout)
+
+    def change_password(self):
+        """Смена пароля"""
+        pass
+
+    def logout(self):
+        """Выход из системы"""
+        # Дописываем историю на диск в фоне; загрузка истории следующего
+        # пользователя дождется окончания записи
+        self.close_history(wait=False)
+        self.auth_system.logout()
+        # Очищаем интерфейс
+        for widget in self.root.winfo_children():
+            widget.destroy()
+        # Показываем окно авторизации снова
+        self.show_auth_window()
+
+    def create_widgets(self):
+        # Настраиваем стили (один раз за время жизни окна)
+        self.setup_styles()
+
+        # Основное окно - конвертер
+        main_frame = ttk.Frame(self.root, padding="15")
+        main_frame.pack(fill=tk.BOTH, expand=True)
+
+        # Заголовок
+        title_label = tk.Label(
+            main_frame,
+            text="Конвертер температур",
+            font=("Arial", 16, "bold")
+        )
+        title_label.pack(pady=(0, 20))
+
+        # Фрейм для выбора конвертации
+        conversion_frame = ttk.LabelFrame(main_frame, text="Выберите конвертацию")
+        conversion_frame.pack(fill=tk.X, pady=10)
+
+        # Выпадающие списки
+        input_frame = ttk.Frame(conversion_frame)
+        input_frame.pack(fill=tk.X, pady=10)
+
+        ttk.Label(input_frame, text="Из:").pack(side=tk.LEFT, padx=(0, 10))
+
+        self.from_unit = ttk.Combobox(
+            input_frame,
+            values=UNITS.names(),
+            state="readonly",
+            width=15
+        )
+        self.from_unit.set("Цельсий")
+        self.from_unit.pack(side=tk.LEFT, padx=(0, 20))
+
+        ttk.Label(input_frame, text="в:").pack(side=tk.LEFT, padx=(0, 10))
+
+        self.to_unit = ttk.Combobox(
+            input_frame,
+            values=UNITS.names(),
+            state="readonly",
+            width=15
+        )
+        self.to_unit.set("Фаренгейт")
+        self.to_unit.pack(side=tk.LEFT)
+
+        # ДОБАВЛЯЕМ ПРИВЯЗКУ СОБЫТИЙ ПОСЛЕ СОЗДАНИЯ КОМБОБОКСОВ
+        self.from_unit.bind("<<ComboboxSelected>>", lambda e: self.on_unit_change())
+        self.to_unit.bind("<<ComboboxSelected>>", lambda e: self.on_unit_change())
+
+        # Поле ввода
+        input_label_frame = ttk.LabelFrame(main_frame)
+        input_label_frame.pack(fill=tk.X, pady=10)
+
+        ttk.Label(input_label_frame, text="Введите температуру:", font=("Arial", 10)).pack(anchor=tk.W)
+
+        self.entry = ttk.Entry(
+            main_frame,
+            textvariable=self.input_var,
+            validate="key",
+            validatecommand=(self.validate_cmd, "%P"),
+            font=("Arial", 12)
+        )
+        self.entry.pack(fill=tk.X, pady=(0, 10))
+        self.entry.focus_set()
+
+        # Биндинги для поля ввода
+        self.entry.bind("<Return>", lambda e: self.convert())
+
+        # Подсказка под полем ввода
+        self.validation_label = ttk.Label(
+            main_frame,
+            text="",
+            foreground="red",
+            font=("Arial", 9)
+        )
+        self.validation_label.pack(anchor=tk.W)
+
+        # Следим за изменениями валидности
+        self.valid_input.trace_add("write", self.update_validation_status)
+
+        # Кнопка конвертации
+        convert_btn = ttk.Button(
+            main_frame,
+            text="Конвертировать",
+            command=self.convert,
+            style="Accent.TButton"
+        )
+        convert_btn.pack(pady=15)
+
+        # Результат
+        result_frame = tk.Frame(main_frame)
+        result_frame.pack(fill=tk.X, pady=10)
+
+        ttk.Label(result_frame, text="Результат:", font=("Arial", 11, "bold")).pack(anchor=tk.W)
+
+        self.result_label = ttk.Label(
+            result_frame,
+            text="—",
+            font=("Arial", 14, "bold"),
+            foreground="#2c3e50"
+        )
+        self.result_label.pack(anchor=tk.W, pady=(5, 0))
+
+        # Кнопка открытия истории
+        history_btn = tk.Button(
+            main_frame,
+            text="📋 Показать историю",
+            command=self.open_history_window,
+            font=("Arial", 11, "bold"),
+            bg="#2E7D32",  # Темно-зеленый фон
+            fg="white",  # Белый текст
+            padx=30,  # Горизонтальные отступы
+            pady=12,  # Вертикальные отступы
+            relief="raised",
+            bd=2,
+            cursor="hand2"
+        )
+        history_btn.pack(pady=20)
+
+        # Эффект при наведении
+        history_btn.bind("<Enter>", lambda e: history_btn.config(bg="#388E3C"))
+        history_btn.bind("<Leave>", lambda e: history_btn.config(bg="#2E7D32"))
+
+    def setup_styles(self):
+        """Настройка стилей для красивого интерфейса"""
+        if self.styles_ready:
+            return
+        self.styles_ready = True
+        style = ttk.Style()
+
+        # Стиль для акцентной кнопки
+        style.configure("Accent.TButton", font=("Arial", 11, "bold"))
+
+        # Стиль для кнопки истории - ВЫДЕЛЕННЫЙ
+        style.configure("History.TButton",
+                        font=("Arial", 10, "bold"),
+                        background="#4CAF50",  # Зеленый фон
+                        foreground="white",  # Белый текст
+                        padding=(10, 5))
+
+        # Стиль для выпадающих списков
+        style.configure("TCombobox", padding=5)
+
+    def update_validation_status(self, *args):
+        """Обновляет подсказку и визуальное отображение валидности"""
+        current_text = self.input_var.get()
+
+        if not self.valid_input.get() and current_text not in ("", "-"):
+            self.validation_label.config(text="Введите число (например: 23.5 или -10)")
+            # Красный фон для ошибки, черный текст для читаемости
+            self.entry.config(background="#ffcccc", foreground="black")
+        else:
+            self.validation_label.config(text="")
+            # Стандартные цвета
+            self.entry.config(background="white", foreground="black")
+
+    def validate_input(self, new_text):
+        """Проверяет корректность ввода в реальном времени"""
+        if new_text == "" or new_text == "-":
+            self.valid_input.set(True)
+            return True
+
+        # Разрешаем отрицательные числа
+        if new_text.startswith("-"):
+            number_part = new_text[1:]
+            if number_part == "" or number_part == ".":
+                self.valid_input.set(True)
+                return True
+            try:
+                float(number_part)
+                self.valid_input.set(True)
+                return True
+            except ValueError:
+                self.valid_input.set(False)
+                return False
+
+        try:
+            float(new_text)
+            self.valid_input.set(True)
+            return True
+        except ValueError:
+            self.valid_input.set(False)
+            return False
+
+    def show_validation_error(self):
+        """Визуальное оповещение об ошибке (мигание)"""
+        original_bg = self.entry.cget("background")
+        original_fg = self.entry.cget("foreground")
+
+        # Мигание красным фоном, но сохраняем черный текст
+        self.entry.config(background="#ffcccc", foreground="black")
+        self.entry.after(300, lambda: self.entry.config(
+            background=original_bg,
+            foreground=original_fg
+        ))
+
+    def validate_paste(self, text):
+        try:
+            float(text)
+            return True
+        except ValueError:
+            return False
+
+    def open_history_window(self):
+        # Окно истории нужно не в каждом сеансе: модуль загружается при первом открытии
+        from history_window import HistoryWindow
+
+        if self.history is None:
+            messagebox.showinfo("История", "История еще загружается")
+            return
+        HistoryWindow(
+            self.root,
+            self.history,
+            on_clear=self.clear_history,
+            on_export=self.export_history,
+            index=self.history_index,
+            stats=self.history_stats,
+            executor=self.executor
+        )
+
+    def convert(self, event=None):
+        if not self.valid_input.get():
+            messagebox.showerror("Ошибка", "Некорректный ввод. Введите число.")
+            return
+
+        try:
+            temp = float(self.input_var.get())
+            from_unit = self.from_unit.get()
+            to_unit = self.to_unit.get()
+
+            # Проверяем, что выбраны разные единицы
+            if from_unit == to_unit:
+                messagebox.showerror("Ошибка", "Выберите разные единицы измерения")
+                return
+
+            # Единица разрешается один раз, конвертация -- готовым преобразованием
+            source = Temperature(temp, UNITS.by_name(from_unit).code)
+            result = source.to(UNITS.by_name(to_unit).code)
+
+            self.result_label.config(text=f"{source} = {result}")
+            self.add_to_history(source.unit, result.unit, source.value, result.value)
+
+        except ValueError as e:
+            messagebox.showerror("Ошибка", str(e))
+
+    def on_unit_change(self, event=None):
+        """Обработчик изменения выбора единиц измерения"""
+        from_unit = self.from_unit.get()
+        to_unit = self.to_unit.get()
+
+        if from_unit and to_unit and from_unit == to_unit:
+            self.result_label.config(text="—", foreground="red")
+        else:
+            self.result_label.config(text="—", foreground="#2c3e50")
+
+    def add_to_history(self, from_unit, to_unit, value, result):
+        if self.history is None:
+            # История еще открывается: запись добавится после загрузки
+            self.history_backlog.append((from_unit, to_unit, value, result, time.time()))
+            return
+        # Запись на диск выполняет фоновый поток хранилища
+        self.history.add(from_unit, to_unit, value, result)
+
+    def export_history(self):
+        from tkinter import filedialog
+        from export_window import ExportWindow
+
+        if self.history is None:
+            messagebox.showinfo("История", "История еще загружается")
+            return
+        file_path = filedialog.asksaveasfilename(
+            defaultextension=".csv",
+            filetypes=[("CSV Files", "*.csv"), ("CSV (gzip)", "*.csv.gz")]
+        )
+        if file_path:
+            # Экспорт выполняется в фоне с индикатором прогресса
+            ExportWindow(self.root, self.history, file_path, self.executor)
+
+    def clear_history(self):
+        self.history.clear()
+
+    def save_history(self):
+        """Сохранение истории для текущего пользователя"""
+        if self.history is not None:
+            self.executor.submit(self.history.flush)
+
+    def load_history(self):
+        """Загрузка истории для текущего пользователя в фоне"""
+        self.close_history(wait=False)
+        load = self.history_loads
+        username = self.auth_system.get_current_user()
+        self.executor.submit(self.open_history, username, self.history_closing,
+                             on_success=lambda store: self.on_history_loaded(load, store),
+                             on_error=self.on_history_error)
+
+    @staticmethod
+    def open_history(username, closing):
+        """Фоновая часть загрузки: открытие (и перенос старого формата) файла"""
+        if closing is not None:
+            # Файл того же пользователя мог еще дописываться при выходе
+            closing.result()
+        return HistoryStore(username)
+
+    def on_history_loaded(self, load, store):
+        if load != self.history_loads:
+            # Пользователь вышел, пока история загружалась; в хранилище
+            # ничего не добавлялось, так что закрытие не трогает файл
+            self.executor.submit(store.close)
+            return
+        self.history = store
+        # Индекс строится при первом поиске в окне истории
+        self.history_index = HistoryIndex(store)
+        self.history_stats = HistoryStats(store)
+        for from_unit, to_unit, value, result, timestamp in self.history_backlog:
+            store.add(from_unit, to_unit, value, result, timestamp)
+        self.history_backlog = []
+        if self.profiler is not None:
+            self.profiler.event("история загружена (в фоне)")
+            self.print_startup_report()
+
+    def on_history_error(self, error):
+        if self.profiler is not None:
+            self.profiler.event("ошибка загрузки истории")
+            self.print_startup_report()
+        messagebox.showerror("Ошибка", f"Не удалось загрузить историю: {error}")
+
+    def close_history(self, wait=True):
+        """Запись накопленной истории и остановка фоновой записи.
+
+        При wait=False закрытие выполняется в фоне, а следующая загрузка
+        истории дождется его окончания.
+        """
+        self.history_backlog = []
+        self.history_loads += 1
+        if self.history is not None:
+            if wait:
+                self.history.close()
+            else:
+                self.history_closing = self.executor.submit(self.history.close)
+            self.history = None
+            self.history_index = None
+            self.history_stats = None
+        if wait and self.history_closing is not None:
+            self.history_closing.result()
+            self.history_closing = None
+
+    def on_close(self):
+        """Закрытие приложения"""
+        self.close_history()
+        self.executor.shutdown()
+        if self.stall_report:
+            print(self.executor.stall_report(), file=sys.stderr)
+        self.root.destroy()
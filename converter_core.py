@@ -0,0 +1,94 @@
+"""Математика конвертации температур без графического интерфейса.
+
+Модуль не импортирует tkinter и систему авторизации, поэтому подходит
+для тестов, пакетных задач и короткоживущих рабочих процессов.
+"""
+from units import UNITS
+
+_C_TO_F = UNITS.transform("c", "f")
+_F_TO_C = UNITS.transform("f", "c")
+_C_TO_K = UNITS.transform("c", "k")
+_K_TO_C = UNITS.transform("k", "c")
+_F_TO_K = UNITS.transform("f", "k")
+_K_TO_F = UNITS.transform("k", "f")
+
+
+class TemperatureConverter:
+
+    @staticmethod
+    def c_to_f(celsius):
+        """Цельсий → Фаренгейт"""
+        return _C_TO_F(celsius)
+
+    @staticmethod
+    def f_to_c(fahrenheit):
+        """Фаренгейт → Цельсий"""
+        return _F_TO_C(fahrenheit)
+
+    @staticmethod
+    def c_to_k(celsius):
+        """Цельсий → Кельвин"""
+        return _C_TO_K(celsius)
+
+    @staticmethod
+    def k_to_c(kelvin):
+        """Кельвин → Цельсий"""
+        return _K_TO_C(kelvin)
+
+    @staticmethod
+    def f_to_k(fahrenheit):
+        """Фаренгейт → Кельвин"""
+        return _F_TO_K(fahrenheit)
+
+    @staticmethod
+    def k_to_f(kelvin):
+        """Кельвин → Фаренгейт"""
+        return _K_TO_F(kelvin)
+
+    @staticmethod
+    def convert_value(value, from_unit, to_unit):
+        """Конвертация между любыми зарегистрированными единицами"""
+        return UNITS.transform(UNITS.resolve(from_unit), UNITS.resolve(to_unit))(value)
+
+    @staticmethod
+    def convert_batch(values, conversion, on_invalid="raise"):
+        """Пакетная конвертация массива значений.
+
+        conversion -- строка вида "c_to_f". on_invalid задает поведение для
+        значений ниже абсолютного нуля: "raise" -- ValueError, "nan" -- NaN
+        в результате, "clip" -- значение прижимается к абсолютному нулю,
+        "mask" -- возвращается пара (результат, маска корректных значений).
+        С NumPy возвращает ndarray, без него -- список.
+        """
+        source, _, target = conversion.partition("_to_")
+        return UNITS.transform(source, target).convert_batch(values, on_invalid)
+
+    @staticmethod
+    def c_to_f_batch(values, on_invalid="raise"):
+        """Цельсий → Фаренгейт (пакетно)"""
+        return TemperatureConverter.convert_batch(values, "c_to_f", on_invalid)
+
+    @staticmethod
+    def f_to_c_batch(values, on_invalid="raise"):
+        """Фаренгейт → Цельсий (пакетно)"""
+        return TemperatureConverter.convert_batch(values, "f_to_c", on_invalid)
+
+    @staticmethod
+    def c_to_k_batch(values, on_invalid="raise"):
+        """Цельсий → Кельвин (пакетно)"""
+        return TemperatureConverter.convert_batch(values, "c_to_k", on_invalid)
+
+    @staticmethod
+    def k_to_c_batch(values, on_invalid="raise"):
+        """Кельвин → Цельсий (пакетно)"""
+        return TemperatureConverter.convert_batch(values, "k_to_c", on_invalid)
+
+    @staticmethod
+    def f_to_k_batch(values, on_invalid="raise"):
+        """Фаренгейт → Кельвин (пакетно)"""
+        return TemperatureConverter.convert_batch(values, "f_to_k", on_invalid)
+
+    @staticmethod
+    def k_to_f_batch(values, on_invalid="raise"):
+        """Кельвин → Фаренгейт (пакетно)"""
+        return TemperatureConverter.convert_batch(values, "k_to_f", on_invalid)
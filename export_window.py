@@ -0,0 +1,68 @@
+import threading
+import tkinter as tk
+from tkinter import ttk, messagebox
+
+from history_export import export_history
+
+
+class ExportWindow:
+    """Окно фонового экспорта истории с прогрессом и отменой"""
+
+    def __init__(self, root, history, file_path, executor):
+        self.file_path = file_path
+        self.executor = executor
+        self.cancel_event = threading.Event()
+
+        self.window = tk.Toplevel(root)
+        self.window.title("Экспорт истории")
+        self.window.geometry("360x130")
+        self.window.resizable(False, False)
+        self.window.protocol("WM_DELETE_WINDOW", self.cancel)
+
+        self.status_label = ttk.Label(self.window, text="Подготовка...")
+        self.status_label.pack(anchor=tk.W, padx=15, pady=(15, 5))
+
+        self.progress = ttk.Progressbar(self.window, mode="determinate", maximum=max(len(history), 1))
+        self.progress.pack(fill=tk.X, padx=15)
+
+        self.cancel_btn = ttk.Button(self.window, text="Отмена", command=self.cancel)
+        self.cancel_btn.pack(pady=15)
+
+        # Окно истории модальное: забираем захват ввода и вернем его при закрытии
+        self.previous_grab = self.window.grab_current()
+        self.window.grab_set()
+
+        # Экспорт идет в пуле фоновых задач, результат и прогресс
+        # доставляются в поток интерфейса
+        executor.submit(
+            export_history, history, file_path,
+            progress=lambda done, total: executor.call_soon(self.show_progress, done, total),
+            cancel=self.cancel_event,
+            on_success=self.finish,
+            on_error=self.fail
+        )
+
+    def show_progress(self, done, total):
+        if self.window.winfo_exists():
+            self.progress.config(value=done)
+            self.status_label.config(text=f"Выгружено записей: {done} из {total}")
+
+    def finish(self, result):
+        self.close()
+        if result is not None:
+            messagebox.showinfo("Экспорт", f"Выгружено записей: {result}")
+
+    def fail(self, error):
+        self.close()
+        messagebox.showerror("Ошибка", f"Ошибка экспорта: {error}")
+
+    def close(self):
+        self.window.destroy()
+        if self.previous_grab is not None and self.previous_grab.winfo_exists():
+            self.previous_grab.grab_set()
+
+    def cancel(self):
+        """Отмена экспорта; окно закроется, когда задача остановится"""
+        self.cancel_event.set()
+        self.cancel_btn.config(state=tk.DISABLED)
+        self.status_label.config(text="Отмена...")
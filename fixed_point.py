@@ -0,0 +1,161 @@
+"""Точная конвертация целочисленных значений с фиксированной точкой.
+
+Значение хранится целым числом долей единицы: digits=3 -- тысячные
+(милликельвины, миллиградусы), digits=2 -- сотые. Преобразование пары
+единиц сводится к целочисленной формуле y = (num * x + add) // den с
+коэффициентами, вычисленными в дробях, поэтому результат округляется
+ровно один раз (половина -- вверх) и не зависит от погрешностей float.
+Граница абсолютного нуля переводится в целое число в шкале входа и
+проверяется целочисленным сравнением: -273150 м°C допустимо, -273151 --
+нет.
+
+Массивы обрабатываются в буферах array.array("q") без промежуточных
+списков и float-объектов; с NumPy -- векторно в int64, если
+промежуточные произведения гарантированно помещаются в 64 бита.
+"""
+import math
+from array import array
+from fractions import Fraction
+
+from units import ABSOLUTE_ZERO_ERROR, UNITS, load_numpy
+
+# Политики для значений за абсолютным нулем
+FIXED_POLICIES = ("raise", "clip", "sentinel")
+
+# Маркер недопустимого значения для политики "sentinel"
+SENTINEL = -(1 << 63)
+
+INT64_MAX = (1 << 63) - 1
+
+
+class FixedPointTransform:
+    """Преобразование целых долей единицы source в доли единицы target"""
+
+    def __init__(self, source, target, source_digits=3, target_digits=None):
+        if target_digits is None:
+            target_digits = source_digits
+        self.source = UNITS.units[UNITS.resolve(source)]
+        self.target = UNITS.units[UNITS.resolve(target)]
+        self.source_digits = source_digits
+        self.target_digits = target_digits
+
+        # y = a * x + b в долях: Y = a * 10^(q - p) * X + b * 10^q
+        a = self.source.scale / self.target.scale
+        b = (self.source.offset - self.target.offset) / self.target.scale
+        slope = a * Fraction(10) ** (target_digits - source_digits)
+        intercept = b * Fraction(10) ** target_digits
+        den = math.lcm(slope.denominator, intercept.denominator)
+        num = slope.numerator * (den // slope.denominator)
+        add = intercept.numerator * (den // intercept.denominator)
+        # Округление половины вверх: floor((2 * (num * X + add) + den) / (2 * den))
+        self.num, self.add, self.den = 2 * num, 2 * add + den, 2 * den
+
+        # Абсолютный нуль в долях входной единицы, округленный внутрь диапазона
+        zero = -self.source.offset / self.source.scale * Fraction(10) ** source_digits
+        if self.source.scale > 0:
+            self.lower, self.upper = math.ceil(zero), None
+        else:
+            self.lower, self.upper = None, math.floor(zero)
+
+    def __repr__(self):
+        return (f"FixedPointTransform({self.source.code!r}/1e{self.source_digits} → "
+                f"{self.target.code!r}/1e{self.target_digits}: ({self.num} * x + {self.add}) // {self.den})")
+
+    def valid(self, value):
+        return (self.lower is None or value >= self.lower) and (self.upper is None or value <= self.upper)
+
+    def __call__(self, value):
+        """Конвертация одного целого значения"""
+        if not self.valid(value):
+            raise ValueError(ABSOLUTE_ZERO_ERROR)
+        return (self.num * value + self.add) // self.den
+
+    def convert_array(self, values, out=None, on_invalid="raise"):
+        """Конвертация массива целых значений.
+
+        values -- array.array целого типа или последовательность целых;
+        out -- массив array("q") той же длины для результата (можно
+        передать сам values, если это array("q")). on_invalid: "raise" --
+        ValueError, "clip" -- значение прижимается к абсолютному нулю,
+        "sentinel" -- в результат пишется SENTINEL. Возвращает out.
+        """
+        if on_invalid not in FIXED_POLICIES:
+            raise ValueError(f"Неизвестная политика: {on_invalid}")
+        if out is None:
+            out = array("q", bytes(8 * len(values)))
+        elif len(out) != len(values):
+            raise ValueError("Размер выходного массива не совпадает с входным")
+        if not len(values):
+            return out
+
+        # Границы проверяются один раз по минимуму и максимуму (в C)
+        low, high = min(values), max(values)
+        all_valid = self.valid(low) and self.valid(high)
+        if not all_valid and on_invalid == "raise":
+            index = next(i for i, value in enumerate(values) if not self.valid(value))
+            raise ValueError(f"{ABSOLUTE_ZERO_ERROR} (элемент {index})")
+        # Результаты допустимых (или прижатых) значений лежат между этими
+        low = low if self.lower is None else max(low, self.lower)
+        high = high if self.upper is None else min(high, self.upper)
+        self._check_range(low, high)
+
+        np = load_numpy()
+        if np is not None and self._fits_int64(low, high):
+            self._convert_numpy(np, values, out, all_valid, on_invalid)
+        else:
+            self._convert_python(values, out, all_valid, on_invalid)
+        return out
+
+    def _check_range(self, low, high):
+        for value in (low, high):
+            result = (self.num * value + self.add) // self.den
+            if not SENTINEL < result <= INT64_MAX:
+                raise ValueError(f"Результат {result} не помещается в 64 бита")
+
+    def _fits_int64(self, low, high):
+        bound = max(abs(low), abs(high), abs(self.lower or 0), abs(self.upper or 0))
+        return abs(self.num) * bound + abs(self.add) <= INT64_MAX
+
+    def _convert_python(self, values, out, all_valid, on_invalid):
+        num, add, den = self.num, self.add, self.den
+        if all_valid:
+            for index, value in enumerate(values):
+                out[index] = (num * value + add) // den
+            return
+        lower = -INT64_MAX - 1 if self.lower is None else self.lower
+        upper = INT64_MAX if self.upper is None else self.upper
+        clip = on_invalid == "clip"
+        for index, value in enumerate(values):
+            if value < lower:
+                if not clip:
+                    out[index] = SENTINEL
+                    continue
+                value = lower
+            elif value > upper:
+                if not clip:
+                    out[index] = SENTINEL
+                    continue
+                value = upper
+            out[index] = (num * value + add) // den
+
+    def _convert_numpy(self, np, values, out, all_valid, on_invalid):
+        source = np.frombuffer(values, dtype=np.int64) if isinstance(values, array) and values.typecode == "q" \
+            else np.asarray(values, dtype=np.int64)
+        target = np.frombuffer(out, dtype=np.int64)
+        if all_valid:
+            np.floor_divide(source * self.num + self.add, self.den, out=target)
+            return
+        lower = np.iinfo(np.int64).min if self.lower is None else self.lower
+        upper = np.iinfo(np.int64).max if self.upper is None else self.upper
+        invalid = (source < lower) | (source > upper)
+        clipped = np.clip(source, lower, upper)
+        np.floor_divide(clipped * self.num + self.add, self.den, out=target)
+        if on_invalid == "sentinel":
+            target[invalid] = SENTINEL
+
+
+def convert_fixed(values, from_unit, to_unit, source_digits=3, target_digits=None, out=None,
+                  on_invalid="raise"):
+    """Конвертация массива целых долей единицы; см. FixedPointTransform"""
+    transform = FixedPointTransform(from_unit, to_unit, source_digits, target_digits)
+    return transform.convert_array(values, out, on_invalid)
@@ -0,0 +1,53 @@
+"""Потоковый экспорт истории конвертаций в CSV.
+
+Записи читаются с диска блоками и сразу пишутся в файл, поэтому история
+целиком в память не загружается. Файл с расширением .gz сжимается gzip.
+Кроме отформатированных строк выгружаются числовые значения и коды единиц.
+"""
+import csv
+import gzip
+import os
+
+from history_store import READ_BLOCK, format_record
+
+HEADER = ["Time", "Input", "Result", "Timestamp", "Input value", "Input unit", "Result value", "Result unit"]
+
+
+def export_history(history, file_path, progress=None, cancel=None, compress=None):
+    """Экспорт истории в хронологическом порядке.
+
+    progress(сделано, всего) вызывается после каждого блока, cancel --
+    threading.Event для отмены. Выгружаются записи, существовавшие на момент
+    начала экспорта. Возвращает число записей или None, если экспорт
+    отменен (недописанный файл удаляется).
+    """
+    if compress is None:
+        compress = file_path.endswith(".gz")
+    total = len(history)
+    opener = gzip.open if compress else open
+
+    with opener(file_path, "wt", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(HEADER)
+        done = 0
+        block = []
+        for _, record in history.scan(0, total):
+            block.append((*format_record(record), record.timestamp, record.value,
+                          record.source, record.result, record.target))
+            if len(block) == READ_BLOCK:
+                if cancel is not None and cancel.is_set():
+                    break
+                writer.writerows(block)
+                done += len(block)
+                block = []
+                if progress is not None:
+                    progress(done, total)
+        else:
+            writer.writerows(block)
+            done += len(block)
+            if progress is not None:
+                progress(done, total)
+            return done
+
+    os.remove(file_path)
+    return None
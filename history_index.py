@@ -0,0 +1,187 @@
+"""Индексы истории конвертаций по времени и по значению.
+
+HistoryIndex держит два отсортированных индекса по записям HistoryStore:
+по времени и по исходному значению, приведенному к Кельвину. Диапазонные
+запросы выполняются двоичным поиском, поэтому стоят O(log n + k), а не
+полный проход по истории. Новые записи досортировываются в индексы при
+следующем запросе. Первое построение проходит всю историю, поэтому окно
+истории выполняет запросы в фоновом потоке.
+"""
+import heapq
+import math
+import re
+import threading
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import datetime, time as clock
+
+from temperature_parser import parse_temperature
+from units import UNITS
+
+
+class SortedIndex:
+    """Отсортированные ключи и номера записей.
+
+    Ключ не меньше последнего (время новых записей) дописывается в конец за
+    O(1); остальные копятся и вливаются одним слиянием перед запросом.
+    """
+
+    def __init__(self, pairs=()):
+        pairs = sorted(pairs)
+        self.keys = array("d", (key for key, _ in pairs))
+        self.positions = array("q", (position for _, position in pairs))
+        self.unsorted = []
+
+    def add(self, key, position):
+        if not self.keys or key >= self.keys[-1]:
+            self.keys.append(key)
+            self.positions.append(position)
+        else:
+            self.unsorted.append((key, position))
+
+    def merge(self):
+        """Слияние накопленных ключей: O(n + m log m) на всю пачку"""
+        if not self.unsorted:
+            return
+        pairs = sorted(self.unsorted)
+        self.unsorted = []
+        merged = list(heapq.merge(zip(self.keys, self.positions), pairs))
+        self.keys = array("d", (key for key, _ in merged))
+        self.positions = array("q", (position for _, position in merged))
+
+    def range(self, low=None, high=None):
+        """Номера записей с low <= ключ <= high"""
+        self.merge()
+        start = 0 if low is None else bisect_left(self.keys, low)
+        stop = len(self.keys) if high is None else bisect_right(self.keys, high)
+        return self.positions[start:stop]
+
+
+class HistoryQueryResult:
+    """Результат запроса: найденные записи от новых к старым"""
+
+    def __init__(self, store, positions):
+        self.store = store
+        self.positions = positions
+
+    def __len__(self):
+        return len(self.positions)
+
+    def __iter__(self):
+        for position in self.positions:
+            yield self.store.get(position)
+
+    def page(self, offset, count):
+        """Та же постраничная выдача, что и у HistoryStore"""
+        return [self.store.get(position) for position in self.positions[offset:offset + count]]
+
+
+class HistoryIndex:
+    """Диапазонные запросы по времени и значению поверх HistoryStore"""
+
+    def __init__(self, store):
+        self.store = store
+        self.generation = None
+        self.indexed = 0
+        self.by_time = SortedIndex()
+        self.by_kelvin = SortedIndex()
+        # Запросы приходят из фоновых потоков окна истории
+        self.lock = threading.Lock()
+
+    def refresh(self):
+        """Построение индексов или добавление в них новых записей"""
+        with self.lock:
+            self._refresh()
+
+    def _refresh(self):
+        if self.generation != self.store.generation or self.indexed > len(self.store):
+            # Поколение до прохода: clear() во время перестроения даст
+            # несовпадение при следующем обновлении, а не устаревшие позиции
+            generation = self.store.generation
+            times = []
+            kelvins = []
+            for position, record in self.store.scan():
+                times.append((record.timestamp, position))
+                kelvins.append((UNITS.convert_unchecked(record.value, record.source, "k"), position))
+            self.by_time = SortedIndex(times)
+            self.by_kelvin = SortedIndex(kelvins)
+            self.generation = generation
+            self.indexed = len(times)
+            return
+
+        for position, record in self.store.scan(self.indexed):
+            self.by_time.add(record.timestamp, position)
+            self.by_kelvin.add(UNITS.convert_unchecked(record.value, record.source, "k"), position)
+            self.indexed = position + 1
+
+    def query(self, start=None, end=None, low=None, high=None, unit="k"):
+        """Записи со временем в [start, end] и исходным значением в [low, high].
+
+        start и end -- datetime или секунды эпохи, low и high -- значения в
+        единице unit. Границы включаются, пустая граница не ограничивает
+        диапазон.
+        """
+        with self.lock:
+            self._refresh()
+            return self._query(start, end, low, high, unit)
+
+    def _query(self, start, end, low, high, unit):
+        if isinstance(start, datetime):
+            start = start.timestamp()
+        if isinstance(end, datetime):
+            end = end.timestamp()
+        unit = UNITS.resolve(unit)
+        low = None if low is None else UNITS.convert_unchecked(low, unit, "k")
+        high = None if high is None else UNITS.convert_unchecked(high, unit, "k")
+
+        by_time = start is not None or end is not None
+        by_value = low is not None or high is not None
+        if by_time and by_value:
+            positions = set(self.by_time.range(start, end)).intersection(self.by_kelvin.range(low, high))
+        elif by_value:
+            positions = self.by_kelvin.range(low, high)
+        else:
+            positions = self.by_time.range(start, end)
+        return HistoryQueryResult(self.store, sorted(positions, reverse=True))
+
+
+_TIME_RANGE = re.compile(r"(\d{1,2}:\d{2})\s*-\s*(\d{1,2}:\d{2})")
+_DATE = re.compile(r"\d{4}-\d{2}-\d{2}")
+_VALUE = re.compile(r"(>=|<=|>|<)\s*(-?\d+(?:[.,]\d+)?\s*\S*)")
+
+
+def parse_filter(text, today=None):
+    """Разбор строки фильтра окна истории в аргументы HistoryIndex.query.
+
+    Понимает дату "2024-05-01", интервал времени "09:00-11:00" (за
+    указанную дату или за сегодня) и условия на значение вида ">100°C",
+    "<= -10°F" (без единицы -- градусы Цельсия). ">" и "<" строгие: граница
+    сдвигается на соседнее число float, а query включает границы.
+    """
+    criteria = {}
+    day = today or datetime.now().date()
+    date_match = _DATE.search(text)
+    if date_match:
+        day = datetime.strptime(date_match.group(), "%Y-%m-%d").date()
+        criteria["start"] = datetime.combine(day, clock.min)
+        criteria["end"] = datetime.combine(day, clock.max)
+
+    time_match = _TIME_RANGE.search(text)
+    if time_match:
+        begin, finish = (datetime.strptime(part, "%H:%M").time() for part in time_match.groups())
+        criteria["start"] = datetime.combine(day, begin)
+        criteria["end"] = datetime.combine(day, finish.replace(second=59))
+
+    for operator, operand in _VALUE.findall(text):
+        value, unit = parse_temperature(operand, default_unit="c")
+        value = UNITS.convert_unchecked(value, unit, "k")
+        if operator == ">":
+            value = math.nextafter(value, math.inf)
+        elif operator == "<":
+            value = math.nextafter(value, -math.inf)
+        criteria["unit"] = "k"
+        criteria["low" if operator.startswith(">") else "high"] = value
+
+    if not criteria:
+        raise ValueError(f"Не удалось разобрать фильтр: {text}")
+    return criteria
@@ -0,0 +1,295 @@
+"""Хранение истории конвертаций в компактном бинарном формате.
+
+Файл history_<user>.bin -- заголовок и записи фиксированной ширины
+(RECORD, 26 байт): время в секундах эпохи, исходное и полученное значения
+float64 и числовые коды единиц из реестра units. Файл только дописывается,
+а читается через mmap, поэтому открытие истории не зависит от ее длины:
+записи разбираются только при просмотре. Строки вида "23.50°C"
+формируются лишь для отображения (format_record).
+
+Новые записи дописываются фоновым потоком пачками, не чаще раза в
+flush_interval секунд, поэтому конвертация в интерфейсе не ждет диска.
+Старые файлы history_<user>.json (и журнал .journal) переносятся в новый
+формат при первом открытии.
+"""
+import atexit
+import json
+import mmap
+import os
+import struct
+import threading
+import time
+from collections import namedtuple
+from datetime import datetime, timedelta
+
+from temperature_parser import parse_temperature
+from units import UNITS
+
+HEADER = b"TCHIST1\n"
+
+# Время, исходное значение, результат, коды исходной и целевой единиц
+RECORD = struct.Struct("<dddBB")
+
+# Записей в одном блоке при последовательном чтении
+READ_BLOCK = 4096
+
+HistoryRecord = namedtuple("HistoryRecord", "timestamp value result source target")
+
+
+def pack_record(record):
+    return RECORD.pack(record.timestamp, record.value, record.result,
+                       UNITS.units[record.source].index, UNITS.units[record.target].index)
+
+
+def unpack_record(buffer, offset):
+    timestamp, value, result, source, target = RECORD.unpack_from(buffer, offset)
+    return HistoryRecord(timestamp, value, result, UNITS.by_index[source].code, UNITS.by_index[target].code)
+
+
+def format_record(record):
+    """Строка для отображения: (время, ввод, результат)"""
+    source = UNITS.units[record.source]
+    target = UNITS.units[record.target]
+    return (
+        datetime.fromtimestamp(record.timestamp).strftime("%Y-%m-%d %H:%M:%S"),
+        f"{record.value:.2f}{source.symbol}",
+        f"{record.result:.2f}{target.symbol}",
+    )
+
+
+def parse_formatted(text):
+    """Разбор строки вида "23.50°C" в (значение, код единицы)"""
+    return parse_temperature(text)
+
+
+def convert_legacy_entries(entries, last_modified):
+    """Перевод записей старого формата (новые первыми) в HistoryRecord.
+
+    В старом формате время хранится без даты: дата берется от времени
+    изменения файла и уменьшается на день при каждом переходе через полночь.
+    Возвращает записи в хронологическом порядке.
+    """
+    day = datetime.fromtimestamp(last_modified).date()
+    previous = None
+    records = []
+    for entry in entries:
+        try:
+            clock = datetime.strptime(entry[0], "%H:%M:%S").time()
+            value, source = parse_formatted(entry[1])
+            result, target = parse_formatted(entry[2])
+        except (ValueError, IndexError, TypeError):
+            continue
+        if previous is not None and clock > previous:
+            day -= timedelta(days=1)
+        previous = clock
+        timestamp = datetime.combine(day, clock).timestamp()
+        records.append(HistoryRecord(timestamp, value, result, source, target))
+    records.reverse()
+    return records
+
+
+def load_legacy(snapshot_file, journal_file=None):
+    """Записи из history_<user>.json и журнала в хронологическом порядке"""
+    entries = []
+    last_modified = time.time()
+    if os.path.exists(snapshot_file):
+        last_modified = os.path.getmtime(snapshot_file)
+        try:
+            with open(snapshot_file, "r", encoding="utf-8") as f:
+                entries = json.load(f)
+        except (OSError, ValueError):
+            entries = []
+    if journal_file and os.path.exists(journal_file):
+        last_modified = os.path.getmtime(journal_file)
+        journal = []
+        with open(journal_file, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    journal.append(json.loads(line))
+                except ValueError:  # Недописанная строка после сбоя
+                    continue
+        entries = journal[::-1] + entries
+    return convert_legacy_entries(entries, last_modified)
+
+
+def migrate_json(snapshot_file, history_file, journal_file=None):
+    """Перенос старой истории в бинарный файл; возвращает число записей"""
+    records = load_legacy(snapshot_file, journal_file)
+    temp_file = history_file + ".tmp"
+    with open(temp_file, "wb") as f:
+        f.write(HEADER)
+        f.write(b"".join(pack_record(record) for record in records))
+    os.replace(temp_file, history_file)
+    return len(records)
+
+
+class HistoryStore:
+    """История конвертаций одного пользователя"""
+
+    def __init__(self, username, directory=".", flush_interval=0.5):
+        self.history_file = os.path.join(directory, f"history_{username}.bin")
+        self.flush_interval = flush_interval
+
+        # Записи, еще не попавшие на диск, в хронологическом порядке
+        self.pending = []
+        self.disk_count = 0
+        # Увеличивается при очистке: индексы истории по нему понимают, что устарели
+        self.generation = 0
+        self.map = None
+        # lock защищает состояние в памяти, io_lock упорядочивает работу с файлом
+        self.lock = threading.Lock()
+        self.io_lock = threading.Lock()
+        self.wakeup = threading.Condition(self.lock)
+        self.closed = False
+
+        self.load(directory, username)
+        self.writer = threading.Thread(target=self._write_loop, name="history-writer", daemon=True)
+        self.writer.start()
+        # Гарантированная запись при выходе из процесса
+        atexit.register(self.close)
+
+    def __iter__(self):
+        """Все записи от новых к старым, блоками по READ_BLOCK"""
+        for offset in range(0, len(self), READ_BLOCK):
+            yield from self.page(offset, READ_BLOCK)
+
+    def __len__(self):
+        return self.disk_count + len(self.pending)
+
+    def load(self, directory, username):
+        """Открытие файла истории; старый JSON переносится при первом запуске"""
+        if not os.path.exists(self.history_file):
+            migrate_json(os.path.join(directory, f"history_{username}.json"), self.history_file,
+                         os.path.join(directory, f"history_{username}.journal"))
+        with open(self.history_file, "rb") as f:
+            if f.read(len(HEADER)) != HEADER:
+                raise ValueError(f"Неизвестный формат файла истории: {self.history_file}")
+        size = os.path.getsize(self.history_file)
+        # Недописанная после сбоя запись отбрасывается
+        self.disk_count = (size - len(HEADER)) // RECORD.size
+        if (size - len(HEADER)) % RECORD.size:
+            with open(self.history_file, "r+b") as f:
+                f.truncate(len(HEADER) + self.disk_count * RECORD.size)
+
+    def add(self, source, target, value, result, timestamp=None):
+        """Добавление записи: O(1) в памяти, запись на диск откладывается"""
+        record = HistoryRecord(time.time() if timestamp is None else timestamp,
+                               float(value), float(result), source, target)
+        with self.lock:
+            self.pending.append(record)
+            self.wakeup.notify()
+        return record
+
+    def page(self, offset, count):
+        """Записи [offset, offset + count) от новых к старым за O(count)"""
+        with self.lock:
+            total = self.disk_count + len(self.pending)
+            end = max(total - offset, 0)
+            start = max(end - count, 0)
+            records = self.pending[max(start - self.disk_count, 0):max(end - self.disk_count, 0)]
+            if start < self.disk_count:
+                buffer = self._mapping()
+                disk = [unpack_record(buffer, len(HEADER) + index * RECORD.size)
+                        for index in range(start, min(end, self.disk_count))]
+                records = disk + records
+        return records[::-1]
+
+    def get(self, position):
+        """Запись по номеру в хронологическом порядке"""
+        with self.lock:
+            return self._get(position)
+
+    def scan(self, start=0, stop=None):
+        """Записи [start, stop) в хронологическом порядке: (номер, запись)"""
+        position = start
+        while True:
+            with self.lock:
+                end = len(self) if stop is None else min(stop, len(self))
+                end = min(position + READ_BLOCK, end)
+                if position >= end:
+                    return
+                block = [self._get(index) for index in range(position, end)]
+            for record in block:
+                yield position, record
+                position += 1
+
+    def _get(self, position):
+        if position >= self.disk_count:
+            return self.pending[position - self.disk_count]
+        return unpack_record(self._mapping(), len(HEADER) + position * RECORD.size)
+
+    def clear(self):
+        """Очистка истории"""
+        with self.io_lock:
+            with self.lock:
+                self.pending = []
+                self._unmap()
+                temp_file = self.history_file + ".tmp"
+                with open(temp_file, "wb") as f:
+                    f.write(HEADER)
+                os.replace(temp_file, self.history_file)
+                self.disk_count = 0
+                self.generation += 1
+
+    def flush(self):
+        """Немедленная запись накопленных записей на диск"""
+        with self.io_lock:
+            self._flush()
+
+    def close(self):
+        """Запись всего накопленного и остановка фонового потока"""
+        with self.lock:
+            if self.closed:
+                return
+            self.closed = True
+            self.wakeup.notify()
+        atexit.unregister(self.close)
+        self.writer.join()
+        with self.io_lock:
+            self._flush()
+            with self.lock:
+                self._unmap()
+
+    def _mapping(self):
+        """mmap файла, заново отображаемый после дописывания записей"""
+        needed = len(HEADER) + self.disk_count * RECORD.size
+        if self.map is None or len(self.map) < needed:
+            self._unmap()
+            with open(self.history_file, "rb") as f:
+                self.map = mmap.mmap(f.fileno(), needed, access=mmap.ACCESS_READ)
+        return self.map
+
+    def _unmap(self):
+        if self.map is not None:
+            self.map.close()
+            self.map = None
+
+    def _write_loop(self):
+        while True:
+            with self.lock:
+                while not self.pending and not self.closed:
+                    self.wakeup.wait()
+                # Записи, пришедшие за интервал, уходят на диск одной записью
+                deadline = time.monotonic() + self.flush_interval
+                while not self.closed:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self.wakeup.wait(remaining)
+                if self.closed:
+                    return
+
+            with self.io_lock:
+                self._flush()
+
+    def _flush(self):
+        with self.lock:
+            batch = list(self.pending)
+        if not batch:
+            return
+        with open(self.history_file, "ab") as f:
+            f.write(b"".join(pack_record(record) for record in batch))
+        # Записи остаются видимыми в pending, пока не окажутся на диске
+        with self.lock:
+            del self.pending[:len(batch)]
+            self.disk_count += len(batch)
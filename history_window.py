@@ -0,0 +1,164 @@
+import tkinter as tk
+from tkinter import ttk, messagebox
+
+from history_index import parse_filter
+from history_store import format_record
+
+# Сколько строк истории подгружается за раз
+PAGE_SIZE = 200
+
+# Следующая страница подгружается, когда прокрутка доходит до этой доли списка
+PRELOAD_THRESHOLD = 0.9
+
+
+class HistoryWindow:
+    """Окно истории с постраничной подгрузкой строк при прокрутке.
+
+    В Treeview вставляются только просмотренные страницы, поэтому время
+    открытия окна не зависит от длины истории. Перцентили считаются в
+    фоне через executor (TaskExecutor), пока вместо них виден заполнитель.
+    """
+
+    def __init__(self, root, history, on_clear, on_export, index=None, stats=None, executor=None):
+        self.history = history
+        self.index = index
+        self.stats = stats
+        self.executor = executor
+        # Источник строк: вся история или результат поиска
+        self.source = history
+        self.loaded = 0
+        self.exhausted = False
+
+        # Создаем новое окно
+        self.window = tk.Toplevel(root)
+        self.window.title("История конвертации")
+        self.window.geometry("500x300+200+200")
+
+        # Поиск по индексу истории
+        if index is not None:
+            search_frame = ttk.Frame(self.window)
+            search_frame.pack(fill=tk.X, padx=5, pady=5)
+
+            self.search_var = tk.StringVar()
+            search_entry = ttk.Entry(search_frame, textvariable=self.search_var)
+            search_entry.pack(side=tk.LEFT, fill=tk.X, expand=True)
+            search_entry.bind("<Return>", lambda e: self.apply_filter())
+
+            ttk.Button(search_frame, text="Найти", command=self.apply_filter).pack(side=tk.LEFT, padx=5)
+            ttk.Button(search_frame, text="Сброс", command=self.reset_filter).pack(side=tk.LEFT)
+
+        self.tree = ttk.Treeview(
+            self.window,
+            columns=("time", "input", "result"),
+            show="headings",
+            height=10
+        )
+
+        # Настройка колонок
+        self.tree.heading("time", text="Время")
+        self.tree.heading("input", text="Ввод")
+        self.tree.heading("result", text="Результат")
+
+        self.tree.column("time", width=140)
+        self.tree.column("input", width=150)
+        self.tree.column("result", width=150)
+
+        # Скроллбар: прокрутка к концу списка подгружает следующую страницу
+        self.scrollbar = ttk.Scrollbar(self.window, orient=tk.VERTICAL, command=self.tree.yview)
+        self.tree.configure(yscroll=self.on_scroll)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.tree.pack(fill=tk.BOTH, expand=True)
+
+        # Первая страница данных
+        self.load_next_page()
+
+        # Перцентили по скетчу: память не зависит от длины истории
+        if stats is not None:
+            self.stats_label = ttk.Label(self.window, text="Перцентили считаются...")
+            self.stats_label.pack(anchor=tk.W, padx=5)
+            if executor is None:
+                self.show_stats(stats.summary())
+            else:
+                # Первый подсчет проходит всю историю: не в главном потоке
+                executor.submit(stats.summary, on_success=self.show_stats,
+                                on_error=lambda error: self.show_stats(f"Перцентили недоступны: {error}"))
+
+        # Кнопки управления историей
+        btn_frame = ttk.Frame(self.window)
+        btn_frame.pack(pady=10)
+
+        ttk.Button(
+            btn_frame, text="Очистить историю",
+            command=lambda: [on_clear(), self.window.destroy()]
+        ).pack(side=tk.LEFT, padx=10)
+
+        ttk.Button(
+            btn_frame, text="Экспорт в CSV",
+            command=on_export
+        ).pack(side=tk.LEFT, padx=10)
+
+        ttk.Button(
+            btn_frame, text="Закрыть",
+            command=self.window.destroy
+        ).pack(side=tk.RIGHT, padx=10)
+
+        # Запрещение создания нескольких окон
+        self.window.focus_set()
+        self.window.grab_set()
+
+    def show_stats(self, text):
+        # Окно могли закрыть, пока шел подсчет
+        if self.window.winfo_exists():
+            self.stats_label.config(text=text)
+
+    def on_scroll(self, first, last):
+        """Обновление скроллбара и подгрузка строк у конца списка"""
+        self.scrollbar.set(first, last)
+        if float(last) >= PRELOAD_THRESHOLD:
+            self.load_next_page()
+
+    def apply_filter(self):
+        """Поиск: "2024-05-01 09:00-11:00", ">100°C", "<=32°F" и их сочетания"""
+        text = self.search_var.get().strip()
+        if not text:
+            self.reset_filter()
+            return
+        try:
+            criteria = parse_filter(text)
+        except ValueError as e:
+            messagebox.showerror("Ошибка", str(e), parent=self.window)
+            return
+        if self.executor is None:
+            self.show(self.index.query(**criteria))
+            return
+        # Первый запрос строит индекс по всей истории: не в главном потоке
+        self.executor.submit(self.index.query, **criteria, on_success=self.show_result,
+                             on_error=lambda error: messagebox.showerror(
+                                 "Ошибка", f"Поиск не удался: {error}", parent=self.window))
+
+    def show_result(self, result):
+        # Окно могли закрыть, пока шел поиск
+        if self.window.winfo_exists():
+            self.show(result)
+
+    def reset_filter(self):
+        self.search_var.set("")
+        self.show(self.history)
+
+    def show(self, source):
+        """Замена содержимого таблицы на первую страницу нового источника"""
+        self.tree.delete(*self.tree.get_children())
+        self.source = source
+        self.loaded = 0
+        self.exhausted = False
+        self.load_next_page()
+
+    def load_next_page(self):
+        """Вставка следующей страницы истории в таблицу"""
+        if self.exhausted:
+            return
+        rows = self.source.page(self.loaded, PAGE_SIZE)
+        for row in rows:
+            self.tree.insert("", tk.END, values=format_record(row))
+        self.loaded += len(rows)
+        self.exhausted = len(rows) < PAGE_SIZE
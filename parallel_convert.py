@@ -0,0 +1,198 @@
+"""Параллельная конвертация больших массивов и файлов на нескольких ядрах.
+
+Данные не сериализуются между процессами: массивы размещаются в
+multiprocessing.shared_memory, а файлы каждый рабочий процесс отображает
+в память сам. Рабочим передаются только имена буферов и диапазоны
+индексов. Каждый диапазон пишется в свою область результата, поэтому
+порядок вывода детерминирован и не зависит от планирования процессов.
+
+Буферы хранят значения в том же формате, что и бинарные файлы
+binary_convert (little-endian), и обрабатываются тем же кодом.
+"""
+import mmap
+import os
+import sys
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+from binary_convert import DTYPES, INVALID_POLICIES, BinaryReport, _convert_mapped
+from units import ABSOLUTE_ZERO_ERROR, UNITS, load_numpy
+
+DEFAULT_CHUNK_SIZE = 1 << 18
+
+PARALLEL_POLICIES = ("raise",) + INVALID_POLICIES
+
+# Буферы, подключенные в рабочем процессе: ("shm", имя) или ("file", путь)
+_buffers = {}
+
+
+def _attach(names):
+    """Инициализатор рабочего процесса: подключение блоков разделяемой памяти"""
+    for name in names:
+        _buffers[("shm", name)] = shared_memory.SharedMemory(name=name)
+
+
+def _buffer(key, writable):
+    """Буфер по ключу; файлы отображаются в память один раз на процесс"""
+    if key not in _buffers:
+        with open(key[1], "r+b" if writable else "rb") as f:
+            _buffers[key] = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_WRITE if writable else mmap.ACCESS_READ)
+    buffer = _buffers[key]
+    return buffer.buf if key[0] == "shm" else memoryview(buffer)
+
+
+def _check_task(task):
+    """Номер первого элемента диапазона ниже абсолютного нуля или None.
+
+    Только чтение: проверка файла перед записью для политики "raise".
+    """
+    source, start, stop, conversion, dtype, chunk_size = task
+    code, itemsize = DTYPES[dtype]
+    transform = UNITS.transform(*conversion)
+    lower, upper = transform.lower, transform.upper
+    np = load_numpy()
+    with _buffer(source, writable=False)[start * itemsize:stop * itemsize] as src:
+        for first in range(0, stop - start, chunk_size):
+            raw = src[first * itemsize:(first + chunk_size) * itemsize]
+            if np is not None:
+                chunk = np.frombuffer(raw, dtype="<" + dtype)
+                invalid = np.flatnonzero((chunk < lower) | (chunk > upper))
+                if invalid.size:
+                    return start + first + int(invalid[0])
+                continue
+            chunk = array(code)
+            chunk.frombytes(raw)
+            if sys.byteorder != "little":
+                chunk.byteswap()
+            if any(map(lower.__gt__, chunk)) or any(map(upper.__lt__, chunk)):
+                return start + first + next(i for i, value in enumerate(chunk) if value < lower or value > upper)
+    return None
+
+
+def _convert_task(task):
+    """Конвертация диапазона [start, stop) в рабочем процессе"""
+    source, target, start, stop, conversion, dtype, chunk_size, on_invalid, max_offsets = task
+    itemsize = DTYPES[dtype][1]
+    src = _buffer(source, writable=target == source)
+    dst = src if target == source else _buffer(target, writable=True)
+    report = BinaryReport(itemsize, max_offsets)
+    with src[start * itemsize:stop * itemsize] as src_range, \
+            dst[start * itemsize:stop * itemsize] as dst_range:
+        _convert_mapped(src_range, dst_range, UNITS.transform(*conversion), dtype,
+                        chunk_size, on_invalid, report, first=start)
+    return report.invalid, report.offsets
+
+
+def _check(source, count, conversion, dtype, workers, chunk_size):
+    """Параллельная проверка файла до записи; ValueError по первой ошибке"""
+    tasks = [(source, start, min(start + chunk_size, count), conversion, dtype, chunk_size)
+             for start in range(0, count, chunk_size)]
+    if not tasks:
+        return
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for index in pool.map(_check_task, tasks):
+            if index is not None:
+                raise ValueError(f"{ABSOLUTE_ZERO_ERROR} (элемент {index})")
+
+
+def _run(source, target, count, conversion, dtype, workers, chunk_size, on_invalid,
+         max_offsets, shared_names=()):
+    """Запуск задач по диапазонам; результаты собираются в порядке диапазонов"""
+    if on_invalid not in PARALLEL_POLICIES:
+        raise ValueError(f"Неизвестная политика: {on_invalid}")
+    # Для "raise" рабочие ничего не меняют, а исключение поднимается
+    # по первому (в порядке индексов) диапазону с ошибкой
+    policy = "keep" if on_invalid == "raise" else on_invalid
+    tasks = [(source, target, start, min(start + chunk_size, count), conversion, dtype,
+              chunk_size, policy, max(max_offsets, 1))
+             for start in range(0, count, chunk_size)]
+
+    report = BinaryReport(DTYPES[dtype][1], max_offsets)
+    report.count = count
+    if not tasks:
+        return report
+    with ProcessPoolExecutor(max_workers=workers, initializer=_attach, initargs=(shared_names,)) as pool:
+        for invalid, offsets in pool.map(_convert_task, tasks):
+            if invalid and on_invalid == "raise":
+                raise ValueError(f"{ABSOLUTE_ZERO_ERROR} (элемент {offsets[0] // report.itemsize})")
+            report.invalid += invalid
+            report.offsets.extend(offsets[:max_offsets - len(report.offsets)])
+    return report
+
+
+def parallel_convert(values, from_unit, to_unit, workers=None, chunk_size=DEFAULT_CHUNK_SIZE,
+                     on_invalid="raise"):
+    """Параллельная конвертация массива значений.
+
+    workers -- число процессов (по умолчанию число ядер), chunk_size --
+    элементов в одной задаче. on_invalid: "raise", "nan", "clip" или
+    "keep" (как в binary_convert). С NumPy возвращает ndarray,
+    без него -- array.array("d").
+    """
+    conversion = (UNITS.resolve(from_unit), UNITS.resolve(to_unit))
+    np = load_numpy()
+    if np is not None:
+        values = np.asarray(values, dtype="<f8")
+        count = len(values)
+    else:
+        values = array("d", values)
+        count = len(values)
+        if sys.byteorder != "little":
+            values.byteswap()
+
+    size = max(count * 8, 1)
+    source = shared_memory.SharedMemory(create=True, size=size)
+    target = shared_memory.SharedMemory(create=True, size=size)
+    try:
+        if np is not None:
+            np.ndarray(count, dtype="<f8", buffer=source.buf)[:] = values
+        else:
+            source.buf[:count * 8] = values.tobytes()
+
+        _run(("shm", source.name), ("shm", target.name), count, conversion, "f8", workers,
+             chunk_size, on_invalid, 1, shared_names=(source.name, target.name))
+
+        if np is not None:
+            return np.ndarray(count, dtype="<f8", buffer=target.buf).astype(np.float64)
+        result = array("d")
+        result.frombytes(target.buf[:count * 8])
+        if sys.byteorder != "little":
+            result.byteswap()
+        return result
+    finally:
+        for block in (source, target):
+            block.close()
+            block.unlink()
+
+
+def parallel_convert_file(input_path, output_path=None, from_unit="c", to_unit="k", dtype="f4",
+                          workers=None, chunk_size=DEFAULT_CHUNK_SIZE, in_place=False,
+                          on_invalid="nan", max_offsets=1000):
+    """Параллельная версия binary_convert.convert_file; возвращает BinaryReport.
+
+    Дополнительно понимает on_invalid="raise": файл сначала проверяется
+    только на чтение, и при ошибке ни вход, ни выход не изменяются.
+    """
+    if dtype not in DTYPES:
+        raise ValueError(f"Неизвестный тип данных: {dtype}")
+    if not in_place and output_path is None:
+        raise ValueError("Укажите выходной файл или in_place=True")
+    # Открытие выхода на запись обнулило бы входной файл до чтения
+    if not in_place and os.path.exists(output_path) and os.path.samefile(input_path, output_path):
+        raise ValueError("Выходной файл совпадает с входным: используйте in_place=True")
+    itemsize = DTYPES[dtype][1]
+    size = os.path.getsize(input_path)
+    if size % itemsize:
+        raise ValueError(f"Размер файла {size} не кратен размеру элемента {itemsize}")
+
+    conversion = (UNITS.resolve(from_unit), UNITS.resolve(to_unit))
+    source = ("file", os.path.abspath(input_path))
+    if on_invalid == "raise":
+        _check(source, size // itemsize, conversion, dtype, workers, chunk_size)
+    if not in_place:
+        with open(output_path, "wb") as f:
+            f.truncate(size)
+    target = source if in_place else ("file", os.path.abspath(output_path))
+    return _run(source, target, size // itemsize, conversion, dtype, workers, chunk_size,
+                on_invalid, max_offsets)
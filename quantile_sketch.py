@@ -0,0 +1,277 @@
+"""Потоковые квантили конвертированных температур с ограниченной памятью.
+
+QuantileSketch -- скетч KLL (Karnin, Lang, Liberty, 2016). Значения
+копятся в уровнях-компакторах: переполненный уровень сортируется, и
+каждое второе значение (со случайным сдвигом) переходит на следующий
+уровень с удвоенным весом. Емкость уровней убывает геометрически
+(множитель 2/3) вниз от верхнего, поэтому скетч хранит O(k) значений
+независимо от длины потока.
+
+Погрешность -- по рангу, а не по значению: для k = 200 ранг ответа
+quantile(q) отличается от q * count не более чем на ~1.7% от count с
+вероятностью 99% (при k = 100 -- ~3.3%; погрешность ~ 1/k). Минимум,
+максимум и число значений точны.
+
+Скетчи объединяются (merge) с той же гарантией -- например, скетчи,
+построенные в рабочих процессах, -- и сериализуются в компактные байты
+(to_bytes / from_bytes).
+"""
+import math
+import random
+import struct
+import sys
+import threading
+from array import array
+
+from units import UNITS
+
+MAGIC = b"KLL1"
+
+# k, число значений, минимум, максимум, число уровней
+_HEADER = struct.Struct("<4sIQddI")
+
+# Множитель емкости соседних уровней
+CAPACITY_RATIO = 2 / 3
+
+# Сколько записей истории добавляется в скетч за раз
+BLOCK_SIZE = 4096
+
+
+class QuantileSketch:
+    """Скетч KLL с точностью по рангу ~1/k"""
+
+    def __init__(self, k=200, seed=None):
+        if k < 8:
+            raise ValueError("Параметр k должен быть не меньше 8")
+        self.k = k
+        self.count = 0
+        self.min = math.inf
+        self.max = -math.inf
+        self.levels = [[]]
+        self.random = random.Random(seed)
+        self._update_limits()
+
+    def __len__(self):
+        return self.count
+
+    def capacity(self, level):
+        depth = len(self.levels) - level - 1
+        return max(int(math.ceil(self.k * CAPACITY_RATIO ** depth)), 2)
+
+    def _update_limits(self):
+        self.limit = sum(self.capacity(level) for level in range(len(self.levels)))
+        self.retained = sum(len(items) for items in self.levels)
+
+    def update(self, value):
+        """Добавление одного значения (NaN пропускается)"""
+        value = float(value)
+        if value != value:
+            return
+        self.levels[0].append(value)
+        self.count += 1
+        self.retained += 1
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+        if self.retained >= self.limit:
+            self._compress()
+
+    def update_batch(self, values):
+        """Добавление массива значений (список, array или ndarray)"""
+        if hasattr(values, "tolist"):
+            values = values.tolist()
+        values = [value for value in map(float, values) if value == value]
+        if not values:
+            return
+        self.levels[0].extend(values)
+        self.count += len(values)
+        self.retained += len(values)
+        self.min = min(self.min, min(values))
+        self.max = max(self.max, max(values))
+        while self.retained >= self.limit:
+            self._compress()
+
+    def _compress(self):
+        for level in range(len(self.levels)):
+            items = self.levels[level]
+            if len(items) < self.capacity(level):
+                continue
+            if level + 1 == len(self.levels):
+                self.levels.append([])
+            # Половина отсортированного уровня уходит наверх с двойным весом
+            items.sort()
+            # При нечетной длине наименьшее значение остается на уровне
+            odd = len(items) % 2
+            self.levels[level + 1].extend(items[odd + self.random.getrandbits(1)::2])
+            self.levels[level] = items[:odd]
+            self._update_limits()
+            if self.retained < self.limit:
+                return
+
+    def merge(self, other):
+        """Добавление значений другого скетча с тем же k"""
+        if other.k != self.k:
+            raise ValueError(f"Нельзя объединить скетчи с k={self.k} и k={other.k}")
+        while len(self.levels) < len(other.levels):
+            self.levels.append([])
+        for level, items in enumerate(other.levels):
+            self.levels[level].extend(items)
+        self.count += other.count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self._update_limits()
+        while self.retained >= self.limit:
+            self._compress()
+        return self
+
+    def _weighted(self):
+        """Сохраненные значения с весами по возрастанию"""
+        pairs = [(value, 1 << level) for level, items in enumerate(self.levels) for value in items]
+        pairs.sort()
+        return pairs
+
+    def quantile(self, q):
+        """Значение с рангом ~ q * count (0 <= q <= 1)"""
+        return self.quantiles([q])[0]
+
+    def quantiles(self, qs):
+        """Несколько квантилей за одну сортировку"""
+        if not self.count:
+            raise ValueError("Скетч пуст")
+        for q in qs:
+            if not 0 <= q <= 1:
+                raise ValueError(f"Квантиль вне [0, 1]: {q}")
+        pairs = self._weighted()
+        total = sum(weight for _, weight in pairs)
+        result = []
+        for q in qs:
+            if q == 0:
+                result.append(self.min)
+                continue
+            if q == 1:
+                result.append(self.max)
+                continue
+            target = q * total
+            seen = 0
+            for value, weight in pairs:
+                seen += weight
+                if seen >= target:
+                    break
+            result.append(min(max(value, self.min), self.max))
+        return result
+
+    def rank(self, value):
+        """Доля значений, не превосходящих value"""
+        if not self.count:
+            raise ValueError("Скетч пуст")
+        pairs = self._weighted()
+        total = sum(weight for _, weight in pairs)
+        return sum(weight for item, weight in pairs if item <= value) / total
+
+    def to_bytes(self):
+        """Сериализация: заголовок и значения уровней в float64 little-endian"""
+        parts = [_HEADER.pack(MAGIC, self.k, self.count, self.min, self.max, len(self.levels))]
+        for items in self.levels:
+            values = array("d", items)
+            if sys.byteorder != "little":
+                values.byteswap()
+            parts.append(struct.pack("<I", len(values)))
+            parts.append(values.tobytes())
+        return b"".join(parts)
+
+    @classmethod
+    def from_bytes(cls, data, seed=None):
+        magic, k, count, low, high, level_count = _HEADER.unpack_from(data)
+        if magic != MAGIC:
+            raise ValueError("Неизвестный формат скетча")
+        sketch = cls(k, seed)
+        sketch.count, sketch.min, sketch.max = count, low, high
+        offset = _HEADER.size
+        sketch.levels = []
+        for _ in range(level_count):
+            (size,) = struct.unpack_from("<I", data, offset)
+            offset += 4
+            values = array("d")
+            values.frombytes(data[offset:offset + size * 8])
+            if sys.byteorder != "little":
+                values.byteswap()
+            offset += size * 8
+            sketch.levels.append(values.tolist())
+        sketch._update_limits()
+        return sketch
+
+
+def convert_into(sketch, values, from_unit, to_unit, on_invalid="raise"):
+    """Пакетная конвертация с добавлением результатов в скетч.
+
+    Возвращает результат AffineTransform.convert_batch; значения ниже
+    абсолютного нуля в скетч не попадают.
+    """
+    transform = UNITS.transform(UNITS.resolve(from_unit), UNITS.resolve(to_unit))
+    converted = transform.convert_batch(values, on_invalid)
+    if on_invalid == "mask":
+        results, valid = converted
+        if hasattr(valid, "all"):
+            sketch.update_batch(results[valid])
+        else:
+            sketch.update_batch([result for result, ok in zip(results, valid) if ok])
+    else:
+        # NaN (политика "nan") скетч пропускает сам
+        sketch.update_batch(converted)
+    return converted
+
+
+class HistoryStats:
+    """Перцентили исходных температур истории в °C.
+
+    Как и HistoryIndex, досчитывает только новые записи и строит скетч
+    заново после очистки истории. Первый подсчет проходит всю историю,
+    поэтому окно вызывает его в фоновом потоке; lock не дает двум
+    подсчетам идти одновременно.
+    """
+
+    PERCENTILES = (0.5, 0.95, 0.99)
+
+    def __init__(self, store, k=200, block_size=BLOCK_SIZE):
+        self.store = store
+        self.k = k
+        self.block_size = block_size
+        self.generation = None
+        self.counted = 0
+        self.sketch = QuantileSketch(k)
+        self.lock = threading.Lock()
+
+    def refresh(self):
+        with self.lock:
+            self._refresh()
+
+    def _refresh(self):
+        if self.generation != self.store.generation or self.counted > len(self.store):
+            self.sketch = QuantileSketch(self.k)
+            self.generation = self.store.generation
+            self.counted = 0
+        block = []
+        for position, record in self.store.scan(self.counted):
+            block.append(UNITS.convert_unchecked(record.value, record.source, "c"))
+            self.counted = position + 1
+            if len(block) >= self.block_size:
+                self.sketch.update_batch(block)
+                block = []
+        self.sketch.update_batch(block)
+
+    def percentiles(self):
+        """{доля: значение °C} или пустой словарь для пустой истории"""
+        with self.lock:
+            self._refresh()
+            if not self.sketch.count:
+                return {}
+            return dict(zip(self.PERCENTILES, self.sketch.quantiles(self.PERCENTILES)))
+
+    def summary(self):
+        """Строка для окна истории"""
+        values = self.percentiles()
+        if not values:
+            return "История пуста"
+        parts = ", ".join(f"p{round(q * 100)} {value:.2f}°C" for q, value in values.items())
+        return f"Ввод: {parts} (записей: {self.sketch.count})"
@@ -0,0 +1,266 @@
+"""Прием показаний датчиков по UDP и TCP.
+
+Датчики присылают строки "датчик,значение,единица[,время]" -- по одной
+или несколько в датаграмме UDP либо построчно в TCP-соединении. Приемники
+только кладут строки в ограниченную очередь; разбор, пакетная конвертация
+в каноническую единицу и запись выполняются одной задачей пачками до
+batch_size строк.
+
+Очередь ограничена queue_size строками, поэтому всплеск от тысяч датчиков
+не раздувает память: датаграммы сверх лимита отбрасываются (счетчик
+dropped), а TCP-соединения перестают читаться, пока очередь не
+освободится (счетчик backpressure).
+
+С таблицей калибровок (calibration.CalibrationTable) поправки датчиков
+применяются в том же проходе конвертации, а файл калибровок
+перечитывается при изменении.
+
+Запуск: python sensor_ingest.py --udp-port 9999 --tcp-port 9999 -o readings.csv
+"""
+import argparse
+import asyncio
+import time
+
+from calibration import CalibrationTable
+from units import UNITS
+
+
+class IngestStats:
+    """Счетчики приема"""
+
+    def __init__(self):
+        self.received = 0
+        self.dropped = 0
+        self.backpressure = 0
+        self.malformed = 0
+        self.invalid = 0
+        self.written = 0
+        self.batches = 0
+
+    def as_dict(self):
+        return dict(vars(self))
+
+
+def parse_reading(line, received_at):
+    """Разбор строки показания в (время, датчик, значение, код единицы).
+
+    Без явного времени берется время приема. ValueError -- строка
+    некорректна.
+    """
+    parts = line.split(",")
+    if len(parts) not in (3, 4):
+        raise ValueError(f"Ожидается 'датчик,значение,единица[,время]': {line!r}")
+    sensor = parts[0].strip()
+    if not sensor:
+        raise ValueError(f"Пустой идентификатор датчика: {line!r}")
+    timestamp = float(parts[3]) if len(parts) == 4 else received_at
+    return timestamp, sensor, float(parts[1]), UNITS.resolve(parts[2].strip())
+
+
+class CsvSink:
+    """Запись показаний в CSV-файл "время,датчик,значение" """
+
+    def __init__(self, path):
+        self.file = open(path, "a", encoding="utf-8")
+
+    def write(self, rows):
+        # Одна запись в файл на пачку
+        self.file.write("".join(f"{timestamp!r},{sensor},{value!r}\n" for timestamp, sensor, value in rows))
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+
+class _DatagramReceiver(asyncio.DatagramProtocol):
+    def __init__(self, ingest):
+        self.ingest = ingest
+
+    def datagram_received(self, data, addr):
+        self.ingest.offer(data)
+
+
+class SensorIngest:
+    """Прием, пакетная конвертация и запись показаний"""
+
+    def __init__(self, sink, unit="k", queue_size=10000, batch_size=1000, flush_interval=0.1,
+                 calibration=None):
+        self.sink = sink
+        self.calibration = calibration
+        self.unit = UNITS.resolve(unit)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.queue = asyncio.Queue(maxsize=queue_size)
+        self.stats = IngestStats()
+        self.servers = []
+        self.transports = []
+        self.connections = set()
+        self.writer = None
+
+    async def start(self, host="127.0.0.1", udp_port=None, tcp_port=None):
+        """Запуск приемников; порт 0 -- любой свободный"""
+        loop = asyncio.get_running_loop()
+        self.writer = asyncio.create_task(self._write_loop())
+        if udp_port is not None:
+            transport, _ = await loop.create_datagram_endpoint(
+                lambda: _DatagramReceiver(self), local_addr=(host, udp_port))
+            self.transports.append(transport)
+        if tcp_port is not None:
+            self.servers.append(await asyncio.start_server(self._handle_stream, host, tcp_port))
+
+    def addresses(self):
+        """Адреса приемников: {"udp": (host, port), "tcp": (host, port)}"""
+        result = {}
+        for transport in self.transports:
+            result["udp"] = transport.get_extra_info("sockname")[:2]
+        for server in self.servers:
+            result["tcp"] = server.sockets[0].getsockname()[:2]
+        return result
+
+    async def stop(self):
+        """Остановка приема и запись всего, что уже в очереди"""
+        for transport in self.transports:
+            transport.close()
+        for server in self.servers:
+            server.close()
+            await server.wait_closed()
+        # Соединения, ждущие места в очереди, закрываются без ожидания
+        for connection in list(self.connections):
+            connection.cancel()
+        await asyncio.gather(*self.connections, return_exceptions=True)
+        if self.writer is not None:
+            await self.queue.put(None)
+            await self.writer
+            self.writer = None
+
+    def offer(self, data):
+        """Строки датаграммы в очередь; не поместившиеся отбрасываются"""
+        received_at = time.time()
+        for line in data.splitlines():
+            self.stats.received += 1
+            try:
+                self.queue.put_nowait((received_at, line))
+            except asyncio.QueueFull:
+                self.stats.dropped += 1
+
+    async def _handle_stream(self, reader, writer):
+        task = asyncio.current_task()
+        self.connections.add(task)
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                if self.queue.full():
+                    # Соединение не читается, пока очередь не освободится
+                    self.stats.backpressure += 1
+                await self.queue.put((time.time(), line))
+                self.stats.received += 1
+        except (ConnectionError, ValueError):  # ValueError -- слишком длинная строка
+            pass
+        except asyncio.CancelledError:  # Остановка приема
+            pass
+        finally:
+            self.connections.discard(task)
+            writer.close()
+
+    async def _write_loop(self):
+        while True:
+            item = await self.queue.get()
+            if item is None:
+                return
+            batch = [item]
+            stopping = False
+            waited = False
+            while len(batch) < self.batch_size:
+                try:
+                    item = self.queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    if waited:
+                        break
+                    # Очередь пуста: даем пачке дособраться до flush_interval
+                    waited = True
+                    await asyncio.sleep(self.flush_interval)
+                    continue
+                if item is None:
+                    stopping = True
+                    break
+                batch.append(item)
+
+            rows = self.convert(batch)
+            if rows:
+                # Запись на диск не останавливает прием
+                await asyncio.to_thread(self.sink.write, rows)
+                self.stats.written += len(rows)
+                self.stats.batches += 1
+            if stopping:
+                return
+
+    def convert(self, batch):
+        """Разбор пачки строк и конвертация по единицам одним вызовом на единицу"""
+        groups = {}
+        for received_at, line in batch:
+            try:
+                timestamp, sensor, value, unit = parse_reading(line.decode("utf-8"), received_at)
+            except (ValueError, UnicodeDecodeError):
+                self.stats.malformed += 1
+                continue
+            group = groups.setdefault(unit, ([], [], []))
+            group[0].append(timestamp)
+            group[1].append(sensor)
+            group[2].append(value)
+
+        if self.calibration is not None:
+            self.calibration.maybe_reload()
+        rows = []
+        for unit, (timestamps, sensors, values) in groups.items():
+            if self.calibration is not None:
+                results, valid = self.calibration.convert_batch(sensors, values, unit, self.unit, on_invalid="mask")
+            else:
+                results, valid = UNITS.transform(unit, self.unit).convert_batch(values, on_invalid="mask")
+            for timestamp, sensor, result, ok in zip(timestamps, sensors, results, valid):
+                if ok:
+                    rows.append((timestamp, sensor, float(result)))
+                else:
+                    self.stats.invalid += 1
+        return rows
+
+
+async def serve(args):
+    sink = CsvSink(args.output)
+    calibration = CalibrationTable(args.calibration) if args.calibration else None
+    ingest = SensorIngest(sink, unit=args.unit, queue_size=args.queue_size, batch_size=args.batch_size,
+                          calibration=calibration)
+    await ingest.start(args.host, args.udp_port, args.tcp_port)
+    print(f"Прием показаний: {ingest.addresses()}, запись в {args.output}")
+    try:
+        while True:
+            await asyncio.sleep(args.report_interval)
+            print(ingest.stats.as_dict())
+    finally:
+        await ingest.stop()
+        sink.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Прием показаний датчиков температуры")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--udp-port", type=int, help="порт UDP")
+    parser.add_argument("--tcp-port", type=int, help="порт TCP")
+    parser.add_argument("-o", "--output", default="readings.csv", help="CSV-файл для показаний")
+    parser.add_argument("--unit", default="k", help="каноническая единица (по умолчанию Кельвин)")
+    parser.add_argument("--queue-size", type=int, default=10000, help="наибольшая длина очереди, строк")
+    parser.add_argument("--batch-size", type=int, default=1000, help="строк в одной пачке записи")
+    parser.add_argument("--calibration", help="CSV-файл калибровок sensor,gain,offset")
+    parser.add_argument("--report-interval", type=float, default=10.0, help="период вывода счетчиков, с")
+    args = parser.parse_args(argv)
+    if args.udp_port is None and args.tcp_port is None:
+        parser.error("укажите --udp-port и/или --tcp-port")
+    try:
+        asyncio.run(serve(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""Профиль запуска: время от старта до готового главного окна по фазам.
+
+Фазы отмечаются по мере прохождения (mark), время каждой -- от
+предыдущей отметки. Фазы, где приложение ждет пользователя (ввод логина
+и пароля), отмечаются с waiting=True и не входят в итог "до готовности".
+Фоновые события (загрузка истории) отмечаются через event: они идут
+параллельно с фазами и показываются отдельно, от момента старта.
+"""
+import time
+
+
+class StartupProfiler:
+    """Отметки фаз запуска"""
+
+    def __init__(self, clock=time.perf_counter, start=None):
+        self.clock = clock
+        self.start = clock() if start is None else start
+        self.last = self.start
+        # (фаза, длительность, ожидание пользователя)
+        self.phases = []
+        # (событие, время от старта)
+        self.events = []
+        self.finished = None
+
+    def mark(self, phase, waiting=False):
+        """Окончание фазы phase"""
+        now = self.clock()
+        self.phases.append((phase, now - self.last, waiting))
+        self.last = now
+
+    def event(self, name):
+        """Фоновое событие без влияния на фазы"""
+        self.events.append((name, self.clock() - self.start))
+
+    def finish(self, phase):
+        """Последняя фаза: главное окно готово к вводу"""
+        self.mark(phase)
+        self.finished = self.last
+
+    @property
+    def active(self):
+        """Время до готовности без ожидания пользователя"""
+        return sum(duration for _, duration, waiting in self.phases if not waiting)
+
+    def report(self):
+        lines = ["Профиль запуска:"]
+        for phase, duration, waiting in self.phases:
+            note = "  (ожидание пользователя, не учитывается)" if waiting else ""
+            lines.append(f"  {phase:<32} {duration * 1000:9.1f} мс{note}")
+        if self.finished is not None:
+            lines.append(f"  {'до готовности главного окна':<32} {self.active * 1000:9.1f} мс")
+        for name, elapsed in self.events:
+            lines.append(f"  {name:<32} {elapsed * 1000:9.1f} мс от старта")
+        return "\n".join(lines)
@@ -0,0 +1,150 @@
+"""Оконная агрегация потока показаний за один проход.
+
+Вход -- итерируемые кортежи (время, значение, единица) с неубывающим
+временем. Показания конвертируются порциями в одну единицу тем же
+пакетным преобразованием, что и в bulk_convert, и сворачиваются в
+минимум, максимум, среднее и число значений по окнам:
+
+    tumbling(readings, size)        -- окна [k*size, (k+1)*size)
+    sliding(readings, size, step)   -- окна длины size через каждые step
+
+Генераторы выдают WindowStats по мере закрытия окон. Память -- O(1) для
+неперекрывающихся окон и O(число значений в окне) для скользящих:
+минимум и максимум поддерживаются монотонными очередями, сумма --
+нарастающим итогом. Пустые окна не выдаются.
+"""
+import math
+from collections import deque, namedtuple
+
+from bulk_convert import chunked
+from units import ABSOLUTE_ZERO_ERROR, UNITS
+
+WindowStats = namedtuple("WindowStats", "start end count min max mean")
+
+INVALID_POLICIES = ("skip", "raise")
+
+
+def convert_readings(readings, unit="c", on_invalid="skip", chunk_size=4096, stats=None):
+    """Поток (время, значение в unit) из (время, значение, единица).
+
+    Значения ниже абсолютного нуля пропускаются ("skip", учитываются в
+    stats.rejected) или прерывают поток ("raise").
+    """
+    if on_invalid not in INVALID_POLICIES:
+        raise ValueError(f"Неизвестная политика: {on_invalid}")
+    target = UNITS.resolve(unit)
+    transforms = {}
+
+    def transform(source):
+        if source not in transforms:
+            transforms[source] = UNITS.transform(UNITS.resolve(source), target)
+        return transforms[source]
+
+    for chunk in chunked(readings, chunk_size):
+        sources = {reading[2] for reading in chunk}
+        if len(sources) == 1:
+            results, valid = transform(sources.pop()).convert_batch(
+                [reading[1] for reading in chunk], on_invalid="mask")
+        else:
+            # Смешанные единицы: по пакетному вызову на единицу
+            results = [0.0] * len(chunk)
+            valid = [True] * len(chunk)
+            for source in sources:
+                positions = [i for i, reading in enumerate(chunk) if reading[2] == source]
+                converted, ok = transform(source).convert_batch(
+                    [chunk[i][1] for i in positions], on_invalid="mask")
+                for i, result, flag in zip(positions, converted, ok):
+                    results[i] = result
+                    valid[i] = flag
+
+        if stats is not None:
+            stats.rows += len(chunk)
+        for reading, result, ok in zip(chunk, results, valid):
+            if ok:
+                yield reading[0], float(result)
+            elif on_invalid == "raise":
+                raise ValueError(f"{ABSOLUTE_ZERO_ERROR} (время {reading[0]})")
+            elif stats is not None:
+                stats.rejected += 1
+
+
+def tumbling(readings, size, unit="c", on_invalid="skip", stats=None):
+    """Агрегаты по неперекрывающимся окнам длины size"""
+    if size <= 0:
+        raise ValueError("Длина окна должна быть положительной")
+    start = None
+    count = 0
+    for timestamp, value in convert_readings(readings, unit, on_invalid, stats=stats):
+        if start is None or timestamp >= start + size:
+            if count:
+                yield WindowStats(start, start + size, count, low, high, total / count)
+            start = math.floor(timestamp / size) * size
+            count = 0
+            total = 0.0
+            low = high = value
+        count += 1
+        total += value
+        if value < low:
+            low = value
+        elif value > high:
+            high = value
+    if count:
+        yield WindowStats(start, start + size, count, low, high, total / count)
+
+
+def sliding(readings, size, step, unit="c", on_invalid="skip", stats=None):
+    """Агрегаты по окнам [end - size, end) для end, кратных step"""
+    if size <= 0 or step <= 0:
+        raise ValueError("Длина и шаг окна должны быть положительными")
+    window = deque()    # (номер, время, значение)
+    minimums = deque()  # (номер, значение), значения возрастают
+    maximums = deque()  # (номер, значение), значения убывают
+    total = 0.0
+    number = 0
+    end = None
+
+    def evict(start):
+        nonlocal total
+        while window and window[0][1] < start:
+            index, _, value = window.popleft()
+            total -= value
+            if minimums[0][0] == index:
+                minimums.popleft()
+            if maximums[0][0] == index:
+                maximums.popleft()
+        if not window:
+            # Сброс накопленной ошибки округления нарастающего итога
+            total = 0.0
+
+    def aggregate():
+        count = len(window)
+        return WindowStats(end - size, end, count, minimums[0][1], maximums[0][1], total / count)
+
+    for timestamp, value in convert_readings(readings, unit, on_invalid, stats=stats):
+        if end is None:
+            end = (math.floor(timestamp / step) + 1) * step
+        while timestamp >= end:
+            evict(end - size)
+            if window:
+                yield aggregate()
+                end += step
+            else:
+                # Пропуск пустых окон в разрыве потока
+                end = (math.floor(timestamp / step) + 1) * step
+
+        window.append((number, timestamp, value))
+        total += value
+        while minimums and minimums[-1][1] >= value:
+            minimums.pop()
+        minimums.append((number, value))
+        while maximums and maximums[-1][1] <= value:
+            maximums.pop()
+        maximums.append((number, value))
+        number += 1
+
+    # Окна, захватывающие хвост потока
+    while window:
+        evict(end - size)
+        if window:
+            yield aggregate()
+        end += step
@@ -0,0 +1,86 @@
+"""Выполнение тяжелых операций вне главного потока Tk.
+
+Задачи выполняются в пуле потоков, а их результаты складываются в очередь,
+которую главный поток опрашивает через root.after и вызывает обработчики
+уже в потоке интерфейса. Заодно измеряется, насколько главный поток
+опаздывает к очередному опросу: это худший простой интерфейса.
+"""
+import queue
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# Период опроса очереди результатов, мс
+POLL_INTERVAL = 20
+
+
+class TaskExecutor:
+    """Пул потоков с доставкой результатов в главный поток Tk"""
+
+    def __init__(self, root, max_workers=4, poll_interval=POLL_INTERVAL):
+        self.root = root
+        self.poll_interval = poll_interval
+        self.pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="ui-task")
+        self.results = queue.Queue()
+        self.closed = False
+
+        # Инструментирование: худшее опоздание опроса и самый долгий обработчик
+        self.max_stall = 0.0
+        self.max_callback = 0.0
+        self.polls = 0
+
+        self.next_due = time.perf_counter() + poll_interval / 1000
+        self.root.after(poll_interval, self._poll)
+
+    def submit(self, fn, *args, on_success=None, on_error=None, **kwargs):
+        """Запуск fn в пуле; on_success(результат) или on_error(исключение)
+        вызываются в главном потоке"""
+        future = self.pool.submit(fn, *args, **kwargs)
+        future.add_done_callback(lambda done: self.results.put((done, on_success, on_error)))
+        return future
+
+    def call_soon(self, callback, *args):
+        """Потокобезопасный вызов callback(*args) в главном потоке"""
+        self.results.put((None, lambda _: callback(*args), None))
+
+    def shutdown(self, wait=False):
+        self.closed = True
+        self.pool.shutdown(wait=wait)
+
+    def stall_report(self):
+        """Сводка по простоям главного потока"""
+        return (f"Опросов: {self.polls}, худший простой главного потока: {self.max_stall * 1000:.1f} мс, "
+                f"самый долгий обработчик: {self.max_callback * 1000:.1f} мс")
+
+    def _poll(self):
+        now = time.perf_counter()
+        self.max_stall = max(self.max_stall, now - self.next_due)
+        self.polls += 1
+
+        while True:
+            try:
+                future, on_success, on_error = self.results.get_nowait()
+            except queue.Empty:
+                break
+            started = time.perf_counter()
+            self._deliver(future, on_success, on_error)
+            self.max_callback = max(self.max_callback, time.perf_counter() - started)
+
+        if not self.closed:
+            self.next_due = time.perf_counter() + self.poll_interval / 1000
+            self.root.after(self.poll_interval, self._poll)
+
+    def _deliver(self, future, on_success, on_error):
+        try:
+            if future is not None and future.exception() is not None:
+                if on_error is None:
+                    raise future.exception()
+                on_error(future.exception())
+            elif on_success is not None:
+                on_success(None if future is None else future.result())
+        except Exception:
+            # Как для обычных обработчиков событий Tk
+            report = getattr(self.root, "report_callback_exception", None)
+            if report is None:
+                raise
+            report(*sys.exc_info())
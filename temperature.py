@@ -0,0 +1,275 @@
+"""Значение температуры с единицей и столбец таких значений.
+
+Temperature -- неизменяемая пара (значение, код единицы) со __slots__:
+единица разрешается один раз при создании, а конвертация в другую
+единицу выполняется только по запросу (to) тем же преобразованием
+реестра, что и в TemperatureConverter. Сравнение учитывает физический
+смысл: 0 °C == 273.15 K, а у Делиля большее число -- более низкая
+температура.
+
+TemperatureArray -- столбец значений в одном непрерывном буфере
+array("d") (или "f") с одной единицей на весь столбец: 8 (4) байт на
+показание вместо объекта Python на каждое. to, сравнение с порогом и
+сортировка работают со всем буфером сразу, без создания Temperature для
+каждого элемента.
+"""
+from array import array
+
+from buffer_convert import convert_buffer
+from temperature_parser import convert_parsed, parse_column, parse_temperature
+from units import ABSOLUTE_ZERO_ERROR, UNITS, load_numpy
+
+# Операции сравнения для TemperatureArray.where
+COMPARISONS = ("<", "<=", ">", ">=")
+
+# Сравнение в шкале с обратным направлением (Делиль)
+_REVERSED = {"<": ">", "<=": ">=", ">": "<", ">=": "<="}
+
+
+# Коды единиц -> True для шкал с обратным направлением (дроби сравниваются медленно)
+_descending = {}
+
+
+def _is_descending(unit):
+    descending = _descending.get(unit)
+    if descending is None:
+        descending = _descending[unit] = UNITS.units[unit].scale < 0
+    return descending
+
+
+def _temperature(value, unit):
+    """Temperature без повторного разрешения единицы и проверки границы"""
+    result = Temperature.__new__(Temperature)
+    result.value = value
+    result.unit = unit
+    return result
+
+
+class Temperature:
+    """Температура: значение и код единицы"""
+
+    __slots__ = ("value", "unit")
+
+    def __init__(self, value, unit="c"):
+        unit = UNITS.resolve(unit)
+        value = float(value)
+        transform = UNITS.transform(unit, "k")
+        if value < transform.lower or value > transform.upper:
+            raise ValueError(ABSOLUTE_ZERO_ERROR)
+        self.value = value
+        self.unit = unit
+
+    @classmethod
+    def parse(cls, text, default_unit=None):
+        """Температура из записи вида "23.50°C" """
+        return cls(*parse_temperature(text, default_unit))
+
+    @property
+    def kelvin(self):
+        return UNITS.convert_unchecked(self.value, self.unit, "k")
+
+    def to(self, unit):
+        """Та же температура в другой единице"""
+        unit = UNITS.resolve(unit)
+        if unit == self.unit:
+            return self
+        # Проверка границы не нужна: значение проверено при создании
+        return _temperature(UNITS.convert_unchecked(self.value, self.unit, unit), unit)
+
+    def __float__(self):
+        return self.value
+
+    def __repr__(self):
+        return f"Temperature({self.value!r}, {self.unit!r})"
+
+    def __str__(self):
+        return f"{self.value:.2f}{UNITS.units[self.unit].symbol}"
+
+    def _key(self, other):
+        """Пара сравнимых чисел: в общей единице или в кельвинах"""
+        if other.unit == self.unit:
+            if _is_descending(self.unit):
+                return other.value, self.value
+            return self.value, other.value
+        return self.kelvin, other.kelvin
+
+    def __eq__(self, other):
+        if not isinstance(other, Temperature):
+            return NotImplemented
+        left, right = self._key(other)
+        return left == right
+
+    def __lt__(self, other):
+        if not isinstance(other, Temperature):
+            return NotImplemented
+        left, right = self._key(other)
+        return left < right
+
+    def __le__(self, other):
+        if not isinstance(other, Temperature):
+            return NotImplemented
+        left, right = self._key(other)
+        return left <= right
+
+    def __gt__(self, other):
+        if not isinstance(other, Temperature):
+            return NotImplemented
+        left, right = self._key(other)
+        return left > right
+
+    def __ge__(self, other):
+        if not isinstance(other, Temperature):
+            return NotImplemented
+        left, right = self._key(other)
+        return left >= right
+
+    def __hash__(self):
+        return hash(self.kelvin)
+
+
+class TemperatureArray:
+    """Столбец температур в одной единице поверх одного буфера"""
+
+    __slots__ = ("values", "unit")
+
+    def __init__(self, values=(), unit="c", typecode="d"):
+        unit = UNITS.resolve(unit)
+        if not isinstance(values, array) or values.typecode != typecode:
+            values = array(typecode, values)
+        if values:
+            # Граница проверяется по минимуму и максимуму на уровне C
+            transform = UNITS.transform(unit, "k")
+            if min(values) < transform.lower or max(values) > transform.upper:
+                raise ValueError(ABSOLUTE_ZERO_ERROR)
+        self.values = values
+        self.unit = unit
+
+    @classmethod
+    def _wrap(cls, values, unit):
+        result = cls.__new__(cls)
+        result.values = values
+        result.unit = unit
+        return result
+
+    @classmethod
+    def parse(cls, texts, unit="c", default_unit=None):
+        """Столбец из записей вида "23.50°C" в единице unit.
+
+        Записи в других единицах конвертируются пачками по единицам;
+        ошибки разбора и значения ниже абсолютного нуля -- ValueError с
+        номером строки.
+        """
+        unit = UNITS.resolve(unit)
+        parsed = parse_column(texts, default_unit)
+        if parsed.errors:
+            row, _, message = parsed.errors[0]
+            raise ValueError(f"Строка {row}: {message}")
+        results, valid = convert_parsed(parsed, UNITS.transform(unit, unit))
+        valid = list(valid)
+        if False in valid:
+            raise ValueError(f"Строка {valid.index(False)}: {ABSOLUTE_ZERO_ERROR}")
+        return cls._wrap(array("d", results), unit)
+
+    def __len__(self):
+        return len(self.values)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return self._wrap(self.values[index], self.unit)
+        return _temperature(self.values[index], self.unit)
+
+    def __iter__(self):
+        unit = self.unit
+        for value in self.values:
+            yield _temperature(value, unit)
+
+    def __repr__(self):
+        return f"TemperatureArray(<{len(self.values)} значений>, {self.unit!r})"
+
+    def __eq__(self, other):
+        if not isinstance(other, TemperatureArray):
+            return NotImplemented
+        return self.unit == other.unit and self.values == other.values
+
+    __hash__ = None
+
+    def append(self, temperature):
+        """Добавление Temperature в конец столбца"""
+        self.values.append(temperature.to(self.unit).value)
+
+    def to(self, unit, in_place=False):
+        """Столбец в другой единице: одна пакетная конвертация буфера"""
+        unit = UNITS.resolve(unit)
+        if unit == self.unit:
+            return self if in_place else self._wrap(array(self.values.typecode, self.values), unit)
+        if in_place:
+            convert_buffer(self.values, self.unit, unit, in_place=True, on_invalid="clip")
+            self.unit = unit
+            return self
+        out = array(self.values.typecode, bytes(len(self.values) * self.values.itemsize))
+        # Значения проверены при создании: "clip" лишь снимает повторную проверку
+        convert_buffer(self.values, self.unit, unit, out=out, on_invalid="clip")
+        return self._wrap(out, unit)
+
+    def _threshold(self, threshold):
+        """Порог в единице столбца (число -- уже в ней)"""
+        if isinstance(threshold, Temperature):
+            return threshold.to(self.unit).value
+        return float(threshold)
+
+    def where(self, op, threshold):
+        """Маска сравнения с порогом: список bool или ndarray с NumPy.
+
+        Порог конвертируется в единицу столбца один раз, значения -- нет.
+        """
+        if op not in COMPARISONS:
+            raise ValueError(f"Неизвестное сравнение: {op}")
+        value = self._threshold(threshold)
+        if _is_descending(self.unit):
+            op = _REVERSED[op]
+        np = load_numpy()
+        if np is not None:
+            values = np.frombuffer(self.values, dtype=self.values.typecode)
+            return {"<": np.less, "<=": np.less_equal, ">": np.greater, ">=": np.greater_equal}[op](values, value)
+        compare = {"<": value.__gt__, "<=": value.__ge__, ">": value.__lt__, ">=": value.__le__}[op]
+        return list(map(compare, self.values))
+
+    def sort(self, reverse=False):
+        """Сортировка по температуре на месте"""
+        descending = reverse != _is_descending(self.unit)
+        np = load_numpy()
+        if np is not None:
+            values = np.frombuffer(self.values, dtype=self.values.typecode)
+            values.sort()
+            if descending:
+                values[:] = values[::-1]
+        else:
+            self.values = array(self.values.typecode, sorted(self.values, reverse=descending))
+        return self
+
+    def sorted(self, reverse=False):
+        """Отсортированная копия столбца"""
+        return self._wrap(array(self.values.typecode, self.values), self.unit).sort(reverse)
+
+    def argsort(self, reverse=False):
+        """Номера элементов по возрастанию температуры"""
+        descending = reverse != _is_descending(self.unit)
+        np = load_numpy()
+        if np is not None:
+            order = np.argsort(np.frombuffer(self.values, dtype=self.values.typecode), kind="stable")
+            return order[::-1] if descending else order
+        return sorted(range(len(self.values)), key=self.values.__getitem__, reverse=descending)
+
+    def min(self):
+        """Самая низкая температура или None для пустого столбца"""
+        if not self.values:
+            return None
+        lowest = max if _is_descending(self.unit) else min
+        return _temperature(lowest(self.values), self.unit)
+
+    def max(self):
+        """Самая высокая температура или None для пустого столбца"""
+        if not self.values:
+            return None
+        highest = min if _is_descending(self.unit) else max
+        return _temperature(highest(self.values), self.unit)
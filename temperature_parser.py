@@ -0,0 +1,199 @@
+"""Разбор текстовых температур вида "23.50°C", "-40°F", "273,15 K".
+
+Понимает знак (+, -, −), десятичную точку и запятую, экспоненту и
+единицу после числа: символ (°C, K, °Ré, ...), код, русское или
+английское название и привычные варианты написания (без знака градуса,
+кириллическая "С", "градусов Цельсия", "deg F"). Без единицы (и для
+уже числовых ячеек) используется default_unit, если он задан.
+
+parse_column разбирает столбец строк за один проход и не бросает
+исключений: ошибки собираются построчно, а на месте ошибочных значений
+стоят NaN. Повторяющиеся строки (а в истории и экспортах их большинство)
+разбираются один раз благодаря кэшу. convert_parsed конвертирует
+разобранный столбец пачками по единицам.
+"""
+import re
+from array import array
+from collections import namedtuple
+
+from units import UNITS
+
+_NUMBER = re.compile(
+    r"\s*([+\-−]?)\s*(\d+(?:[.,]\d*)?|[.,]\d+)(?:[eE]([+\-]?\d+))?\s*(.*?)\s*$",
+    re.DOTALL,
+)
+
+# Слова перед названием единицы, которые не влияют на смысл
+_PREFIX = re.compile(r"^(?:degrees?|degs?|градус(?:ов|а)?|град\.?)\s*")
+
+# Написания, которых нет среди псевдонимов реестра
+_EXTRA_SUFFIXES = {
+    "с": "c",  # Кириллическая "С" вместо латинской
+    "цельсия": "c",
+    "фаренгейта": "f",
+    "кельвина": "k",
+    "кельвинов": "k",
+    "ранкина": "r",
+    "реомюра": "re",
+    "делиля": "de",
+    "ньютона": "n",
+    "рёмера": "ro",
+    "ремера": "ro",
+}
+
+# Наибольшее число строк в кэше разобранных значений
+CACHE_SIZE = 1 << 16
+
+ParsedColumn = namedtuple("ParsedColumn", "values units errors")
+
+
+def _normalize(suffix):
+    suffix = suffix.lower().replace("°", "").replace("º", "").strip()
+    return _PREFIX.sub("", suffix).replace(" ", "")
+
+
+def _build_suffixes():
+    suffixes = {}
+    for alias, code in UNITS.aliases.items():
+        suffixes[_normalize(alias)] = code
+    for unit in UNITS.units.values():
+        suffixes[_normalize(unit.symbol)] = unit.code
+    suffixes.update(_EXTRA_SUFFIXES)
+    return suffixes
+
+
+_SUFFIXES = _build_suffixes()
+_cache = {}
+
+# Быстрый путь: канонические символы сразу за числом ("23.50°C", "273.15K")
+_EXACT = {unit.symbol: unit.code for unit in UNITS.units.values()}
+_EXACT.update({"C": "c", "F": "f"})
+_EXACT_LENGTHS = sorted({len(symbol) for symbol in _EXACT}, key=lambda length: (length != 2, length))
+
+
+def _parse_exact(text):
+    """(значение, код) для числа с каноническим символом или None"""
+    for length in _EXACT_LENGTHS:
+        code = _EXACT.get(text[-length:])
+        if code is not None:
+            number = text[:-length]
+            # float() принимает еще "1_000", "nan" и "inf" -- их разбирает общий путь
+            if "_" in number:
+                return None
+            try:
+                value = float(number)
+            except ValueError:
+                return None
+            if value - value != 0:
+                return None
+            return value, code
+    return None
+
+
+def unit_code(suffix):
+    """Код единицы по ее записи после числа или None"""
+    code = _SUFFIXES.get(suffix)
+    if code is None:
+        code = _SUFFIXES.get(_normalize(suffix))
+    return code
+
+
+def parse_temperature(text, default_unit=None):
+    """Разбор одной строки в (значение, код единицы); ValueError при ошибке"""
+    # В кэше только строки с явной единицей: от default_unit они не зависят
+    cached = _cache.get(text) if isinstance(text, str) else None
+    if cached is not None:
+        return cached
+    if isinstance(text, (int, float)) and not isinstance(text, bool) and default_unit is not None:
+        # Уже числовая ячейка (например, из JSONL)
+        return float(text), UNITS.resolve(default_unit)
+    if not isinstance(text, str):
+        raise ValueError(f"Не удалось разобрать температуру: {text!r}")
+    result = _parse_exact(text)
+    if result is not None:
+        _remember(text, result)
+        return result
+
+    match = _NUMBER.match(text)
+    if match is None:
+        raise ValueError(f"Не удалось разобрать температуру: {text!r}")
+    sign, digits, exponent, suffix = match.groups()
+    number = digits.replace(",", ".")
+    if exponent:
+        number = f"{number}e{exponent}"
+    value = float(number)
+    if sign and sign != "+":
+        value = -value
+
+    if suffix:
+        code = unit_code(suffix)
+        if code is None:
+            raise ValueError(f"Неизвестная единица в записи: {text!r}")
+    elif default_unit is not None:
+        code = UNITS.resolve(default_unit)
+    else:
+        raise ValueError(f"Не указана единица: {text!r}")
+
+    result = (value, code)
+    if suffix:
+        _remember(text, result)
+    return result
+
+
+def _remember(text, result):
+    if len(_cache) >= CACHE_SIZE:
+        _cache.clear()
+    _cache[text] = result
+
+
+def parse_column(texts, default_unit=None):
+    """Разбор столбца строк.
+
+    Возвращает ParsedColumn: values -- array("d") значений (NaN для
+    ошибочных строк), units -- коды единиц (None для ошибочных), errors --
+    список (номер строки, текст, сообщение).
+    """
+    default = None if default_unit is None else UNITS.resolve(default_unit)
+    texts = texts if isinstance(texts, list) else list(texts)
+    try:
+        # Попадания в кэш ищутся без цикла на Python
+        parsed = list(map(_cache.get, texts))
+    except TypeError:  # Нехешируемые ячейки
+        parsed = [None] * len(texts)
+    errors = []
+    invalid = (float("nan"), None)
+    for row, pair in enumerate(parsed):
+        if pair is None:
+            try:
+                parsed[row] = parse_temperature(texts[row], default)
+            except ValueError as e:
+                errors.append((row, texts[row], str(e)))
+                parsed[row] = invalid
+    values = array("d", [pair[0] for pair in parsed])
+    units = [pair[1] for pair in parsed]
+    return ParsedColumn(values, units, errors)
+
+
+def convert_parsed(parsed, transform):
+    """Пакетная конвертация ParsedColumn в единицу transform.target.
+
+    Значения без единицы в строке уже разобраны в transform.source; записи
+    в других единицах конвертируются своей парой. Возвращает пару
+    (результаты, маска корректных значений), как convert_batch с "mask".
+    """
+    units = set(parsed.units)
+    units.discard(None)
+    if not units - {transform.source.code}:
+        return transform.convert_batch(parsed.values, on_invalid="mask")
+
+    # Значения в других единицах конвертируются своей парой
+    results = [0.0] * len(parsed.units)
+    valid = [False] * len(parsed.units)
+    for unit in units:
+        positions = [i for i, code in enumerate(parsed.units) if code == unit]
+        converted, ok = UNITS.transform(unit, transform.target.code).convert_batch(
+            [parsed.values[i] for i in positions], on_invalid="mask")
+        for i, result, flag in zip(positions, converted, ok):
+            results[i] = result
+            valid[i] = flag
+    return results, valid
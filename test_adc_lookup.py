@@ -0,0 +1,66 @@
+import math
+import unittest
+from array import array
+from adc_lookup import LookupCache, SensorProfile, build_table
+from units import UNITS
+
+# 12 бит, 0.0625 °C на код, код 0 -- -55 °C
+PROFILE = SensorProfile("probe", 12, 0.0625, -55.0, "c")
+
+
+class TestAdcLookup(unittest.TestCase):
+    def setUp(self):
+        self.cache = LookupCache(max_tables=2)
+
+    def test_table_matches_float_math(self):
+        table = build_table(PROFILE, "f")
+        self.assertEqual(len(table), 4096)
+        for code in (0, 1, 880, 4095):
+            with self.subTest(code=code):
+                expected = UNITS.convert(code * 0.0625 - 55.0, "c", "f")
+                self.assertAlmostEqual(table[code], expected, places=9)
+
+    def test_sentinel_below_absolute_zero(self):
+        # 16 бит, 0.01 K на код, код 0 -- -100 K: коды < 10000 недопустимы
+        profile = SensorProfile("cryo", 16, 0.01, -100.0, "k")
+        result = self.cache.convert(array("H", [0, 9999, 10000, 65535]), profile, "c")
+        self.assertTrue(math.isnan(result[0]) and math.isnan(result[1]))
+        self.assertAlmostEqual(result[2], -273.15)
+        self.assertAlmostEqual(result[3], 555.35 - 273.15)
+
+    def test_signed_codes(self):
+        profile = SensorProfile("diff", 12, 0.1, 0.0, "c", signed=True)
+        result = self.cache.convert([-2048, -1, 0, 2047], profile, "k")
+        self.assertEqual([round(float(value), 9) for value in result], [68.35, 273.05, 273.15, 477.85])
+        with self.assertRaises(ValueError):
+            self.cache.convert([2048], profile, "k")
+        with self.assertRaises(ValueError):
+            self.cache.convert([-1], PROFILE, "k")
+
+    def test_lazy_lru_cache(self):
+        self.assertEqual(len(self.cache), 0)
+        first = self.cache.table(PROFILE, "f")
+        self.assertIs(self.cache.table(PROFILE, "Фаренгейт"), first)
+        self.cache.table(PROFILE, "k")
+        self.cache.table(PROFILE, "f")  # f становится самой свежей
+        self.cache.table(PROFILE, "r")  # вытесняет k
+        self.assertEqual(set(key[1] for key in self.cache.tables), {"f", "r"})
+        self.assertEqual(self.cache.stats.as_dict(), {"hits": 2, "misses": 3, "evictions": 1})
+
+    def test_output_buffer(self):
+        out = array("d", [0.0, 0.0])
+        self.assertIs(self.cache.convert(array("H", [0, 880]), PROFILE, "c", out=out), out)
+        self.assertEqual(out.tolist(), [-55.0, 0.0])
+        with self.assertRaises(ValueError):
+            self.cache.convert(array("H", [0, 880, 1]), PROFILE, "c", out=out)
+        self.assertEqual(out.tolist(), [-55.0, 0.0])
+
+    def test_bad_profile(self):
+        with self.assertRaises(ValueError):
+            build_table(SensorProfile("wide", 32, 1, 0, "c"), "k")
+        with self.assertRaises(ValueError):
+            LookupCache(max_tables=0)
+
+
+if __name__ == "__main__":
+    unittest.main()
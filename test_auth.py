@@ -0,0 +1,118 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import unittest
+import unittest.mock
+from auth import AuthSystem
+
+
+class TestAuthSystem(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.users_file = os.path.join(self.tmp.name, "users.json")
+        self.db_file = os.path.join(self.tmp.name, "users.db")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def make_auth(self):
+        auth = AuthSystem(self.users_file, self.db_file)
+        self.addCleanup(auth.users.close)
+        return auth
+
+    def test_register_login_change_password(self):
+        auth = self.make_auth()
+        self.assertEqual(auth.register("anna", "secret"), (True, "Регистрация успешна"))
+        self.assertFalse(auth.register("anna", "secret")[0])
+        self.assertFalse(auth.register("boris", "123")[0])
+
+        self.assertFalse(auth.login("anna", "wrong")[0])
+        self.assertTrue(auth.login("anna", "secret")[0])
+        self.assertEqual(auth.get_current_user(), "anna")
+        self.assertIsNotNone(auth.users["anna"]["last_login"])
+
+        self.assertTrue(auth.change_password("anna", "secret", "better")[0])
+        self.assertTrue(self.make_auth().login("anna", "better")[0])
+
+    def test_register_many(self):
+        auth = self.make_auth()
+        auth.register("anna", "secret")
+        results = auth.register_many([
+            ("anna", "secret"),
+            ("boris", "12"),
+            ("vera", "secret", "vera@example.com"),
+            ("vera", "other"),
+        ])
+        self.assertEqual([ok for ok, _ in results], [False, False, True, False])
+        self.assertEqual(results[2], (True, "Регистрация успешна"))
+        self.assertEqual(auth.users["vera"]["email"], "vera@example.com")
+        self.assertEqual(len(auth.users), 2)
+
+    def test_register_many_large_batch(self):
+        auth = self.make_auth()
+        users = [(f"user{i}", f"pass{i}") for i in range(50)]
+        results = auth.register_many(users)
+        self.assertTrue(all(ok for ok, _ in results))
+        self.assertTrue(auth.login("user42", "pass42")[0])
+
+    def test_register_many_race(self):
+        auth = self.make_auth()
+        other = self.make_auth()
+        existing = auth.users.existing
+
+        def existing_then_register(usernames):
+            found = existing(usernames)
+            # Другой экземпляр регистрирует логин между проверкой и записью
+            other.register("anna", "secret")
+            return found
+
+        with unittest.mock.patch.object(auth.users, "existing", existing_then_register):
+            results = auth.register_many([("boris", "secret"), ("anna", "other")])
+        self.assertEqual(results, [(True, "Регистрация успешна"), (False, "Пользователь уже существует")])
+        self.assertTrue(auth.login("anna", "secret")[0])
+        self.assertTrue(auth.login("boris", "secret")[0])
+
+    def test_import_users_empty_password(self):
+        auth = self.make_auth()
+        csv_file = os.path.join(self.tmp.name, "users.csv")
+        with open(csv_file, "w", encoding="utf-8", newline="") as f:
+            f.write("username,password,email\nanna,,\nboris,secret,b@example.com\nvera\n")
+        results = auth.import_users(csv_file)
+        self.assertEqual([ok for ok, _ in results], [False, True, False])
+        self.assertEqual(results[0][1], "Пароль должен содержать минимум 4 символа")
+
+    def test_concurrent_logins(self):
+        auth = self.make_auth()
+        auth.register_many([(f"user{i}", "secret") for i in range(20)])
+        errors = []
+
+        def worker(offset):
+            try:
+                for i in range(200):
+                    if not auth.login(f"user{(i + offset) % 20}", "secret")[0]:
+                        errors.append(i)
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=worker, args=(n,)) for n in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(errors, [])
+        self.assertIsNotNone(auth.users["user0"]["last_login"])
+
+    def test_migrates_users_json(self):
+        legacy = hashlib.sha256(b"secret").hexdigest()
+        with open(self.users_file, "w", encoding="utf-8") as f:
+            json.dump({"anna": {"password_hash": legacy, "email": None,
+                                "created_at": "2024-01-01 00:00:00", "last_login": None}}, f)
+        auth = self.make_auth()
+        self.assertEqual(len(auth.users), 1)
+        self.assertTrue(auth.login("anna", "secret")[0])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,61 @@
+import math
+import os
+import tempfile
+import unittest
+from array import array
+from binary_convert import convert_file
+
+
+class TestBinaryConvert(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.input = os.path.join(self.tmp.name, "in.bin")
+        self.output = os.path.join(self.tmp.name, "out.bin")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write(self, code, values):
+        with open(self.input, "wb") as f:
+            f.write(array(code, values).tobytes())
+
+    def read(self, code, path):
+        values = array(code)
+        with open(path, "rb") as f:
+            values.frombytes(f.read())
+        return list(values)
+
+    def test_float64_to_file(self):
+        self.write("d", [0, 100, -300, 25])
+        report = convert_file(self.input, self.output, "c", "k", dtype="f8", chunk_size=3)
+        result = self.read("d", self.output)
+        self.assertEqual(result[0], 273.15)
+        self.assertTrue(math.isnan(result[2]))
+        self.assertEqual((report.count, report.invalid, report.offsets), (4, 1, [16]))
+
+    def test_float32_in_place(self):
+        self.write("f", [32, 212, -500])
+        report = convert_file(self.input, from_unit="f", to_unit="c", dtype="f4",
+                              in_place=True, on_invalid="clip")
+        result = self.read("f", self.input)
+        self.assertAlmostEqual(result[0], 0, places=5)
+        self.assertAlmostEqual(result[1], 100, places=4)
+        self.assertAlmostEqual(result[2], -273.15, places=4)
+        self.assertEqual(report.offsets, [8])
+
+    def test_output_is_input(self):
+        self.write("d", [0, 100])
+        alias = os.path.join(self.tmp.name, ".", "in.bin")
+        with self.assertRaises(ValueError):
+            convert_file(self.input, alias, "c", "k", dtype="f8")
+        self.assertEqual(self.read("d", self.input), [0, 100])
+
+    def test_truncated_file(self):
+        with open(self.input, "wb") as f:
+            f.write(b"\x00" * 5)
+        with self.assertRaises(ValueError):
+            convert_file(self.input, self.output, dtype="f4")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,99 @@
+import math
+import mmap
+import tracemalloc
+import unittest
+from array import array
+from buffer_convert import as_view, convert_buffer
+from units import load_numpy
+
+
+class TestBufferConvert(unittest.TestCase):
+    def test_inputs(self):
+        expected = [273.15, 373.15]
+        raw = array("d", [0, 100]).tobytes()
+        for values in (array("d", [0, 100]), array("f", [0, 100]), array("h", [0, 100]),
+                       memoryview(array("d", [0, 100])), raw):
+            with self.subTest(values=type(values).__name__):
+                result = convert_buffer(values, "c", "k", format="d" if values is raw else None)
+                self.assertEqual(list(result), expected)
+        result = convert_buffer(bytearray(raw), "c", "k", format="d")
+        self.assertEqual(result.typecode, "d")
+
+    def test_output_buffer(self):
+        values = array("d", [0, 100, 25])
+        out = bytearray(12)
+        self.assertIs(convert_buffer(values, "c", "f", out=out, out_format="f"), out)
+        self.assertEqual(array("f", out).tolist(), [32.0, 212.0, 77.0])
+        with self.assertRaises(ValueError):
+            convert_buffer(values, "c", "f", out=array("d", [0]))
+        with self.assertRaises(ValueError):
+            convert_buffer(values, "c", "f", out=array("i", [0, 0, 0]))
+        with self.assertRaises(ValueError):
+            convert_buffer(values, "c", "f", in_place=True, out=array("d", [0, 0, 0]))
+
+    def test_in_place_strided_and_sliced(self):
+        values = array("d", range(10))
+        convert_buffer(memoryview(values)[::2], "c", "k", in_place=True)
+        self.assertEqual(values[:4].tolist(), [273.15, 1.0, 275.15, 3.0])
+        convert_buffer(memoryview(values)[7:9], "k", "c", in_place=True)
+        self.assertEqual(values[6:10].tolist(), [279.15, 7.0 - 273.15, 281.15 - 273.15, 9.0])
+        # Вход и выход с разным шагом
+        out = array("d", [0.0] * 6)
+        convert_buffer(memoryview(array("d", range(6)))[::-2], "c", "k", out=memoryview(out)[:3])
+        self.assertEqual(out.tolist(), [278.15, 276.15, 274.15, 0.0, 0.0, 0.0])
+
+    def test_mmap_in_place(self):
+        with mmap.mmap(-1, 16) as buffer:
+            buffer[:] = array("d", [32, 212]).tobytes()
+            convert_buffer(buffer, "f", "c", in_place=True, format="d")
+            self.assertEqual(array("d", buffer[:]).tolist(), [0.0, 100.0])
+
+    def test_policies(self):
+        values = array("d", [0, -300, 25])
+        with self.assertRaises(ValueError) as context:
+            convert_buffer(values, "c", "k", in_place=True)
+        self.assertIn("элемент 1", str(context.exception))
+        # При ошибке буфер не изменен
+        self.assertEqual(values.tolist(), [0, -300, 25])
+        result = convert_buffer(values, "c", "k", on_invalid="nan")
+        self.assertTrue(math.isnan(result[1]))
+        convert_buffer(values, "c", "k", in_place=True, on_invalid="clip")
+        self.assertEqual(values.tolist(), [273.15, 0.0, 298.15])
+        with self.assertRaises(ValueError):
+            convert_buffer(values, "c", "k", on_invalid="mask")
+
+    def test_readonly_and_formats(self):
+        with self.assertRaises(ValueError):
+            convert_buffer(array("d", [1]).tobytes(), "c", "k", in_place=True, format="d")
+        with self.assertRaises(ValueError):
+            as_view(bytes(12), "d")
+        with self.assertRaises(ValueError):
+            as_view(memoryview(array("d", range(4)))[::2], "f")
+
+    def test_no_copies(self):
+        size = 300_000
+        values = array("d", bytes(8 * size))
+        out = array("d", bytes(8 * size))
+        tracemalloc.start()
+        try:
+            convert_buffer(values, "c", "k", out=out)
+            convert_buffer(memoryview(values)[::3], "c", "k", in_place=True)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        # Порции, а не копии буфера в 2.4 МБ
+        self.assertLess(peak, 1 << 19)
+        self.assertEqual((out[0], values[0], values[1]), (273.15, 273.15, 0.0))
+
+    @unittest.skipIf(load_numpy() is None, "NumPy не установлен")
+    def test_numpy_shares_memory(self):
+        np = load_numpy()
+        values = np.arange(10, dtype=np.float64)
+        view = memoryview(values)[1::2]
+        self.assertIs(convert_buffer(view, "c", "k", in_place=True), view)
+        self.assertEqual(values[1], 274.15)
+        self.assertEqual(values[2], 2.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,41 @@
+import io
+import json
+import unittest
+from bulk_convert import bulk_convert
+
+
+class TestBulkConvert(unittest.TestCase):
+    def test_csv_stream(self):
+        source = io.StringIO("id,temp\n1,0\n2,100\n3,abc\n4,-300\n")
+        target = io.StringIO()
+        stats = bulk_convert(source, target, "c", "f", "temp", chunk_size=2)
+        self.assertEqual(target.getvalue().splitlines(), ["id,temp", "1,32.0", "2,212.0"])
+        self.assertEqual((stats.rows, stats.rejected), (4, 2))
+
+    def test_jsonl_keep_rejected(self):
+        source = io.StringIO('{"t": 0}\n\n{"t": -1}\n')
+        target = io.StringIO()
+        stats = bulk_convert(source, target, "k", "c", "t", fmt="jsonl",
+                             output_column="c", on_reject="keep")
+        rows = [json.loads(line) for line in target.getvalue().splitlines()]
+        self.assertEqual(rows, [{"t": 0, "c": -273.15}, {"t": -1, "c": ""}])
+        self.assertEqual(stats.rejected, 1)
+
+    def test_cells_with_units(self):
+        source = io.StringIO('temp\n23.50°C\n"-40,0 °F"\n273.15K\n10 parsec\n')
+        target = io.StringIO()
+        stats = bulk_convert(source, target, "c", "k", "temp")
+        values = [float(line) for line in target.getvalue().splitlines()[1:]]
+        self.assertEqual(len(values), 3)
+        for value, expected in zip(values, (296.65, 233.15, 273.15)):
+            self.assertAlmostEqual(value, expected)
+        self.assertEqual(stats.rejected, 1)
+
+    def test_raise_on_reject(self):
+        source = io.StringIO("temp\n-500\n")
+        with self.assertRaises(ValueError):
+            bulk_convert(source, io.StringIO(), "f", "c", "temp", on_reject="raise")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,96 @@
+import math
+import os
+import tempfile
+import unittest
+from calibration import CalibrationTable, calibrated_transform, load_calibrations
+from units import UNITS
+
+
+class TestCalibration(unittest.TestCase):
+    def setUp(self):
+        self.table = CalibrationTable(calibrations={"s1": (1.02, -0.5), "s2": (0.5, 10.0)})
+
+    def test_fused_matches_two_passes(self):
+        for sensor, (gain, offset) in (("s1", (1.02, -0.5)), ("s2", (0.5, 10.0))):
+            for value in (-40.0, 0.0, 25.0, 100.0):
+                with self.subTest(sensor=sensor, value=value):
+                    expected = UNITS.convert(gain * value + offset, "c", "f")
+                    self.assertAlmostEqual(self.table.convert(sensor, value, "c", "f"), expected, places=9)
+
+    def test_unknown_sensor_is_uncalibrated(self):
+        self.assertAlmostEqual(self.table.convert("other", 100.0, "c", "k"), 373.15)
+
+    def test_absolute_zero_after_calibration(self):
+        # s2: 0.5 * x + 10 >= -273.15  =>  x >= -566.3
+        self.assertAlmostEqual(self.table.transform("s2", "c", "k").lower, -566.3)
+        self.assertAlmostEqual(self.table.convert("s2", -560.0, "c", "k"), -270.0 + 273.15)
+        with self.assertRaises(ValueError):
+            self.table.convert("s2", -570.0, "c", "k")
+
+    def test_negative_gain_flips_bound(self):
+        transform = calibrated_transform("c", "k", -1, 0)
+        self.assertEqual(transform.lower, -math.inf)
+        self.assertAlmostEqual(transform.upper, 273.15)
+
+    def test_zero_gain(self):
+        with self.assertRaises(ValueError):
+            CalibrationTable(calibrations={"s1": (0, 1)})
+
+    def test_batch_gathers_per_sensor(self):
+        sensors = ["s1", "s2", "other", "s1", "s2"]
+        values = [25.0, 25.0, 25.0, -300.0, -570.0]
+        result, valid = self.table.convert_batch(sensors, values, "c", "k", on_invalid="mask")
+        self.assertEqual(list(valid), [True, True, True, False, False])
+        for i in range(3):
+            self.assertAlmostEqual(result[i], self.table.convert(sensors[i], values[i], "c", "k"))
+
+        with self.assertRaisesRegex(ValueError, "элемент 3"):
+            self.table.convert_batch(sensors, values, "c", "k")
+        clipped = self.table.convert_batch(sensors, values, "c", "k", on_invalid="clip")
+        self.assertAlmostEqual(clipped[4], 0.0, places=9)
+        self.assertTrue(math.isnan(self.table.convert_batch(sensors, values, "c", "k", on_invalid="nan")[3]))
+
+    def test_resolved_sensors(self):
+        sensors = ["s2", "other", "s1", "s2"]
+        values = [25.0, 25.0, 25.0, -570.0]
+        resolved = self.table.resolve(sensors)
+        self.assertEqual(list(resolved.rows), [2, 0, 1, 2])
+        expected = self.table.convert_batch(sensors, values, "c", "f", on_invalid="nan")
+        result = self.table.convert_batch(resolved, values, "c", "f", on_invalid="nan")
+        self.assertEqual(list(result[:3]), list(expected[:3]))
+        self.assertTrue(math.isnan(result[3]))
+        with self.assertRaises(ValueError):
+            self.table.convert_batch(resolved, values[:2], "c", "f")
+
+        # Номера остаются привязаны к своему снимку после замены таблицы
+        self.table.update({"s2": (1.0, 0.0)})
+        result = self.table.convert_batch(resolved, values, "c", "f", on_invalid="nan")
+        self.assertEqual(list(result[:3]), list(expected[:3]))
+
+    def test_hot_reload(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "calibration.csv")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write("sensor,gain,offset\ns1,1,1\n")
+            table = CalibrationTable(path, check_interval=0)
+            self.assertAlmostEqual(table.convert("s1", 0.0, "c", "c"), 1.0)
+
+            with open(path, "w", encoding="utf-8") as f:
+                f.write("sensor,gain,offset\ns1,2,0\ns2,1,-1\n")
+            os.utime(path, ns=(0, 10 ** 9))
+            self.assertTrue(table.maybe_reload())
+            self.assertAlmostEqual(table.convert("s1", 3.0, "c", "c"), 6.0)
+            self.assertEqual(len(table), 2)
+
+            # Испорченный файл не сбрасывает действующую таблицу
+            with open(path, "w", encoding="utf-8") as f:
+                f.write("sensor,gain,offset\ns1,abc,0\n")
+            os.utime(path, ns=(0, 2 * 10 ** 9))
+            self.assertFalse(table.maybe_reload())
+            self.assertAlmostEqual(table.convert("s1", 3.0, "c", "c"), 6.0)
+            with self.assertRaises(ValueError):
+                load_calibrations(path)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,101 @@
+import asyncio
+import json
+import unittest
+from conversion_service import ConversionService
+
+
+class TestConversionService(unittest.IsolatedAsyncioTestCase):
+    async def start(self, **options):
+        self.service = ConversionService(**options)
+        self.server = await self.service.start("127.0.0.1", 0)
+        self.addAsyncCleanup(self.stop)
+        self.port = self.server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        self.server.close()
+        await self.server.wait_closed()
+
+    async def request(self, method, path, payload=None):
+        reader, writer = await asyncio.open_connection("127.0.0.1", self.port)
+        body = b"" if payload is None else json.dumps(payload).encode()
+        writer.write(f"{method} {path} HTTP/1.1\r\nHost: test\r\nConnection: close\r\n"
+                     f"Content-Length: {len(body)}\r\n\r\n".encode() + body)
+        data = await reader.read()
+        writer.close()
+        head, _, body = data.partition(b"\r\n\r\n")
+        return int(head.split()[1]), json.loads(body)
+
+    async def test_single(self):
+        await self.start()
+        status, payload = await self.request("POST", "/convert", {"value": 100, "from": "c", "to": "f"})
+        self.assertEqual(status, 200)
+        self.assertAlmostEqual(payload["result"], 212.0)
+
+    async def test_unit_names_and_aliases(self):
+        await self.start()
+        status, payload = await self.request("POST", "/convert", {"value": 0, "from": "Цельсий", "to": "K"})
+        self.assertEqual(status, 200)
+        self.assertAlmostEqual(payload["result"], 273.15)
+
+    async def test_batch(self):
+        await self.start()
+        status, payload = await self.request("POST", "/convert/batch",
+                                             {"values": [0, 100, -300], "from": "c", "to": "k",
+                                              "on_invalid": "null"})
+        self.assertEqual(status, 200)
+        self.assertAlmostEqual(payload["results"][1], 373.15)
+        self.assertIsNone(payload["results"][2])
+
+        status, payload = await self.request("POST", "/convert/batch",
+                                             {"values": [0, -300], "from": "c", "to": "k"})
+        self.assertEqual(status, 400)
+        self.assertIn("элемент 1", payload["error"])
+
+    async def test_errors(self):
+        await self.start()
+        status, _ = await self.request("POST", "/convert", {"value": -500, "from": "c", "to": "f"})
+        self.assertEqual(status, 400)
+        status, _ = await self.request("POST", "/convert", {"value": "x", "from": "c", "to": "f"})
+        self.assertEqual(status, 400)
+        status, _ = await self.request("POST", "/convert", {"value": 1, "from": "c", "to": "parsec"})
+        self.assertEqual(status, 400)
+        status, _ = await self.request("GET", "/nowhere")
+        self.assertEqual(status, 404)
+        status, payload = await self.request("GET", "/units")
+        self.assertEqual(status, 200)
+        self.assertIn("k", [unit["code"] for unit in payload["units"]])
+
+    async def test_concurrent_singles_are_batched(self):
+        await self.start(batch_window=0.05)
+        responses = await asyncio.gather(*(
+            self.request("POST", "/convert", {"value": i, "from": "c", "to": "k"}) for i in range(20)
+        ))
+        for i, (status, payload) in enumerate(responses):
+            self.assertEqual(status, 200)
+            self.assertAlmostEqual(payload["result"], i + 273.15)
+        self.assertEqual(self.service.stats.batched_values, 20)
+        self.assertLess(self.service.stats.batches, 20)
+
+    async def test_backpressure(self):
+        await self.start(batch_window=0.2, max_pending=2)
+        responses = await asyncio.gather(*(
+            self.request("POST", "/convert", {"value": i, "from": "c", "to": "k"}) for i in range(5)
+        ))
+        statuses = sorted(status for status, _ in responses)
+        self.assertEqual(statuses, [200, 200, 503, 503, 503])
+        self.assertEqual(self.service.stats.rejected, 3)
+
+    async def test_keep_alive(self):
+        await self.start(batch_window=0)
+        reader, writer = await asyncio.open_connection("127.0.0.1", self.port)
+        body = json.dumps({"value": 1, "from": "c", "to": "c"}).encode()
+        for _ in range(3):
+            writer.write(f"POST /convert HTTP/1.1\r\nContent-Length: {len(body)}\r\n\r\n".encode() + body)
+            head = await reader.readuntil(b"\r\n\r\n")
+            length = int(head.split(b"Content-Length: ")[1].split(b"\r\n")[0])
+            self.assertEqual(json.loads(await reader.readexactly(length)), {"result": 1.0})
+        writer.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
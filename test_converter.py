@@ -1,3 +1,7 @@
+import math
+import os
+import subprocess
+import sys
 import unittest
 from temperature_converter import TemperatureConverter
 
@@ -45,5 +49,55 @@ class TestTemperatureConverter(unittest.TestCase):
         self.assertAlmostEqual(TemperatureConverter.c_to_f(-273.15), -459.67)
 
 
+class TestBatchConversion(unittest.TestCase):
+    CONVERSIONS = ("c_to_f", "f_to_c", "c_to_k", "k_to_c", "f_to_k", "k_to_f")
+    VALUES = [0, 1e-9, 0.1, 25, 37.5, 100, 212, 273.15, 373.15, 1234.5678]
+
+    def test_matches_scalar_methods(self):
+        for conversion in self.CONVERSIONS:
+            scalar = getattr(TemperatureConverter, conversion)
+            batch = getattr(TemperatureConverter, conversion + "_batch")
+            with self.subTest(conversion=conversion):
+                self.assertEqual(list(batch(self.VALUES)), [scalar(v) for v in self.VALUES])
+
+    def test_raise_policy(self):
+        with self.assertRaises(ValueError):
+            TemperatureConverter.c_to_f_batch([0, -274])
+        with self.assertRaises(ValueError):
+            TemperatureConverter.k_to_f_batch([-1])
+
+    def test_nan_policy(self):
+        result = TemperatureConverter.c_to_k_batch([-300, 0], on_invalid="nan")
+        self.assertTrue(math.isnan(result[0]))
+        self.assertAlmostEqual(result[1], 273.15)
+
+    def test_clip_policy(self):
+        result = TemperatureConverter.c_to_k_batch([-300, 0], on_invalid="clip")
+        self.assertAlmostEqual(result[0], 0)
+        self.assertAlmostEqual(result[1], 273.15)
+
+    def test_mask_policy(self):
+        result, valid = TemperatureConverter.f_to_c_batch([-500, 32], on_invalid="mask")
+        self.assertEqual(list(valid), [False, True])
+        self.assertAlmostEqual(result[1], 0)
+
+    def test_unknown_policy(self):
+        with self.assertRaises(ValueError):
+            TemperatureConverter.c_to_f_batch([0], on_invalid="ignore")
+
+
+class TestHeadlessImport(unittest.TestCase):
+    def test_import_does_not_load_gui(self):
+        # Отдельный процесс: в текущем модули могли быть уже загружены
+        code = ("import sys, temperature_converter, auth; "
+                "print(sorted({'tkinter', 'auth_window', 'converter_app', 'numpy'} & set(sys.modules)))")
+        completed = subprocess.run(
+            [sys.executable, "-c", code],
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            capture_output=True, text=True, check=True
+        )
+        self.assertEqual(completed.stdout.strip(), "[]")
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,80 @@
+import random
+import unittest
+from array import array
+from fractions import Fraction
+from fixed_point import SENTINEL, FixedPointTransform, convert_fixed
+from units import UNITS
+
+
+def reference(value, source, target, source_digits, target_digits):
+    """Точный результат в дробях с округлением половины вверх"""
+    src, dst = UNITS.units[source], UNITS.units[target]
+    kelvin = Fraction(value, 10 ** source_digits) * src.scale + src.offset
+    exact = (kelvin - dst.offset) / dst.scale * 10 ** target_digits
+    return (2 * exact.numerator + exact.denominator) // (2 * exact.denominator)
+
+
+class TestFixedPoint(unittest.TestCase):
+    def test_matches_exact_rounding(self):
+        rng = random.Random(1)
+        codes = list(UNITS.units)
+        for source in codes:
+            for target in codes:
+                for digits in ((3, 3), (2, 2), (3, 2), (2, 3)):
+                    transform = FixedPointTransform(source, target, *digits)
+                    bound = transform.lower if transform.lower is not None else transform.upper
+                    sign = 1 if transform.lower is not None else -1
+                    values = array("q", [bound] + [bound + sign * rng.randint(0, 10 ** 7) for _ in range(200)])
+                    expected = [reference(value, source, target, *digits) for value in values]
+                    with self.subTest(source=source, target=target, digits=digits):
+                        self.assertEqual(list(transform.convert_array(values)), expected)
+                        self.assertEqual(transform(values[1]), expected[1])
+
+    def test_absolute_zero_is_integer_exact(self):
+        transform = FixedPointTransform("c", "k")
+        self.assertEqual(transform(-273150), 0)
+        with self.assertRaises(ValueError):
+            transform(-273151)
+        # Делиль: шкала обратная, граница сверху (559725 м°De)
+        delisle = FixedPointTransform("de", "k")
+        self.assertEqual(delisle(559725), 0)
+        with self.assertRaises(ValueError):
+            delisle(559726)
+
+    def test_rounding_half_up(self):
+        # 32.001 °F = 0.000555... °C -> 1 м°C
+        transform = FixedPointTransform("f", "c")
+        self.assertEqual(transform(32001), 1)
+        self.assertEqual(transform(32000), 0)
+        self.assertEqual(FixedPointTransform("c", "k", 3, 0)(-500), 273)  # 272.65 -> 273
+        self.assertEqual(FixedPointTransform("c", "k", 2, 0)(-65), 273)  # 272.5 -> 273 (вверх)
+        self.assertEqual(FixedPointTransform("k", "c", 2, 0)(27165), -1)  # -1.5 -> -1 (вверх)
+
+    def test_policies(self):
+        values = array("q", [0, -300000, 100000])
+        with self.assertRaises(ValueError) as context:
+            convert_fixed(values, "c", "k")
+        self.assertIn("элемент 1", str(context.exception))
+        self.assertEqual(list(convert_fixed(values, "c", "k", on_invalid="clip")), [273150, 0, 373150])
+        self.assertEqual(list(convert_fixed(values, "c", "k", on_invalid="sentinel")), [273150, SENTINEL, 373150])
+        with self.assertRaises(ValueError):
+            convert_fixed(values, "c", "k", on_invalid="nan")
+
+    def test_output_buffer_and_in_place(self):
+        values = array("q", [0, 100000])
+        out = array("q", [7, 7])
+        self.assertIs(convert_fixed(values, "c", "f", out=out), out)
+        self.assertEqual(list(out), [32000, 212000])
+        convert_fixed(values, "c", "k", out=values)
+        self.assertEqual(list(values), [273150, 373150])
+        with self.assertRaises(ValueError):
+            convert_fixed(values, "c", "k", out=array("q", [0]))
+        self.assertEqual(len(convert_fixed(array("q"), "c", "k")), 0)
+
+    def test_overflow(self):
+        with self.assertRaises(ValueError):
+            convert_fixed(array("q", [(1 << 62)]), "k", "c", 3, 6)
+
+
+if __name__ == "__main__":
+    unittest.main()
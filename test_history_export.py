@@ -0,0 +1,51 @@
+import csv
+import gzip
+import os
+import tempfile
+import threading
+import unittest
+from unittest import mock
+from history_export import HEADER, export_history
+from history_store import HistoryStore
+
+
+class TestHistoryExport(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.dir = tmp.name
+        self.store = HistoryStore("anna", directory=tmp.name)
+        self.addCleanup(self.store.close)
+        for i in range(10):
+            self.store.add("c", "f", i, i * 1.8 + 32, timestamp=1.7e9 + i)
+        self.store.flush()
+
+    def read(self, path, opener=open):
+        with opener(path, "rt", encoding="utf-8", newline="") as f:
+            return list(csv.reader(f))
+
+    def test_plain_csv_with_numeric_columns(self):
+        path = os.path.join(self.dir, "out.csv")
+        progress = []
+        self.assertEqual(export_history(self.store, path, progress=lambda *p: progress.append(p)), 10)
+        rows = self.read(path)
+        self.assertEqual(rows[0], HEADER)
+        self.assertEqual(rows[1][1:], ["0.00°C", "32.00°F", "1700000000.0", "0.0", "c", "32.0", "f"])
+        self.assertEqual(progress[-1], (10, 10))
+
+    def test_gzip(self):
+        path = os.path.join(self.dir, "out.csv.gz")
+        export_history(self.store, path)
+        self.assertEqual(len(self.read(path, gzip.open)), 11)
+
+    def test_cancel_removes_file(self):
+        path = os.path.join(self.dir, "out.csv")
+        cancel = threading.Event()
+        cancel.set()
+        with mock.patch("history_export.READ_BLOCK", 3):
+            self.assertIsNone(export_history(self.store, path, cancel=cancel))
+        self.assertFalse(os.path.exists(path))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,92 @@
+import tempfile
+import unittest
+from datetime import date, datetime
+from history_index import HistoryIndex, SortedIndex, parse_filter
+from history_store import HistoryStore
+
+
+class TestHistoryIndex(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.store = HistoryStore("anna", directory=tmp.name)
+        self.addCleanup(self.store.close)
+        # Записи с 08:00 с шагом 30 минут, значения 0, 25, 50, ... °C
+        self.start = datetime(2024, 5, 1, 8, 0).timestamp()
+        for i in range(10):
+            self.store.add("c", "f", i * 25, i * 45 + 32, timestamp=self.start + i * 1800)
+        self.store.flush()
+        self.index = HistoryIndex(self.store)
+
+    def test_time_range(self):
+        result = self.index.query(start=datetime(2024, 5, 1, 9, 0), end=datetime(2024, 5, 1, 11, 0))
+        self.assertEqual([record.value for record in result], [150, 125, 100, 75, 50])
+
+    def test_value_range_in_other_unit(self):
+        result = self.index.query(low=200, unit="f")
+        self.assertEqual([record.value for record in result], [225, 200, 175, 150, 125, 100])
+
+    def test_combined_and_incremental(self):
+        self.index.refresh()
+        self.store.add("k", "c", 500, 226.85, timestamp=self.start + 3600)
+        result = self.index.query(start=self.start + 3600, end=self.start + 3600, low=200, unit="c")
+        self.assertEqual([(record.source, record.value) for record in result], [("k", 500)])
+
+    def test_rebuild_after_clear(self):
+        self.index.refresh()
+        self.store.clear()
+        self.store.add("c", "k", 1, 274.15, timestamp=self.start)
+        self.assertEqual(len(self.index.query(low=0)), 1)
+
+    def test_clear_during_rebuild(self):
+        scan = self.store.scan
+
+        def scan_then_clear(start=0):
+            yield from scan(start)
+            # История очищена и заполнена заново, пока строился индекс
+            self.store.clear()
+            for i in range(10):
+                self.store.add("k", "c", 1000 + i, 726.85 + i, timestamp=self.start)
+
+        self.store.scan = scan_then_clear
+        self.index.refresh()
+        del self.store.scan
+        result = self.index.query(low=1000)
+        self.assertEqual(len(result), 10)
+        self.assertTrue(all(record.source == "k" for record in result))
+
+    def test_parse_filter(self):
+        criteria = parse_filter("2024-05-01 09:00-11:00 >100°C", today=date(2024, 1, 1))
+        self.assertEqual(criteria["start"], datetime(2024, 5, 1, 9, 0))
+        self.assertEqual(criteria["end"], datetime(2024, 5, 1, 11, 0, 59))
+        self.assertAlmostEqual(criteria["low"], 373.15)
+        self.assertAlmostEqual(parse_filter("<= 32°F")["high"], 273.15)
+        with self.assertRaises(ValueError):
+            parse_filter("что-нибудь")
+
+    def test_strict_comparisons(self):
+        # Значения 0, 25, ..., 225 °C: граница 100 °C входит только в >= и <=
+        values = {}
+        for text in (">100", ">=100", "<100", "<=100"):
+            result = self.index.query(**parse_filter(text))
+            values[text] = sorted(record.value for record in result)
+        self.assertEqual(values[">100"], [125, 150, 175, 200, 225])
+        self.assertEqual(values[">=100"], [100, 125, 150, 175, 200, 225])
+        self.assertEqual(values["<100"], [0, 25, 50, 75])
+        self.assertEqual(values["<=100"], [0, 25, 50, 75, 100])
+
+    def test_sorted_index_appends_and_merges(self):
+        index = SortedIndex([(1.0, 0), (3.0, 1)])
+        index.add(3.0, 2)
+        index.add(5.0, 3)
+        self.assertEqual(index.unsorted, [])
+        index.add(2.0, 4)
+        index.add(0.5, 5)
+        self.assertEqual(len(index.unsorted), 2)
+        self.assertEqual(list(index.range(1.0, 3.0)), [0, 4, 1, 2])
+        self.assertEqual(list(index.keys), [0.5, 1.0, 2.0, 3.0, 3.0, 5.0])
+        self.assertEqual(index.unsorted, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,81 @@
+import json
+import os
+import tempfile
+import unittest
+from history_store import HEADER, RECORD, HistoryStore, format_record, parse_formatted
+
+
+class TestHistoryStore(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def make_store(self, **kwargs):
+        store = HistoryStore("anna", directory=self.tmp.name, **kwargs)
+        self.addCleanup(store.close)
+        return store
+
+    def test_pages_newest_first(self):
+        store = self.make_store()
+        for i in range(1000):
+            store.add("c", "f", i, i * 1.8 + 32, timestamp=i)
+        store.flush()
+        store.add("c", "k", -1, 272.15, timestamp=1000)
+        self.assertEqual(len(store), 1001)
+        self.assertEqual([record.value for record in store.page(0, 3)], [-1, 999, 998])
+        self.assertEqual([record.value for record in store.page(999, 5)], [1, 0])
+        self.assertEqual(store.page(1001, 5), [])
+        self.assertEqual(len(list(store)), 1001)
+
+    def test_fixed_width_file(self):
+        store = self.make_store(flush_interval=60)
+        store.add("c", "f", 0, 32)
+        store.add("f", "k", 212, 373.15)
+        self.assertEqual(os.path.getsize(store.history_file), len(HEADER))
+
+        store.flush()
+        self.assertEqual(os.path.getsize(store.history_file), len(HEADER) + 2 * RECORD.size)
+        record = store.page(0, 1)[0]
+        self.assertEqual((record.source, record.target, record.value, record.result), ("f", "k", 212, 373.15))
+        self.assertEqual(format_record(record)[1:], ("212.00°F", "373.15K"))
+
+    def test_reload_and_clear(self):
+        store = self.make_store()
+        store.add("k", "c", 0, -273.15)
+        store.close()
+        reloaded = self.make_store()
+        self.assertEqual(reloaded.page(0, 1)[0].result, -273.15)
+
+        reloaded.clear()
+        self.assertEqual(len(reloaded), 0)
+        self.assertEqual(len(self.make_store()), 0)
+
+    def test_background_writer_batches(self):
+        store = self.make_store(flush_interval=0.05)
+        for i in range(5):
+            store.add("c", "f", i, i * 1.8 + 32)
+        store.writer.join(0.3)
+        self.assertFalse(store.pending)
+        self.assertEqual(store.disk_count, 5)
+
+    def test_migrates_legacy_json(self):
+        legacy = os.path.join(self.tmp.name, "history_anna.json")
+        with open(legacy, "w", encoding="utf-8") as f:
+            json.dump([["00:10:00", "23.50°C", "74.30°F"], ["23:50:00", "0.00K", "-273.15°C"]], f)
+        with open(os.path.join(self.tmp.name, "history_anna.journal"), "w", encoding="utf-8") as f:
+            f.write(json.dumps(["00:20:00", "-40.00°F", "-40.00°C"]) + "\n")
+
+        records = self.make_store().page(0, 10)
+        self.assertEqual([(r.value, r.source, r.target) for r in records],
+                         [(-40, "f", "c"), (23.5, "c", "f"), (0, "k", "c")])
+        # Переход через полночь: последняя запись относится к предыдущему дню
+        self.assertAlmostEqual(records[1].timestamp - records[2].timestamp, 20 * 60)
+
+    def test_parse_formatted(self):
+        self.assertEqual(parse_formatted("-40.00°F"), (-40.0, "f"))
+        self.assertEqual(parse_formatted("80.00°Ré"), (80.0, "re"))
+        self.assertEqual(parse_formatted("273.15K"), (273.15, "k"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,75 @@
+import math
+import os
+import tempfile
+import unittest
+from array import array
+from converter_core import TemperatureConverter
+from parallel_convert import parallel_convert, parallel_convert_file
+
+
+class TestParallelConvert(unittest.TestCase):
+    def test_matches_batch_and_keeps_order(self):
+        values = [i * 0.37 for i in range(1000)]
+        result = parallel_convert(values, "c", "f", workers=2, chunk_size=64)
+        self.assertEqual(list(result), list(TemperatureConverter.c_to_f_batch(values)))
+
+    def test_policies(self):
+        with self.assertRaises(ValueError):
+            parallel_convert([0, 1, -1], "k", "c", workers=2, chunk_size=1)
+        result = parallel_convert([0, -1], "k", "c", workers=1, on_invalid="nan")
+        self.assertEqual(result[0], -273.15)
+        self.assertTrue(math.isnan(result[1]))
+
+    def test_file(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            source = os.path.join(tmp, "in.bin")
+            target = os.path.join(tmp, "out.bin")
+            with open(source, "wb") as f:
+                f.write(array("d", [0, 100, -300, 25, 50]).tobytes())
+            report = parallel_convert_file(source, target, "c", "k", dtype="f8",
+                                           workers=2, chunk_size=2)
+            result = array("d")
+            with open(target, "rb") as f:
+                result.frombytes(f.read())
+            self.assertEqual(result[1], 373.15)
+            self.assertTrue(math.isnan(result[2]))
+            self.assertEqual(result[4], 323.15)
+            self.assertEqual((report.invalid, report.offsets), (1, [16]))
+
+    def test_output_is_input(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            source = os.path.join(tmp, "in.bin")
+            link = os.path.join(tmp, "link.bin")
+            data = array("d", [0, 100]).tobytes()
+            with open(source, "wb") as f:
+                f.write(data)
+            os.link(source, link)
+            for output in (source, link):
+                with self.assertRaises(ValueError):
+                    parallel_convert_file(source, output, "c", "k", dtype="f8", workers=1)
+            with open(source, "rb") as f:
+                self.assertEqual(f.read(), data)
+
+    def test_file_raise_leaves_files_untouched(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            source = os.path.join(tmp, "in.bin")
+            target = os.path.join(tmp, "out.bin")
+            data = array("d", [0, 100, 25, 50, -300, 10]).tobytes()
+            with open(source, "wb") as f:
+                f.write(data)
+            with self.assertRaisesRegex(ValueError, "элемент 4"):
+                parallel_convert_file(source, from_unit="c", to_unit="k", dtype="f8", workers=2,
+                                      chunk_size=2, in_place=True, on_invalid="raise")
+            with self.assertRaises(ValueError):
+                parallel_convert_file(source, target, "c", "k", dtype="f8", workers=2,
+                                      chunk_size=2, on_invalid="raise")
+            with open(source, "rb") as f:
+                self.assertEqual(f.read(), data)
+            self.assertFalse(os.path.exists(target))
+            report = parallel_convert_file(source, from_unit="c", to_unit="k", dtype="f8",
+                                           workers=2, in_place=True, on_invalid="clip")
+            self.assertEqual(report.invalid, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,123 @@
+import bisect
+import random
+import tempfile
+import threading
+import unittest
+from history_store import HistoryStore
+from quantile_sketch import HistoryStats, QuantileSketch, convert_into
+
+
+def rank_error(sorted_values, value, q):
+    """Расстояние от ранга value до q в долях от числа значений"""
+    low = bisect.bisect_left(sorted_values, value) / len(sorted_values)
+    high = bisect.bisect_right(sorted_values, value) / len(sorted_values)
+    return 0.0 if low <= q <= high else min(abs(low - q), abs(high - q))
+
+
+class TestQuantileSketch(unittest.TestCase):
+    QS = (0.01, 0.1, 0.25, 0.5, 0.75, 0.9, 0.95, 0.99)
+
+    def setUp(self):
+        rnd = random.Random(7)
+        self.values = [rnd.gauss(20, 15) for _ in range(100000)]
+        self.sorted = sorted(self.values)
+
+    def assertAccurate(self, sketch, tolerance=0.017):
+        for q, value in zip(self.QS, sketch.quantiles(self.QS)):
+            self.assertLessEqual(rank_error(self.sorted, value, q), tolerance, f"q={q}")
+
+    def test_accuracy_and_memory(self):
+        sketch = QuantileSketch(seed=1)
+        for value in self.values:
+            sketch.update(value)
+        self.assertAccurate(sketch)
+        self.assertEqual((sketch.count, sketch.min, sketch.max), (100000, self.sorted[0], self.sorted[-1]))
+        self.assertLess(sketch.retained, 3 * sketch.k + 50)
+
+    def test_batch_update_matches_scalar_guarantee(self):
+        sketch = QuantileSketch(seed=2)
+        for start in range(0, len(self.values), 7000):
+            sketch.update_batch(self.values[start:start + 7000])
+        self.assertAccurate(sketch)
+
+    def test_merge(self):
+        parts = [QuantileSketch(seed=i) for i in range(4)]
+        for i, value in enumerate(self.values):
+            parts[i % 4].update(value)
+        merged = parts[0]
+        for part in parts[1:]:
+            merged.merge(part)
+        self.assertEqual(merged.count, len(self.values))
+        self.assertAccurate(merged)
+        with self.assertRaises(ValueError):
+            merged.merge(QuantileSketch(k=100))
+
+    def test_serialization(self):
+        sketch = QuantileSketch(seed=3)
+        sketch.update_batch(self.values)
+        restored = QuantileSketch.from_bytes(sketch.to_bytes())
+        self.assertEqual(restored.quantiles(self.QS), sketch.quantiles(self.QS))
+        self.assertEqual((restored.count, restored.min, restored.max), (sketch.count, sketch.min, sketch.max))
+        self.assertLess(len(sketch.to_bytes()), 8 * (3 * sketch.k + 50) + 200)
+        with self.assertRaises(ValueError):
+            QuantileSketch.from_bytes(b"XXXX" + sketch.to_bytes()[4:])
+
+    def test_small_and_empty(self):
+        sketch = QuantileSketch()
+        with self.assertRaises(ValueError):
+            sketch.quantile(0.5)
+        sketch.update_batch([3.0, 1.0, 2.0, float("nan")])
+        self.assertEqual(sketch.count, 3)
+        self.assertEqual(sketch.quantiles([0, 0.5, 1]), [1.0, 2.0, 3.0])
+        self.assertAlmostEqual(sketch.rank(2.0), 2 / 3)
+
+    def test_convert_into(self):
+        sketch = QuantileSketch()
+        results, valid = convert_into(sketch, [0.0, 100.0, -500.0], "c", "k", on_invalid="mask")
+        self.assertEqual(list(valid), [True, True, False])
+        self.assertEqual(sketch.count, 2)
+        self.assertAlmostEqual(sketch.max, 373.15)
+        convert_into(sketch, [-500.0], "c", "k", on_invalid="nan")
+        self.assertEqual(sketch.count, 2)
+
+
+class TestHistoryStats(unittest.TestCase):
+    def test_incremental_percentiles(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        store = HistoryStore("anna", directory=tmp.name)
+        self.addCleanup(store.close)
+        stats = HistoryStats(store)
+        self.assertEqual(stats.summary(), "История пуста")
+        for i in range(100):
+            store.add("c", "f", float(i), i * 1.8 + 32)
+        self.assertAlmostEqual(stats.percentiles()[0.5], 49.0, delta=1.0)
+        # 212°F = 100°C
+        for _ in range(100):
+            store.add("f", "c", 212.0, 100.0)
+        self.assertAlmostEqual(stats.percentiles()[0.99], 100.0)
+        self.assertEqual(stats.sketch.count, 200)
+        store.clear()
+        self.assertEqual(stats.percentiles(), {})
+        store.add("k", "c", 300.0, 26.85)
+        self.assertEqual(stats.summary(), "Ввод: p50 26.85°C, p95 26.85°C, p99 26.85°C (записей: 1)")
+
+    def test_concurrent_refresh(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        store = HistoryStore("anna", directory=tmp.name)
+        self.addCleanup(store.close)
+        for i in range(1000):
+            store.add("c", "f", float(i), i * 1.8 + 32)
+        # Окно считает перцентили в фоне, пока главный поток может их запросить
+        stats = HistoryStats(store, block_size=64)
+        threads = [threading.Thread(target=stats.refresh) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(stats.sketch.count, 1000)
+
+
+if __name__ == "__main__":
+    unittest.main()
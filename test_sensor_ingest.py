@@ -0,0 +1,97 @@
+import asyncio
+import unittest
+from calibration import CalibrationTable
+from sensor_ingest import SensorIngest, parse_reading
+
+
+class ListSink:
+    def __init__(self):
+        self.batches = []
+
+    def write(self, rows):
+        self.batches.append(rows)
+
+    @property
+    def rows(self):
+        return [row for batch in self.batches for row in batch]
+
+
+class TestParseReading(unittest.TestCase):
+    def test_parse(self):
+        self.assertEqual(parse_reading("s1, 23.5, C", 10.0), (10.0, "s1", 23.5, "c"))
+        self.assertEqual(parse_reading("s2,-40,Фаренгейт,5.5\r\n", 10.0), (5.5, "s2", -40.0, "f"))
+
+    def test_malformed(self):
+        for line in ("s1,abc,c", "s1,1", ",1,c", "s1,1,parsec"):
+            with self.subTest(line=line):
+                with self.assertRaises(ValueError):
+                    parse_reading(line, 0.0)
+
+
+class TestSensorIngest(unittest.IsolatedAsyncioTestCase):
+    async def start(self, **options):
+        self.sink = ListSink()
+        self.ingest = SensorIngest(self.sink, flush_interval=0.01, **options)
+        await self.ingest.start(udp_port=0, tcp_port=0)
+        return self.ingest.addresses()
+
+    async def test_udp_and_tcp_are_converted_in_batches(self):
+        addresses = await self.start()
+        loop = asyncio.get_running_loop()
+        transport, _ = await loop.create_datagram_endpoint(asyncio.DatagramProtocol,
+                                                           remote_addr=addresses["udp"])
+        transport.sendto(b"s1,0,c,1\ns2,32,f,2\nbroken\n")
+        transport.close()
+
+        reader, writer = await asyncio.open_connection(*addresses["tcp"])
+        writer.write(b"s3,100,c,3\ns4,-300,c,4\n")
+        await writer.drain()
+        writer.close()
+        await asyncio.sleep(0.1)
+        await self.ingest.stop()
+
+        rows = sorted(self.sink.rows)
+        self.assertEqual([row[:2] for row in rows], [(1.0, "s1"), (2.0, "s2"), (3.0, "s3")])
+        self.assertAlmostEqual(rows[0][2], 273.15)
+        self.assertAlmostEqual(rows[1][2], 273.15)
+        self.assertAlmostEqual(rows[2][2], 373.15)
+        stats = self.ingest.stats
+        self.assertEqual((stats.received, stats.malformed, stats.invalid, stats.written), (5, 1, 1, 3))
+
+    async def test_calibration_is_applied(self):
+        self.sink = ListSink()
+        self.ingest = SensorIngest(self.sink, calibration=CalibrationTable(calibrations={"s1": (2.0, 1.0)}))
+        await self.ingest.start(udp_port=0)
+        self.ingest.offer(b"s1,10,c,1\ns2,10,c,2")
+        await self.ingest.stop()
+        rows = sorted(self.sink.rows)
+        self.assertAlmostEqual(rows[0][2], 21.0 + 273.15)
+        self.assertAlmostEqual(rows[1][2], 10.0 + 273.15)
+
+    async def test_udp_overflow_is_dropped(self):
+        await self.start(queue_size=10)
+        # Пока цикл событий занят, писатель не разбирает очередь
+        self.ingest.offer(b"\n".join(b"s%d,1,c" % i for i in range(25)))
+        self.assertEqual(self.ingest.stats.dropped, 15)
+        await self.ingest.stop()
+        self.assertEqual(len(self.sink.rows), 10)
+
+    async def test_tcp_backpressure_loses_nothing(self):
+        addresses = await self.start(queue_size=5, batch_size=5)
+        reader, writer = await asyncio.open_connection(*addresses["tcp"])
+        writer.write(b"".join(b"s%d,1,k\n" % i for i in range(200)))
+        await writer.drain()
+        writer.close()
+        for _ in range(100):
+            if self.ingest.stats.written == 200:
+                break
+            await asyncio.sleep(0.02)
+        await self.ingest.stop()
+        self.assertEqual(len(self.sink.rows), 200)
+        self.assertEqual(self.ingest.stats.dropped, 0)
+        self.assertGreater(self.ingest.stats.backpressure, 0)
+        self.assertTrue(all(len(batch) <= 5 for batch in self.sink.batches))
+
+
+if __name__ == "__main__":
+    unittest.main()
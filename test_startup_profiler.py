@@ -0,0 +1,48 @@
+import unittest
+from startup_profiler import StartupProfiler
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestStartupProfiler(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.profiler = StartupProfiler(clock=self.clock)
+
+    def advance(self, seconds):
+        self.clock.now += seconds
+
+    def test_phases_exclude_user_wait(self):
+        self.advance(0.2)
+        self.profiler.mark("импорт")
+        self.advance(5.0)
+        self.profiler.mark("ввод логина и пароля", waiting=True)
+        self.advance(0.05)
+        self.profiler.event("история загружена")
+        self.advance(0.1)
+        self.profiler.finish("создание интерфейса")
+
+        self.assertEqual([phase for phase, _, _ in self.profiler.phases],
+                         ["импорт", "ввод логина и пароля", "создание интерфейса"])
+        self.assertAlmostEqual(self.profiler.active, 0.35)
+        report = self.profiler.report()
+        self.assertIn("до готовности главного окна", report)
+        self.assertIn("350.0 мс", report)
+        self.assertIn("ожидание пользователя", report)
+        self.assertIn("5250.0 мс от старта", report)
+
+    def test_report_before_finish(self):
+        self.advance(0.01)
+        self.profiler.mark("создание Tk")
+        self.assertIsNone(self.profiler.finished)
+        self.assertNotIn("до готовности", self.profiler.report())
+
+
+if __name__ == "__main__":
+    unittest.main()
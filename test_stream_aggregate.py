@@ -0,0 +1,87 @@
+import math
+import random
+import unittest
+from bulk_convert import BulkStats
+from stream_aggregate import convert_readings, sliding, tumbling
+from units import UNITS
+
+
+def make_stream(count, seed=1):
+    rnd = random.Random(seed)
+    timestamp = 1000.0
+    readings = []
+    for _ in range(count):
+        # Неравномерный шаг с редкими большими разрывами
+        timestamp += rnd.choice((0.0, 0.3, 1.7, 4.0, 55.0))
+        unit = rnd.choice(("c", "f", "k"))
+        value = rnd.uniform(-300.0, 100.0) if unit == "c" else rnd.uniform(-100.0, 400.0)
+        readings.append((timestamp, value, unit))
+    return readings
+
+
+def naive_windows(readings, size, step):
+    """Полный пересчет по каждому окну"""
+    converted = []
+    for timestamp, value, unit in readings:
+        try:
+            converted.append((timestamp, UNITS.convert(value, unit, "c")))
+        except ValueError:
+            continue
+    first, last = converted[0][0], converted[-1][0]
+    end = (math.floor(first / step) + 1) * step
+    windows = []
+    while end - size <= last:
+        values = [value for timestamp, value in converted if end - size <= timestamp < end]
+        if values:
+            windows.append((end - size, end, len(values), min(values), max(values), sum(values) / len(values)))
+        end += step
+    return windows
+
+
+class TestStreamAggregate(unittest.TestCase):
+    def assertWindowsEqual(self, actual, expected):
+        self.assertEqual(len(actual), len(expected))
+        for window, reference in zip(actual, expected):
+            self.assertEqual(window[:5], reference[:5])
+            self.assertAlmostEqual(window.mean, reference[5], places=9)
+
+    def test_tumbling_matches_naive(self):
+        readings = make_stream(1000)
+        self.assertWindowsEqual(list(tumbling(readings, 10.0)), naive_windows(readings, 10.0, 10.0))
+
+    def test_sliding_matches_naive(self):
+        readings = make_stream(1000, seed=2)
+        for size, step in ((10.0, 2.5), (7.0, 3.0), (5.0, 5.0), (3.0, 10.0)):
+            with self.subTest(size=size, step=step):
+                self.assertWindowsEqual(list(sliding(readings, size, step)), naive_windows(readings, size, step))
+
+    def test_lazy_single_pass(self):
+        consumed = []
+
+        def source():
+            for i in range(10 ** 9):
+                consumed.append(i)
+                yield float(i), 20.0, "c"
+
+        windows = tumbling(source(), 100.0)
+        first = next(windows)
+        self.assertEqual((first.start, first.count, first.mean), (0.0, 100, 20.0))
+        # Прочитана только порция конвертации, а не весь поток
+        self.assertLess(len(consumed), 10000)
+
+    def test_invalid_values(self):
+        readings = [(0.0, 10.0, "c"), (1.0, -500.0, "c"), (2.0, 300.0, "k")]
+        stats = BulkStats()
+        self.assertEqual(list(convert_readings(readings, "k", stats=stats)),
+                         [(0.0, 283.15), (2.0, 300.0)])
+        self.assertEqual((stats.rows, stats.rejected), (3, 1))
+        with self.assertRaises(ValueError):
+            list(tumbling(readings, 10.0, on_invalid="raise"))
+
+    def test_empty_stream(self):
+        self.assertEqual(list(tumbling([], 1.0)), [])
+        self.assertEqual(list(sliding([], 1.0, 0.5)), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,84 @@
+import threading
+import time
+import unittest
+from task_executor import TaskExecutor
+
+
+class FakeRoot:
+    """Заменяет Tk: отложенные вызовы выполняются по run_pending()"""
+
+    def __init__(self):
+        self.scheduled = []
+        self.errors = []
+
+    def after(self, delay, callback):
+        self.scheduled.append(callback)
+
+    def report_callback_exception(self, exc, value, tb):
+        self.errors.append(value)
+
+    def run_pending(self):
+        scheduled, self.scheduled = self.scheduled, []
+        for callback in scheduled:
+            callback()
+
+
+class TestTaskExecutor(unittest.TestCase):
+    def setUp(self):
+        self.root = FakeRoot()
+        self.executor = TaskExecutor(self.root, max_workers=2)
+        self.addCleanup(self.executor.shutdown, True)
+
+    def drain(self):
+        # Результат попадает в очередь чуть позже завершения задачи
+        deadline = time.monotonic() + 5
+        while self.executor.results.empty() and time.monotonic() < deadline:
+            time.sleep(0.001)
+        self.root.run_pending()
+
+    def test_callbacks_run_in_poll_thread(self):
+        results = []
+        future = self.executor.submit(lambda x: (x * 2, threading.current_thread()), 21,
+                                      on_success=lambda r: results.append((r, threading.current_thread())))
+        future.result(timeout=5)
+        # До опроса очереди обработчик не вызывается
+        self.assertEqual(results, [])
+        self.drain()
+        (value, worker), caller = results[0]
+        self.assertEqual(value, 42)
+        self.assertIsNot(worker, threading.main_thread())
+        self.assertIs(caller, threading.main_thread())
+
+    def test_error_goes_to_on_error(self):
+        errors = []
+        self.executor.submit(lambda: 1 / 0, on_error=errors.append)
+        self.drain()
+        self.assertIsInstance(errors[0], ZeroDivisionError)
+
+    def test_unhandled_error_is_reported(self):
+        self.executor.submit(lambda: 1 / 0)
+        self.drain()
+        self.assertIsInstance(self.root.errors[0], ZeroDivisionError)
+
+    def test_call_soon_from_worker(self):
+        calls = []
+        self.executor.submit(lambda: self.executor.call_soon(calls.append, "progress"))
+        self.drain()
+        self.assertEqual(calls, ["progress"])
+
+    def test_stall_is_measured(self):
+        self.root.run_pending()
+        time.sleep(0.1)
+        self.root.run_pending()
+        self.assertGreaterEqual(self.executor.max_stall, 0.05)
+        self.assertEqual(self.executor.polls, 2)
+        self.assertIn("мс", self.executor.stall_report())
+
+    def test_polling_stops_after_shutdown(self):
+        self.executor.shutdown()
+        self.root.run_pending()
+        self.assertEqual(self.root.scheduled, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
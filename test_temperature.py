@@ -0,0 +1,98 @@
+import sys
+import unittest
+from array import array
+from temperature import Temperature, TemperatureArray
+
+
+class TestTemperature(unittest.TestCase):
+    def test_create_and_convert(self):
+        t = Temperature(100, "Цельсий")
+        self.assertEqual((t.value, t.unit), (100.0, "c"))
+        self.assertAlmostEqual(t.to("f").value, 212)
+        self.assertAlmostEqual(t.to("kelvin").value, 373.15)
+        self.assertIs(t.to("c"), t)
+        self.assertEqual(str(t.to("k")), "373.15K")
+        self.assertEqual(float(t), 100.0)
+        with self.assertRaises(ValueError):
+            Temperature(-274, "c")
+        with self.assertRaises(ValueError):
+            Temperature(600, "de")
+        self.assertFalse(hasattr(t, "__dict__"))
+
+    def test_parse(self):
+        self.assertEqual(Temperature.parse("23.50°C"), Temperature(23.5, "c"))
+        self.assertEqual(Temperature.parse("12", default_unit="k").unit, "k")
+
+    def test_comparison_across_units(self):
+        self.assertEqual(Temperature(0, "c"), Temperature(273.15, "k"))
+        self.assertEqual(hash(Temperature(0, "c")), hash(Temperature(273.15, "k")))
+        self.assertLess(Temperature(0, "c"), Temperature(33, "f"))
+        # Делиль: большее число -- более низкая температура
+        self.assertLess(Temperature(150, "de"), Temperature(0, "de"))
+        self.assertGreater(Temperature(0, "de"), Temperature(99, "c"))
+        temps = [Temperature(300, "k"), Temperature(0, "c"), Temperature(100, "f"), Temperature(0, "de")]
+        self.assertEqual([str(t) for t in sorted(temps)], ["0.00°C", "300.00K", "100.00°F", "0.00°De"])
+
+
+class TestTemperatureArray(unittest.TestCase):
+    def test_buffer(self):
+        column = TemperatureArray([0, 100, -40], "c")
+        self.assertIsInstance(column.values, array)
+        self.assertEqual(column.values.itemsize * len(column), 24)
+        self.assertEqual(TemperatureArray([1, 2], "c", typecode="f").values.itemsize, 4)
+        self.assertEqual(column[1], Temperature(100, "c"))
+        self.assertEqual(column[1:].values.tolist(), [100.0, -40.0])
+        self.assertEqual([str(t) for t in column], ["0.00°C", "100.00°C", "-40.00°C"])
+        with self.assertRaises(ValueError):
+            TemperatureArray([0, -300], "c")
+        self.assertLess(sys.getsizeof(TemperatureArray([0.0] * 100000).values), 100000 * 8 + 1000)
+
+    def test_to(self):
+        column = TemperatureArray([0, 100, -40], "c")
+        fahrenheit = column.to("f")
+        self.assertEqual(fahrenheit.unit, "f")
+        self.assertEqual([round(value, 9) for value in fahrenheit.values], [32, 212, -40])
+        self.assertEqual(column.values.tolist(), [0, 100, -40])
+        values = column.values
+        self.assertIs(column.to("k", in_place=True), column)
+        self.assertIs(column.values, values)
+        self.assertEqual(column.unit, "k")
+        self.assertAlmostEqual(column.values[0], 273.15)
+        self.assertEqual(column.to("k"), column)
+        self.assertIsNot(column.to("k"), column)
+
+    def test_where_and_sort(self):
+        column = TemperatureArray([10, -5, 30, 0], "c")
+        self.assertEqual(list(column.where(">", Temperature(273.15, "k"))), [True, False, True, False])
+        self.assertEqual(list(column.where("<=", 0)), [False, True, False, True])
+        with self.assertRaises(ValueError):
+            column.where("==", 0)
+        self.assertEqual(column.sorted().values.tolist(), [-5, 0, 10, 30])
+        self.assertEqual(column.sorted(reverse=True).values.tolist(), [30, 10, 0, -5])
+        self.assertEqual(list(column.argsort()), [1, 3, 0, 2])
+        self.assertEqual((column.min().value, column.max().value), (-5, 30))
+        self.assertEqual(column.values.tolist(), [10, -5, 30, 0])
+        column.sort()
+        self.assertEqual(column.values.tolist(), [-5, 0, 10, 30])
+
+    def test_reversed_scale(self):
+        column = TemperatureArray([0, 150, 50], "de")
+        self.assertEqual(column.sorted().values.tolist(), [150, 50, 0])
+        self.assertEqual(list(column.where("<", Temperature(50, "de"))), [False, True, False])
+        self.assertEqual((column.min().value, column.max().value), (150, 0))
+
+    def test_parse_and_append(self):
+        column = TemperatureArray.parse(["0°C", "32°F", "273.15 K", "5"], unit="c", default_unit="c")
+        self.assertEqual([round(value, 9) for value in column.values], [0, 0, 0, 5])
+        with self.assertRaises(ValueError):
+            TemperatureArray.parse(["0°C", "abc"])
+        with self.assertRaises(ValueError):
+            TemperatureArray.parse(["0°C", "-500°F"])
+        column.append(Temperature(212, "f"))
+        self.assertAlmostEqual(column.values[-1], 100)
+        self.assertEqual(len(TemperatureArray()), 0)
+        self.assertIsNone(TemperatureArray().min())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,76 @@
+import math
+import unittest
+from array import array
+from history_store import format_record, HistoryRecord
+from temperature_parser import convert_parsed, parse_column, parse_temperature
+from units import UNITS
+
+
+class TestParseTemperature(unittest.TestCase):
+    def test_forms(self):
+        cases = {
+            "23.50°C": (23.5, "c"),
+            "-40°F": (-40.0, "f"),
+            "273.15K": (273.15, "k"),
+            " +5,5 °С ": (5.5, "c"),  # Кириллическая "С"
+            "−3 градусов Цельсия": (-3.0, "c"),
+            "1e2 deg F": (100.0, "f"),
+            ".5 kelvin": (0.5, "k"),
+            "12 Кельвин": (12.0, "k"),
+            "10°Ré": (10.0, "re"),
+            "7°Rø": (7.0, "ro"),
+            "3 De": (3.0, "de"),
+            "100 Fahrenheit": (100.0, "f"),
+            "0 ц": (0.0, "c"),
+        }
+        for text, expected in cases.items():
+            with self.subTest(text=text):
+                self.assertEqual(parse_temperature(text), expected)
+
+    def test_default_unit(self):
+        self.assertEqual(parse_temperature("-12,5", default_unit="f"), (-12.5, "f"))
+        self.assertEqual(parse_temperature(7, default_unit="k"), (7.0, "k"))
+        with self.assertRaises(ValueError):
+            parse_temperature("-12.5")
+
+    def test_errors(self):
+        for text in ("", "°C", "abc", "12 parsec", "nan°C", "inf K", "1_000°C", "--5°C", None, True):
+            with self.subTest(text=text):
+                with self.assertRaises(ValueError):
+                    parse_temperature(text, default_unit="c" if text is True else None)
+
+    def test_round_trip_of_history_format(self):
+        for code in ("c", "f", "k", "r", "re", "de", "n", "ro"):
+            record = HistoryRecord(0.0, -12.25, 0.0, code, "k")
+            with self.subTest(unit=code):
+                self.assertEqual(parse_temperature(format_record(record)[1]), (-12.25, code))
+
+
+class TestParseColumn(unittest.TestCase):
+    def test_column_with_errors(self):
+        parsed = parse_column(["23.50°C", "bad", "-40°F", None, "5"], default_unit="k")
+        self.assertIsInstance(parsed.values, array)
+        self.assertEqual(parsed.units, ["c", None, "f", None, "k"])
+        self.assertEqual(parsed.values[0], 23.5)
+        self.assertTrue(math.isnan(parsed.values[1]))
+        self.assertEqual([row for row, _, _ in parsed.errors], [1, 3])
+        self.assertEqual(parsed.errors[0][1], "bad")
+
+    def test_convert_parsed_mixed_units(self):
+        parsed = parse_column(["0°C", "32°F", "bad", "-500°C", "10"], default_unit="c")
+        results, valid = convert_parsed(parsed, UNITS.transform("c", "k"))
+        self.assertEqual(list(valid), [True, True, False, False, True])
+        self.assertAlmostEqual(results[0], 273.15)
+        self.assertAlmostEqual(results[1], 273.15)
+        self.assertAlmostEqual(results[4], 283.15)
+
+    def test_repeated_strings(self):
+        texts = ["23.50°C", "-40°F"] * 1000
+        parsed = parse_column(iter(texts))
+        self.assertEqual(len(parsed.values), 2000)
+        self.assertEqual(parsed.errors, [])
+        self.assertEqual(parsed.units[-1], "f")
+
+
+if __name__ == "__main__":
+    unittest.main()
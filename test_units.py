@@ -0,0 +1,52 @@
+import unittest
+from units import UNITS, UnitRegistry
+
+
+class TestUnitRegistry(unittest.TestCase):
+    def test_fused_coefficients(self):
+        transform = UNITS.transform("c", "f")
+        self.assertEqual((transform.a, transform.b), (1.8, 32.0))
+        transform = UNITS.transform("k", "c")
+        self.assertEqual((transform.a, transform.b), (1.0, -273.15))
+
+    def test_boiling_point_in_all_units(self):
+        expected = {"c": 100, "f": 212, "k": 373.15, "r": 671.67,
+                    "re": 80, "de": 0, "n": 33, "ro": 60}
+        for code, value in expected.items():
+            with self.subTest(unit=code):
+                self.assertAlmostEqual(UNITS.convert(100, "c", code), value)
+                self.assertAlmostEqual(UNITS.convert(value, code, "c"), 100)
+
+    def test_absolute_zero_bounds(self):
+        with self.assertRaises(ValueError):
+            UNITS.convert(-1, "r", "k")
+        # Шкала Делиля направлена в обратную сторону: граница сверху
+        self.assertAlmostEqual(UNITS.convert(559.725, "de", "k"), 0)
+        with self.assertRaises(ValueError):
+            UNITS.convert(560, "de", "k")
+        # Без проверки: для значений, проверенных раньше
+        self.assertAlmostEqual(UNITS.convert_unchecked(-1, "k", "c"), -274.15)
+
+    def test_resolve_names_and_aliases(self):
+        self.assertEqual(UNITS.resolve("Цельсий"), "c")
+        self.assertEqual(UNITS.resolve("fahrenheit"), "f")
+        self.assertEqual(UNITS.resolve("K"), "k")
+        with self.assertRaises(ValueError):
+            UNITS.resolve("Гаусс")
+
+    def test_register_custom_unit(self):
+        registry = UnitRegistry()
+        registry.register("k", "Кельвин", "K", 1, 0)
+        registry.register("mk", "Милликельвин", "mK", "0.001", 0)
+        self.assertAlmostEqual(registry.convert(1500, "mk", "k"), 1.5)
+        with self.assertRaises(ValueError):
+            registry.register("k", "Кельвин", "K", 1, 0)
+
+    def test_batch_delisle_mask(self):
+        result, valid = UNITS.transform("de", "c").convert_batch([0, 600], on_invalid="mask")
+        self.assertEqual(list(valid), [True, False])
+        self.assertAlmostEqual(result[0], 100)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,211 @@
+"""Реестр единиц измерения температуры.
+
+Каждая единица задается линейной связью с Кельвином: K = x * scale + offset.
+Для каждой пары единиц заранее вычисляется одно слитное преобразование
+y = a * x + b и допустимый диапазон входа, поэтому конвертация не требует
+ветвлений и сводится к поиску в словаре.
+
+Результаты не всегда бит в бит совпадают с прежними формулами
+(x * 9 / 5) + 32, (x - 32) * 5 / 9 и их цепочками через Цельсий: a и b
+округляются один раз, а не на каждом шаге. Для c<->f и f<->k отличается
+от трети до двух третей значений, на 1-3 единицы последнего разряда
+(ULP) слагаемых; c<->k совпадает точно. Сравнивать с прежними
+результатами следует с допуском (assertAlmostEqual, math.isclose).
+"""
+from fractions import Fraction
+
+np = None
+_numpy_checked = False
+
+ABSOLUTE_ZERO_ERROR = "Температура ниже абсолютного нуля!"
+
+BATCH_POLICIES = ("raise", "nan", "clip", "mask")
+
+INF = float("inf")
+
+
+def load_numpy():
+    """Ленивая загрузка NumPy: он необязателен и заметно замедляет старт.
+
+    Возвращает модуль numpy или None, если он не установлен.
+    """
+    global np, _numpy_checked
+    if not _numpy_checked:
+        try:
+            import numpy as np
+        except ImportError:  # Пакетный режим работает и без NumPy
+            np = None
+        _numpy_checked = True
+    return np
+
+
+class Unit:
+    """Единица измерения температуры"""
+
+    __slots__ = ("code", "index", "name", "symbol", "scale", "offset")
+
+    def __init__(self, code, index, name, symbol, scale, offset):
+        self.code = code
+        # Числовой код единицы для бинарных форматов (порядок регистрации)
+        self.index = index
+        self.name = name
+        self.symbol = symbol
+        self.scale = Fraction(scale)
+        self.offset = Fraction(offset)
+
+    def __repr__(self):
+        return f"Unit({self.code!r}, {self.name!r})"
+
+
+class AffineTransform:
+    """Предвычисленное преобразование y = a * x + b с проверкой диапазона"""
+
+    __slots__ = ("source", "target", "a", "b", "lower", "upper")
+
+    def __init__(self, source, target):
+        self.source = source
+        self.target = target
+        # Коэффициенты считаются точно в дробях и округляются один раз
+        self.a = float(source.scale / target.scale)
+        self.b = float((source.offset - target.offset) / target.scale)
+        # Абсолютный нуль во входной единице: нижняя граница, а для шкал
+        # с обратным направлением (Делиль) -- верхняя
+        zero = float(-source.offset / source.scale)
+        self.lower, self.upper = (zero, INF) if source.scale > 0 else (-INF, zero)
+
+    def __call__(self, value):
+        if value < self.lower or value > self.upper:
+            raise ValueError(ABSOLUTE_ZERO_ERROR)
+        return value * self.a + self.b
+
+    def __repr__(self):
+        return f"AffineTransform({self.source.code!r} → {self.target.code!r}: {self.a!r} * x + {self.b!r})"
+
+    def convert_batch(self, values, on_invalid="raise"):
+        """Пакетная конвертация массива значений.
+
+        on_invalid задает поведение для значений ниже абсолютного нуля:
+        "raise" -- ValueError, "nan" -- NaN в результате, "clip" -- значение
+        прижимается к абсолютному нулю, "mask" -- возвращается пара
+        (результат, маска корректных значений).
+        С NumPy возвращает ndarray, без него -- список.
+        """
+        if on_invalid not in BATCH_POLICIES:
+            raise ValueError(f"Неизвестная политика: {on_invalid}")
+        if load_numpy() is not None:
+            return self._convert_batch_numpy(values, on_invalid)
+        return self._convert_batch_python(values, on_invalid)
+
+    def _convert_batch_numpy(self, values, on_invalid):
+        """Векторизованная конвертация на NumPy"""
+        values = np.asarray(values, dtype=np.float64)
+        if on_invalid == "clip":
+            return np.clip(values, self.lower, self.upper) * self.a + self.b
+
+        invalid = values < self.lower
+        if self.upper != INF:
+            invalid |= values > self.upper
+        if on_invalid == "raise" and invalid.any():
+            index = int(np.flatnonzero(invalid)[0])
+            raise ValueError(f"{ABSOLUTE_ZERO_ERROR} (элемент {index})")
+
+        result = values * self.a + self.b
+        if on_invalid == "nan":
+            result[invalid] = np.nan
+        if on_invalid == "mask":
+            return result, ~invalid
+        return result
+
+    def _convert_batch_python(self, values, on_invalid):
+        """Конвертация без NumPy: проверки границ выполняются на уровне C"""
+        values = [float(value) for value in values]
+        lower, upper, a, b = self.lower, self.upper, self.a, self.b
+
+        if on_invalid == "clip":
+            return [min(max(value, lower), upper) * a + b for value in values]
+
+        valid = None
+        if any(map(lower.__gt__, values)) or any(map(upper.__lt__, values)):
+            valid = [lower <= value <= upper or value != value for value in values]
+            if on_invalid == "raise":
+                index = valid.index(False)
+                raise ValueError(f"{ABSOLUTE_ZERO_ERROR} (элемент {index})")
+
+        result = [value * a + b for value in values]
+        if valid is None:
+            valid = [True] * len(result)
+        elif on_invalid == "nan":
+            result = [value if ok else float("nan") for value, ok in zip(result, valid)]
+        if on_invalid == "mask":
+            return result, valid
+        return result
+
+
+class UnitRegistry:
+    """Реестр единиц с O(1) поиском преобразования по паре кодов"""
+
+    def __init__(self):
+        self.units = {}
+        self.by_index = []
+        self.transforms = {}
+        self.aliases = {}
+
+    def register(self, code, name, symbol, scale, offset, aliases=()):
+        """Регистрация единицы: K = x * scale + offset"""
+        if code in self.units:
+            raise ValueError(f"Единица уже зарегистрирована: {code}")
+        unit = Unit(code, len(self.by_index), name, symbol, scale, offset)
+        self.units[code] = unit
+        self.by_index.append(unit)
+
+        for other in self.units.values():
+            self.transforms[(code, other.code)] = AffineTransform(unit, other)
+            self.transforms[(other.code, code)] = AffineTransform(other, unit)
+
+        for alias in (code, name, *aliases):
+            self.aliases[alias.lower()] = code
+        return unit
+
+    def resolve(self, unit):
+        """Код единицы по коду, названию или псевдониму"""
+        try:
+            return self.aliases[unit.lower()]
+        except KeyError:
+            raise ValueError(f"Неизвестная единица измерения: {unit}") from None
+
+    def transform(self, source, target):
+        """Преобразование для пары кодов единиц"""
+        try:
+            return self.transforms[(source, target)]
+        except KeyError:
+            raise ValueError(f"Неизвестный тип конвертации: {source}_to_{target}") from None
+
+    def convert(self, value, source, target):
+        """Конвертация одного значения"""
+        return self.transform(source, target)(value)
+
+    def convert_unchecked(self, value, source, target):
+        """Конвертация уже проверенного значения без проверки абсолютного нуля"""
+        transform = self.transform(source, target)
+        return value * transform.a + transform.b
+
+    def names(self):
+        """Названия единиц в порядке регистрации"""
+        return [unit.name for unit in self.units.values()]
+
+    def by_name(self, name):
+        """Единица по названию или псевдониму"""
+        return self.units[self.resolve(name)]
+
+
+UNITS = UnitRegistry()
+UNITS.register("c", "Цельсий", "°C", 1, "273.15", aliases=("celsius", "ц", "°c"))
+UNITS.register("f", "Фаренгейт", "°F", Fraction(5, 9), Fraction("459.67") * Fraction(5, 9),
+               aliases=("fahrenheit", "ф", "°f"))
+UNITS.register("k", "Кельвин", "K", 1, 0, aliases=("kelvin", "к"))
+UNITS.register("r", "Ранкин", "°R", Fraction(5, 9), 0, aliases=("rankine", "°r"))
+UNITS.register("re", "Реомюр", "°Ré", Fraction(5, 4), "273.15", aliases=("reaumur", "°ré"))
+UNITS.register("de", "Делиль", "°De", Fraction(-2, 3), "373.15", aliases=("delisle", "°de"))
+UNITS.register("n", "Ньютон", "°N", Fraction(100, 33), "273.15", aliases=("newton", "°n"))
+UNITS.register("ro", "Рёмер", "°Rø", Fraction(40, 21), Fraction("273.15") - Fraction(300, 21),
+               aliases=("romer", "°rø"))
@@ -0,0 +1,135 @@
+"""Хранилище пользователей на SQLite.
+
+Каждый пользователь -- отдельная запись с первичным ключом по логину, поэтому
+вход и смена пароля читают и обновляют одну строку, а не переписывают весь
+файл. При первом запуске данные переносятся из старого users.json.
+"""
+import json
+import os
+import sqlite3
+import threading
+
+FIELDS = ("password_hash", "email", "created_at", "last_login")
+
+
+class UserStore:
+    """Пользователи с поиском по логину и обновлением одной записи"""
+
+    def __init__(self, db_file="users.db"):
+        self.db_file = db_file
+        # Соединение используется и из фоновых потоков приложения: каждое
+        # обращение к нему идет под self.lock
+        self.connection = sqlite3.connect(db_file, check_same_thread=False)
+        self.lock = threading.Lock()
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS users ("
+            "username TEXT PRIMARY KEY, "
+            "password_hash TEXT NOT NULL, "
+            "email TEXT, "
+            "created_at TEXT, "
+            "last_login TEXT)"
+        )
+        self.connection.commit()
+
+    def __contains__(self, username):
+        with self.lock:
+            row = self.connection.execute(
+                "SELECT 1 FROM users WHERE username = ?", (username,)
+            ).fetchone()
+        return row is not None
+
+    def __getitem__(self, username):
+        record = self.get(username)
+        if record is None:
+            raise KeyError(username)
+        return record
+
+    def __len__(self):
+        with self.lock:
+            return self.connection.execute("SELECT COUNT(*) FROM users").fetchone()[0]
+
+    def get(self, username, default=None):
+        """Запись пользователя в виде словаря или default"""
+        with self.lock:
+            row = self.connection.execute(
+                f"SELECT {', '.join(FIELDS)} FROM users WHERE username = ?", (username,)
+            ).fetchone()
+        if row is None:
+            return default
+        return dict(zip(FIELDS, row))
+
+    def add(self, username, record):
+        """Добавление нового пользователя"""
+        with self.lock, self.connection:
+            self.connection.execute(
+                f"INSERT INTO users (username, {', '.join(FIELDS)}) VALUES (?, ?, ?, ?, ?)",
+                (username, *(record.get(field) for field in FIELDS))
+            )
+
+    def add_many(self, records):
+        """Добавление пачки пользователей одной транзакцией.
+
+        records -- пары (логин, запись). Уже существующие логины (в том
+        числе добавленные другим потоком или процессом после проверки)
+        пропускаются. Возвращает список флагов "добавлен" в порядке records.
+        """
+        query = f"INSERT OR IGNORE INTO users (username, {', '.join(FIELDS)}) VALUES (?, ?, ?, ?, ?)"
+        with self.lock, self.connection:
+            return [
+                self.connection.execute(query, (username, *(record.get(field) for field in FIELDS))).rowcount == 1
+                for username, record in records
+            ]
+
+    def existing(self, usernames):
+        """Множество логинов из usernames, которые уже есть в хранилище"""
+        usernames = list(usernames)
+        found = set()
+        with self.lock:
+            # SQLite ограничивает число параметров в одном запросе
+            for start in range(0, len(usernames), 500):
+                part = usernames[start:start + 500]
+                rows = self.connection.execute(
+                    f"SELECT username FROM users WHERE username IN ({', '.join('?' * len(part))})", part
+                )
+                found.update(row[0] for row in rows)
+        return found
+
+    def update(self, username, **fields):
+        """Обновление отдельных полей одной записи"""
+        unknown = set(fields) - set(FIELDS)
+        if unknown:
+            raise ValueError(f"Неизвестные поля: {', '.join(sorted(unknown))}")
+        assignments = ", ".join(f"{field} = ?" for field in fields)
+        with self.lock, self.connection:
+            self.connection.execute(
+                f"UPDATE users SET {assignments} WHERE username = ?",
+                (*fields.values(), username)
+            )
+
+    def migrate_json(self, users_file):
+        """Перенос пользователей из users.json; возвращает число записей"""
+        if not os.path.exists(users_file):
+            return 0
+        try:
+            with open(users_file, "r", encoding="utf-8") as f:
+                users = json.load(f)
+        except (OSError, ValueError):
+            return 0
+
+        with self.lock, self.connection:
+            self.connection.executemany(
+                f"INSERT OR IGNORE INTO users (username, {', '.join(FIELDS)}) VALUES (?, ?, ?, ?, ?)",
+                ((username, *(record.get(field) for field in FIELDS))
+                 for username, record in users.items())
+            )
+        return len(users)
+
+    def commit(self):
+        with self.lock:
+            self.connection.commit()
+
+    def close(self):
+        with self.lock:
+            self.connection.close()